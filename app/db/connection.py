@@ -1,29 +1,189 @@
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+from app.db.instrumentation import count_connection
+from app.db.pool import ConnectionPool, PooledConnection
+from app.db.storage_profile import DEFAULT_PROFILE, StorageProfile, get_profile
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DATA_DIR = PROJECT_ROOT / "data"
-DB_PATH = DATA_DIR / "omnistore.db"
+DB_PATH = Path(os.getenv("OMNISTORE_DB_PATH") or (DATA_DIR / "omnistore.db"))
 
+# Connection pooling is ON by default; OMNISTORE_DB_POOL=0 opens a fresh connection per call.
+POOL_ENABLED = os.getenv("OMNISTORE_DB_POOL", "1") == "1"
+POOL_MAX_SIZE = int(os.getenv("OMNISTORE_DB_POOL_SIZE", "16"))
 
-def get_connection(db_path: Optional[Path] = None) -> sqlite3.Connection:
+# PRAGMA preset applied to new connections: durable | balanced | bulk-load
+STORAGE_PROFILE: StorageProfile = get_profile(os.getenv("OMNISTORE_DB_PROFILE", DEFAULT_PROFILE))
+
+_pools: Dict[Path, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+_ready_dirs = set()
+
+# Connection of the unit of work running on the current thread (if any)
+_uow = threading.local()
+
+
+def _open_connection(path: Path) -> PooledConnection:
     """
-    Returns a configured SQLite connection.
-    Foreign keys are enabled by default.
+    Opens and configures a brand new SQLite connection.
     """
-    path = db_path or DB_PATH
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    if path.parent not in _ready_dirs:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _ready_dirs.add(path.parent)
 
-    conn = sqlite3.connect(path)
+    conn = sqlite3.connect(path, factory=PooledConnection)
     conn.row_factory = sqlite3.Row
 
     # Enable FK constraints in SQLite
     conn.execute("PRAGMA foreign_keys = ON;")
+    STORAGE_PROFILE.apply(conn)
     return conn
 
 
+def get_pool(db_path: Optional[Path] = None) -> ConnectionPool:
+    path = Path(db_path or DB_PATH)
+    pool = _pools.get(path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(path)
+            if pool is None:
+                pool = ConnectionPool(path=path, connect=_open_connection, max_size=POOL_MAX_SIZE)
+                _pools[path] = pool
+    return pool
+
+
+def configure_pool(enabled: bool) -> None:
+    """
+    Switches pooling on/off at runtime (used by benchmarks).
+    Idle connections of the calling thread are closed when pooling is turned off.
+    """
+    global POOL_ENABLED
+    POOL_ENABLED = enabled
+    if not enabled:
+        for pool in list(_pools.values()):
+            pool.close_idle()
+
+
+def configure_storage_profile(profile: Union[str, StorageProfile]) -> StorageProfile:
+    """
+    Selects the PRAGMA preset for connections opened from now on.
+    Idle pooled connections of the calling thread are dropped so they pick it up.
+    """
+    global STORAGE_PROFILE
+    STORAGE_PROFILE = profile if isinstance(profile, StorageProfile) else get_profile(profile)
+    for pool in list(_pools.values()):
+        pool.close_idle()
+    return STORAGE_PROFILE
+
+
+def get_connection(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    """
+    Returns a configured SQLite connection.
+    Foreign keys are enabled by default.
+
+    With pooling enabled, conn.close() returns the connection to the pool.
+    """
+    count_connection()
+    if POOL_ENABLED:
+        return get_pool(db_path).acquire()
+    return _open_connection(Path(db_path or DB_PATH))
+
+
+def _active_uow_connection() -> Optional[sqlite3.Connection]:
+    return getattr(_uow, "conn", None)
+
+
+@contextmanager
+def connection(db_path: Optional[Path] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Context-manager form of get_connection() for reads:
+
+        with connection() as conn:
+            conn.execute(...)
+
+    The connection is released (back to the pool) on exit.
+    Inside unit_of_work() the unit's connection is reused, so reads see its pending writes.
+    """
+    active = _active_uow_connection()
+    if active is not None:
+        yield active
+        return
+
+    conn = get_connection(db_path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def transaction(db_path: Optional[Path] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Write scope: commits on success, rolls back on error.
+    Inside unit_of_work() it joins the outer transaction instead (no commit here).
+    """
+    active = _active_uow_connection()
+    if active is not None:
+        yield active
+        return
+
+    conn = get_connection(db_path)
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+@contextmanager
+def unit_of_work(db_path: Optional[Path] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Groups several repository calls into ONE transaction:
+
+        with unit_of_work():
+            order_id = order_repo.create(...)
+            order_item_repo.add_many(...)
+            item_cart_repo.clear(cart_id)
+
+    Starts with BEGIN IMMEDIATE (takes the write lock up front, so the unit cannot
+    fail half-way on a lock upgrade) and commits once at the end. Every connection()/
+    transaction() opened by repositories on this thread shares the same connection.
+    Nested unit_of_work() calls join the outer one.
+    """
+    active = _active_uow_connection()
+    if active is not None:
+        yield active
+        return
+
+    conn = get_connection(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        _uow.conn = conn
+        try:
+            yield conn
+        finally:
+            _uow.conn = None
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def pool_stats(db_path: Optional[Path] = None) -> Dict[str, int]:
+    return get_pool(db_path).stats.as_dict()
+
+
 def execute_script(conn: sqlite3.Connection, sql: str) -> None:
     conn.executescript(sql)
     conn.commit()
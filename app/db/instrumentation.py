@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+
+# OMNISTORE_INSTRUMENT=0 turns query counting off (connections then skip the counting cursor)
+INSTRUMENT_ENABLED = os.getenv("OMNISTORE_INSTRUMENT", "1") == "1"
+
+_local = threading.local()
+
+
+@dataclass
+class QueryCounters:
+    """
+    Database work done on one thread inside a track_queries() scope.
+
+    - statements: execute()/executemany() calls
+    - connections: get_connection() checkouts (pooled or freshly opened)
+    - rows: rows returned by fetchone/fetchmany/fetchall (plain `for row in cursor` is not counted)
+    """
+
+    statements: int = 0
+    connections: int = 0
+    rows: int = 0
+
+    def add(self, other: "QueryCounters") -> None:
+        self.statements += other.statements
+        self.connections += other.connections
+        self.rows += other.rows
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"statements": self.statements, "connections": self.connections, "rows": self.rows}
+
+
+def current_counters() -> Optional[QueryCounters]:
+    return getattr(_local, "counters", None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryCounters]:
+    """
+    Counts the statements / connections / rows of everything run on this thread:
+
+        with track_queries() as q:
+            repo.list_all()
+        q.statements, q.rows
+
+    Nested scopes are added to the enclosing one on exit.
+    """
+    outer = current_counters()
+    counters = QueryCounters()
+    _local.counters = counters if INSTRUMENT_ENABLED else None
+    try:
+        yield counters
+    finally:
+        _local.counters = outer
+        if outer is not None:
+            outer.add(counters)
+
+
+def count_connection() -> None:
+    counters = current_counters()
+    if counters is not None:
+        counters.connections += 1
+
+
+class CountingCursor(sqlite3.Cursor):
+    """
+    Cursor used while a track_queries() scope is active; adds fetched rows to its counters.
+    """
+
+    def fetchone(self):
+        row = super().fetchone()
+        counters = current_counters()
+        if counters is not None and row is not None:
+            counters.rows += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = super().fetchmany(*args, **kwargs)
+        counters = current_counters()
+        if counters is not None:
+            counters.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        counters = current_counters()
+        if counters is not None:
+            counters.rows += len(rows)
+        return rows
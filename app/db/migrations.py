@@ -0,0 +1,159 @@
+"""
+Versioned schema changes on top of SCHEMA_SQL, tracked in PRAGMA user_version.
+
+SCHEMA_SQL (app.db.schema) is the version-0 baseline and stays CREATE IF NOT EXISTS.
+Everything after it is a Migration: applied in order, each in its own BEGIN IMMEDIATE
+transaction together with the user_version bump, so a crash leaves the database at the
+previous version and concurrent starts apply each migration once.
+
+Never edit a released migration; append a new one with the next version.
+
+Run:
+    python -m app.db.migrations            # show version / pending, apply pending
+    python -m app.db.migrations --check    # exit 1 if migrations are pending
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+
+class MigrationError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(
+        1,
+        "History: covering index for a customer's views, newest first",
+        (
+            # list_views / ui_list_history: WHERE CustomerUserID = ? ORDER BY ViewedAt DESC LIMIT ?
+            "CREATE INDEX IF NOT EXISTS idx_hist_customer_viewed ON History(CustomerUserID, ViewedAt, ItemID)",
+        ),
+    ),
+    Migration(
+        2,
+        "Order: covering index for a customer's order pages (CreatedAt DESC, ID DESC)",
+        (
+            'CREATE INDEX IF NOT EXISTS idx_order_customer_created ON "Order"(CustomerUserID, CreatedAt, ID, Status, TotalBase)',
+            # Prefix of the new index
+            "DROP INDEX IF EXISTS idx_order_customer",
+        ),
+    ),
+    Migration(
+        3,
+        "Picture: covering index for an item's pictures, main picture first",
+        (
+            # list_for_item / item details: WHERE ItemID = ? ORDER BY IsMain DESC, ID ASC
+            "CREATE INDEX IF NOT EXISTS idx_picture_item_main ON Picture(ItemID, IsMain DESC, ID, FilePath)",
+            "DROP INDEX IF EXISTS idx_picture_item",
+        ),
+    ),
+    Migration(
+        4,
+        "OrderItem: covering index for an order's lines by name",
+        (
+            # list_for_order: WHERE OrderID = ? ORDER BY ItemName
+            "CREATE INDEX IF NOT EXISTS idx_orderitem_order_name"
+            " ON OrderItem(OrderID, ItemName, ItemID, UnitPriceBase, Quantity)",
+            "DROP INDEX IF EXISTS idx_orderitem_order",
+        ),
+    ),
+)
+
+LATEST_VERSION = MIGRATIONS[-1].version if MIGRATIONS else 0
+
+if [m.version for m in MIGRATIONS] != list(range(1, len(MIGRATIONS) + 1)):
+    raise MigrationError("Migration versions must be 1, 2, 3, ... without gaps")
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def pending_migrations(conn: sqlite3.Connection) -> List[Migration]:
+    current = schema_version(conn)
+    return [m for m in MIGRATIONS if m.version > current]
+
+
+def migrate(conn: sqlite3.Connection, target: Optional[int] = None) -> List[Migration]:
+    """
+    Applies pending migrations up to target (default: all). Returns the ones applied here.
+    """
+    current = schema_version(conn)
+    if current > LATEST_VERSION:
+        raise MigrationError(f"Database schema version {current} is newer than this code ({LATEST_VERSION})")
+    if conn.in_transaction:
+        conn.commit()
+
+    applied: List[Migration] = []
+    for migration in MIGRATIONS:
+        if migration.version <= current or (target is not None and migration.version > target):
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have applied it while we waited for the write lock
+            if schema_version(conn) >= migration.version:
+                conn.rollback()
+                continue
+            for statement in migration.statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            raise MigrationError(f"Migration {migration.version} ({migration.description}) failed: {e}") from e
+        applied.append(migration)
+
+    if applied:
+        # Refresh planner statistics for the new indexes
+        conn.execute("PRAGMA optimize")
+    return applied
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Apply OmniStore schema migrations.")
+    parser.add_argument("--db", type=Path, help="database file (default: OMNISTORE_DB_PATH / data/omnistore.db)")
+    parser.add_argument("--check", action="store_true", help="only report; exit 1 if migrations are pending")
+    args = parser.parse_args(argv)
+
+    from app.db import connection as db_connection
+    from app.db.schema import init_db
+
+    if args.db is not None:
+        db_connection.DB_PATH = args.db
+
+    conn = db_connection.get_connection()
+    try:
+        pending = pending_migrations(conn)
+        print(f"{db_connection.DB_PATH}: schema version {schema_version(conn)}, latest {LATEST_VERSION}")
+        for m in pending:
+            print(f"  pending {m.version}: {m.description}")
+    finally:
+        conn.close()
+
+    if args.check:
+        return 1 if pending else 0
+
+    init_db()  # baseline + migrations
+    conn = db_connection.get_connection()
+    try:
+        print(f"now at version {schema_version(conn)}")
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
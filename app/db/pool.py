@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from app.db.instrumentation import CountingCursor, current_counters
+from app.db.tracing import active_tracer
+
+
+class PoolError(Exception):
+    pass
+
+
+class PoolTimeoutError(PoolError):
+    pass
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    sqlite3.Connection that goes back to its pool on close() instead of closing.
+    Existing `conn = get_connection(); ...; conn.close()` code keeps working unchanged.
+    """
+
+    _pool: Optional["ConnectionPool"] = None
+    _last_used: float = 0.0
+
+    # Statement counting for track_queries() and timing for the SQL tracer;
+    # with neither active this is the plain sqlite3 path
+    def execute(self, sql, parameters=()):
+        counters = current_counters()
+        tracer = active_tracer()
+        if counters is None and tracer is None:
+            return super().execute(sql, parameters)
+        if counters is not None:
+            counters.statements += 1
+        cursor = self.cursor(CountingCursor)
+        if tracer is None:
+            return cursor.execute(sql, parameters)
+        return tracer.run(self, cursor, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        counters = current_counters()
+        tracer = active_tracer()
+        if counters is None and tracer is None:
+            return super().executemany(sql, seq_of_parameters)
+        if counters is not None:
+            counters.statements += 1
+        cursor = self.cursor(CountingCursor)
+        if tracer is None:
+            return cursor.executemany(sql, seq_of_parameters)
+        return tracer.run(self, cursor, sql, seq_of_parameters, many=True)
+
+    def close(self) -> None:
+        pool = self._pool
+        if pool is None:
+            super().close()
+        else:
+            pool.release(self)
+
+    def close_for_real(self) -> None:
+        self._pool = None
+        super().close()
+
+
+@dataclass
+class PoolStats:
+    hits: int = 0           # checkout served by an idle connection
+    misses: int = 0         # checkout had to open a new connection
+    discarded: int = 0      # idle connection failed the health check / overflowed
+    opened: int = 0
+    in_use: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "discarded": self.discarded,
+            "opened": self.opened,
+            "in_use": self.in_use,
+        }
+
+
+@dataclass
+class ConnectionPool:
+    """
+    Per-thread SQLite connection pool.
+
+    - Every thread keeps its own stack of idle connections (sqlite3 connections
+      must not be shared between threads by default).
+    - max_size bounds the number of connections checked out at the same time
+      (across all threads); callers wait up to `timeout` seconds for a free slot.
+    - max_idle_per_thread bounds how many idle connections one thread keeps.
+    - Idle connections older than health_check_after seconds are probed with
+      `SELECT 1` before being handed out again.
+    """
+
+    path: Path
+    connect: Callable[[Path], PooledConnection]
+    max_size: int = 16
+    max_idle_per_thread: int = 2
+    timeout: float = 10.0
+    health_check_after: float = 30.0
+
+    stats: PoolStats = field(default_factory=PoolStats)
+
+    def __post_init__(self):
+        self._local = threading.local()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+
+    # ---------- Internal ----------
+
+    def _idle(self) -> List[PooledConnection]:
+        idle = getattr(self._local, "idle", None)
+        if idle is None:
+            idle = []
+            self._local.idle = idle
+        return idle
+
+    def _is_healthy(self, conn: PooledConnection) -> bool:
+        if (time.monotonic() - conn._last_used) < self.health_check_after:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _count(self, name: str, delta: int = 1) -> None:
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + delta)
+
+    # ---------- Public API ----------
+
+    def acquire(self) -> PooledConnection:
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeoutError(f"No free connection after {self.timeout}s (max_size={self.max_size})")
+
+        try:
+            idle = self._idle()
+            while idle:
+                conn = idle.pop()
+                if self._is_healthy(conn):
+                    self._count("hits")
+                    self._count("in_use")
+                    conn._pool = self
+                    return conn
+                self._count("discarded")
+                conn.close_for_real()
+
+            conn = self.connect(self.path)
+            self._count("misses")
+            self._count("opened")
+            self._count("in_use")
+            conn._pool = self
+            return conn
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn: PooledConnection) -> None:
+        if conn._pool is not self:
+            return  # already released
+
+        conn._pool = None
+        self._count("in_use", -1)
+        self._slots.release()
+
+        try:
+            # Never hand out a connection with a half-done transaction
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._count("discarded")
+            conn.close_for_real()
+            return
+
+        idle = self._idle()
+        if len(idle) >= self.max_idle_per_thread:
+            self._count("discarded")
+            conn.close_for_real()
+            return
+
+        conn._last_used = time.monotonic()
+        idle.append(conn)
+
+    def close_idle(self) -> None:
+        """
+        Closes idle connections of the CALLING thread (other threads' connections
+        are closed when those threads exit).
+        """
+        idle = self._idle()
+        while idle:
+            idle.pop().close_for_real()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            in_use = self.stats.in_use
+            self.stats = PoolStats(in_use=in_use)
@@ -1,4 +1,5 @@
 from app.db.connection import get_connection, execute_script
+from app.db.migrations import migrate
 
 
 SCHEMA_SQL = """
@@ -122,23 +123,84 @@ CREATE TABLE IF NOT EXISTS OrderItem (
     CHECK (Quantity > 0)
 );
 
+-- Exchange rates: snapshots shared by every process using this DB
+CREATE TABLE IF NOT EXISTS ExchangeRateSnapshot (
+    ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Source TEXT NOT NULL,      -- quote base currency, e.g. USD
+    FetchedAt TEXT NOT NULL,   -- ISO timestamp string (UTC)
+    Quotes TEXT NOT NULL,      -- JSON {"USDEUR": 0.92, ...}
+    Provider TEXT NOT NULL
+);
+
+-- Named leases (one row per job), e.g. "only one process refreshes the rates"
+CREATE TABLE IF NOT EXISTS Lease (
+    Name TEXT PRIMARY KEY,
+    Owner TEXT NOT NULL,
+    ExpiresAt REAL NOT NULL    -- unix time
+);
+
 -- Helpful indexes (optional but recommended)
 CREATE INDEX IF NOT EXISTS idx_item_admin ON Item(AdminUserID);
-CREATE INDEX IF NOT EXISTS idx_picture_item ON Picture(ItemID);
+CREATE INDEX IF NOT EXISTS idx_item_price ON Item(Price);
+CREATE INDEX IF NOT EXISTS idx_item_name ON Item(Name);
 CREATE INDEX IF NOT EXISTS idx_item_category_cat ON Item_Category(CategoryID);
 CREATE INDEX IF NOT EXISTS idx_item_cart_item ON Item_Cart(ItemID);
 CREATE INDEX IF NOT EXISTS idx_fav_item ON Favorites(ItemID);
 CREATE INDEX IF NOT EXISTS idx_hist_item ON History(ItemID);
-CREATE INDEX IF NOT EXISTS idx_order_customer ON "Order"(CustomerUserID);
 CREATE INDEX IF NOT EXISTS idx_order_created ON "Order"(CreatedAt);
-CREATE INDEX IF NOT EXISTS idx_orderitem_order ON OrderItem(OrderID);
+CREATE INDEX IF NOT EXISTS idx_rate_snapshot_fetched ON ExchangeRateSnapshot(FetchedAt);
+-- Later indexes (and the ones they replaced) are versioned in app/db/migrations.py
+"""
+
+
+# Full-text index over Item(Name, Description).
+# External-content FTS5 table: the text lives only in Item, triggers keep the index in sync.
+FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS Item_FTS USING fts5(
+    Name,
+    Description,
+    content='Item',
+    content_rowid='ID',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_item_fts_insert AFTER INSERT ON Item BEGIN
+    INSERT INTO Item_FTS(rowid, Name, Description) VALUES (new.ID, new.Name, new.Description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_item_fts_delete AFTER DELETE ON Item BEGIN
+    INSERT INTO Item_FTS(Item_FTS, rowid, Name, Description) VALUES ('delete', old.ID, old.Name, old.Description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_item_fts_update AFTER UPDATE OF Name, Description ON Item BEGIN
+    INSERT INTO Item_FTS(Item_FTS, rowid, Name, Description) VALUES ('delete', old.ID, old.Name, old.Description);
+    INSERT INTO Item_FTS(rowid, Name, Description) VALUES (new.ID, new.Name, new.Description);
+END;
 """
 
 
+def _table_exists(conn, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?",
+        (name,),
+    ).fetchone()
+    return row is not None
+
+
 def init_db() -> None:
     conn = get_connection()
     try:
         execute_script(conn, SCHEMA_SQL)
+
+        fts_existed = _table_exists(conn, "Item_FTS")
+        execute_script(conn, FTS_SQL)
+        if not fts_existed:
+            # Index the items that were inserted before the FTS table existed
+            conn.execute("INSERT INTO Item_FTS(Item_FTS) VALUES ('rebuild')")
+            conn.commit()
+
+        # Versioned changes on top of the baseline (PRAGMA user_version)
+        migrate(conn)
     finally:
         conn.close()
 
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, List
+
+
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORE = {"DEFAULT", "FILE", "MEMORY"}
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    """
+    SQLite PRAGMAs applied to every new connection.
+
+    cache_size follows SQLite semantics: negative = KiB, positive = pages.
+    mmap_size is in bytes (0 = memory-mapped I/O off).
+    """
+
+    name: str
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size: int = -16_000
+    mmap_size: int = 0
+    temp_store: str = "DEFAULT"
+    busy_timeout_ms: int = 5_000
+
+    def __post_init__(self):
+        if self.journal_mode.upper() not in _JOURNAL_MODES:
+            raise ValueError(f"Unknown journal_mode: {self.journal_mode}")
+        if self.synchronous.upper() not in _SYNCHRONOUS:
+            raise ValueError(f"Unknown synchronous level: {self.synchronous}")
+        if self.temp_store.upper() not in _TEMP_STORE:
+            raise ValueError(f"Unknown temp_store: {self.temp_store}")
+        if self.mmap_size < 0:
+            raise ValueError("mmap_size cannot be negative")
+        if self.busy_timeout_ms < 0:
+            raise ValueError("busy_timeout_ms cannot be negative")
+
+    def pragmas(self) -> List[str]:
+        # busy_timeout first, so switching journal_mode can wait for other connections
+        return [
+            f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)};",
+            f"PRAGMA journal_mode = {self.journal_mode.upper()};",
+            f"PRAGMA synchronous = {self.synchronous.upper()};",
+            f"PRAGMA cache_size = {int(self.cache_size)};",
+            f"PRAGMA mmap_size = {int(self.mmap_size)};",
+            f"PRAGMA temp_store = {self.temp_store.upper()};",
+        ]
+
+    def apply(self, conn: sqlite3.Connection) -> None:
+        for pragma in self.pragmas():
+            conn.execute(pragma)
+
+
+STORAGE_PROFILES: Dict[str, StorageProfile] = {
+    # Every commit is fsync-ed (WAL + FULL): nothing is lost on power failure.
+    "durable": StorageProfile(
+        name="durable",
+        journal_mode="WAL",
+        synchronous="FULL",
+        cache_size=-8_000,
+        mmap_size=0,
+        temp_store="DEFAULT",
+        busy_timeout_ms=10_000,
+    ),
+    # Default: WAL + NORMAL is crash-safe (the last commits may roll back on power loss),
+    # readers never block the writer.
+    "balanced": StorageProfile(
+        name="balanced",
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        cache_size=-16_000,
+        mmap_size=64 * 1024 * 1024,
+        temp_store="MEMORY",
+        busy_timeout_ms=5_000,
+    ),
+    # Seeding / imports only: no fsync at all, big cache.
+    "bulk-load": StorageProfile(
+        name="bulk-load",
+        journal_mode="WAL",
+        synchronous="OFF",
+        cache_size=-131_072,
+        mmap_size=256 * 1024 * 1024,
+        temp_store="MEMORY",
+        busy_timeout_ms=30_000,
+    ),
+}
+
+DEFAULT_PROFILE = "balanced"
+
+
+def get_profile(name: str) -> StorageProfile:
+    key = (name or DEFAULT_PROFILE).strip().lower()
+    profile = STORAGE_PROFILES.get(key)
+    if profile is None:
+        raise ValueError(f"Unknown storage profile: {name} (expected one of {', '.join(STORAGE_PROFILES)})")
+    return profile
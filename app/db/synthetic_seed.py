@@ -0,0 +1,325 @@
+"""
+Synthetic, production-sized datasets for benchmarks and load tests.
+
+seed_demo_data_if_empty() (app.db.seed) creates the handful of demo rows the UI needs;
+seed_synthetic() builds N items / M categories / K customers with carts, favorites,
+browsing history and orders, bulk-inserted with executemany in ONE transaction.
+
+The same spec + seed always produces the same rows (ids included, on an empty database),
+so benchmark runs are comparable. Distributions:
+- item prices: log-normal (many cheap items, a long tail of expensive ones)
+- category sizes and item popularity: Zipf-like (a few categories / bestsellers dominate)
+- favorites, history views and orders per customer: geometric (most customers are light users)
+
+Run:
+    python -m app.db.synthetic_seed --items 100000 --customers 5000 --db data/synthetic.db
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.db import connection as db_connection
+from app.db.connection import unit_of_work
+from app.utils.security import DEFAULT_POLICY
+
+
+# Every synthetic user logs in with this password
+SYNTHETIC_PASSWORD = "synthetic123"
+
+ADJECTIVES = ["Oak", "Steel", "Compact", "Wireless", "Vintage", "Ergonomic", "Foldable", "Smart", "Classic",
+              "Outdoor", "Walnut", "Glass", "Modular", "Portable", "Minimal", "Rustic"]
+NOUNS = ["desk", "lamp", "chair", "shelf", "speaker", "kettle", "backpack", "monitor", "sofa", "blender",
+         "cabinet", "stool", "mirror", "rug", "clock", "bench"]
+FEATURES = ["adjustable height", "soft touch finish", "energy saving", "quick assembly", "water resistant",
+            "two year warranty", "scratch proof surface", "low noise motor", "extra storage", "recycled materials"]
+CATEGORY_WORDS = ["Furniture", "Office", "Lighting", "Kitchen", "Audio", "Outdoor", "Storage", "Decor",
+                  "Travel", "Garden", "Kids", "Bath", "Bedroom", "Tools", "Textiles", "Gaming"]
+
+CURRENCIES: Dict[str, float] = {"EUR": 0.6, "USD": 0.2, "GBP": 0.1, "BGN": 0.1}
+ORDER_STATUSES: Dict[str, float] = {"PAID": 0.75, "CREATED": 0.2, "CANCELLED": 0.05}
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """
+    Size and shape of a synthetic dataset. Means are per customer.
+    """
+
+    items: int = 10_000
+    categories: int = 50
+    customers: int = 1_000
+    seed: int = 42
+
+    prefix: str = "synth"  # usernames/emails: <prefix>_c<n>@omnistore.local
+    cart_share: float = 0.6  # customers with a non-empty cart
+    max_cart_lines: int = 8
+    favorites_mean: float = 6.0
+    history_mean: float = 30.0
+    orders_mean: float = 3.0
+    max_order_lines: int = 5
+    pictures_per_item: Tuple[int, int] = (1, 3)
+    categories_per_item: Tuple[int, int] = (1, 3)
+
+    price_median: float = 60.0
+    price_sigma: float = 1.0
+    popularity_skew: float = 1.0  # Zipf exponent; 0 = uniform
+
+    # Timestamps are spread over `days` before this fixed point (not "now": runs must match)
+    until: str = "2025-01-01T00:00:00+00:00"
+    days: int = 365
+
+    def __post_init__(self):
+        if self.items < 0 or self.categories < 0 or self.customers < 0:
+            raise ValueError("Dataset sizes cannot be negative")
+        if not 0.0 <= self.cart_share <= 1.0:
+            raise ValueError("cart_share must be between 0 and 1")
+        if self.days <= 0:
+            raise ValueError("days must be positive")
+
+
+@dataclass
+class SyntheticDataset:
+    """
+    Ids of the generated rows plus per-table counts.
+    """
+
+    admin_id: int
+    items: List[int] = field(default_factory=list)
+    categories: List[int] = field(default_factory=list)
+    customers: List[int] = field(default_factory=list)
+    carts: List[int] = field(default_factory=list)
+    orders: List[int] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+class _Weighted:
+    """
+    Fast repeated weighted picks (cumulative weights + bisect) from one Random.
+    """
+
+    def __init__(self, rnd: random.Random, values: Sequence, weights: Sequence[float]):
+        self.rnd = rnd
+        self.values = list(values)
+        self.cum = list(accumulate(weights))
+
+    def pick(self):
+        return self.values[bisect_left(self.cum, self.rnd.random() * self.cum[-1])]
+
+    def distinct(self, k: int) -> List:
+        k = min(k, len(self.values))
+        seen: Dict = {}
+        attempts = 0
+        while len(seen) < k and attempts < k * 20:
+            seen.setdefault(self.pick(), None)
+            attempts += 1
+        return list(seen)
+
+
+def _zipf_weights(n: int, skew: float) -> List[float]:
+    return [1.0 / (rank ** skew) for rank in range(1, n + 1)]
+
+
+def _geometric(rnd: random.Random, mean: float, cap: int) -> int:
+    """
+    0, 1, 2, ... with the given mean (P(k) = p(1-p)^k), capped.
+    """
+    if mean <= 0:
+        return 0
+    p = 1.0 / (1.0 + mean)
+    k = 0
+    while k < cap and rnd.random() > p:
+        k += 1
+    return k
+
+
+def _next_id(conn, table: str) -> int:
+    return int(conn.execute(f'SELECT COALESCE(MAX(ID), 0) + 1 FROM "{table}"').fetchone()[0])
+
+
+def _timestamp(rnd: random.Random, until: datetime, days: int) -> datetime:
+    return until - timedelta(seconds=rnd.uniform(0, days * 86400.0))
+
+
+def seed_synthetic(spec: SyntheticSpec = SyntheticSpec(), db_path: Optional[Path] = None) -> SyntheticDataset:
+    """
+    Inserts the dataset described by spec into an initialized database (init_db()).
+    Everything goes in with executemany inside one unit_of_work: all or nothing.
+    """
+    rnd = random.Random(spec.seed)
+    until = datetime.fromisoformat(spec.until)
+    # One deterministic hash for every synthetic user (hashing per user would dominate the run)
+    password_hash = DEFAULT_POLICY.hash(SYNTHETIC_PASSWORD, salt=rnd.randbytes(DEFAULT_POLICY.salt_bytes))
+
+    started = time.perf_counter()
+    with unit_of_work(db_path) as conn:
+        user_id = _next_id(conn, "User")
+        admin_id = user_id
+        conn.execute(
+            'INSERT INTO "User"(ID, Username, Password, Name, Email) VALUES (?, ?, ?, ?, ?)',
+            (admin_id, f"{spec.prefix}_admin", password_hash, "Synthetic Admin", f"{spec.prefix}_admin@omnistore.local"),
+        )
+        conn.execute('INSERT INTO "Admin"(UserID, Role) VALUES (?, ?)', (admin_id, "ADMIN"))
+        data = SyntheticDataset(admin_id=admin_id)
+
+        # --- Categories
+        first = _next_id(conn, "Category")
+        data.categories = list(range(first, first + spec.categories))
+        conn.executemany(
+            'INSERT INTO "Category"(ID, Name) VALUES (?, ?)',
+            [
+                (cid, f"{CATEGORY_WORDS[i % len(CATEGORY_WORDS)]} {spec.prefix} {i}")
+                for i, cid in enumerate(data.categories)
+            ],
+        )
+
+        # --- Items (+ pictures, category links); FTS triggers index them as they go in
+        first = _next_id(conn, "Item")
+        data.items = list(range(first, first + spec.items))
+        prices: Dict[int, float] = {}
+        names: Dict[int, str] = {}
+        item_rows, picture_rows, link_rows = [], [], []
+        category_pick = _Weighted(rnd, data.categories, _zipf_weights(len(data.categories), 1.1)) if data.categories else None
+        for item_id in data.items:
+            name = f"{rnd.choice(ADJECTIVES)} {rnd.choice(NOUNS)} {item_id}"
+            price = round(min(5000.0, max(1.0, rnd.lognormvariate(0.0, spec.price_sigma) * spec.price_median)), 2)
+            height, width, depth = (round(rnd.uniform(5.0, 200.0), 1) for _ in range(3))
+            weight = round(height * width * depth / 1000.0 * rnd.uniform(0.05, 0.6), 2)
+            item_rows.append((
+                item_id, admin_id, name, f"{name} with {', '.join(rnd.sample(FEATURES, 3))}.",
+                height, width, depth, weight, price,
+            ))
+            prices[item_id] = price
+            names[item_id] = name
+
+            for n in range(rnd.randint(*spec.pictures_per_item)):
+                picture_rows.append((item_id, f"images/synthetic/{item_id}_{n + 1}.png", 1 if n == 0 else 0))
+            if category_pick is not None:
+                for category_id in category_pick.distinct(rnd.randint(*spec.categories_per_item)):
+                    link_rows.append((item_id, category_id))
+
+        conn.executemany(
+            """
+            INSERT INTO "Item"(ID, AdminUserID, Name, Description, Height, Width, Depth, Weight, Price)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            item_rows,
+        )
+        conn.executemany('INSERT INTO "Picture"(ItemID, FilePath, IsMain) VALUES (?, ?, ?)', picture_rows)
+        conn.executemany('INSERT INTO "Item_Category"(ItemID, CategoryID) VALUES (?, ?)', link_rows)
+
+        # --- Customers with carts, favorites, history and orders
+        user_first = _next_id(conn, "User")
+        cart_first = _next_id(conn, "Cart")
+        order_first = _next_id(conn, "Order")
+        data.customers = list(range(user_first, user_first + spec.customers))
+        data.carts = list(range(cart_first, cart_first + spec.customers))
+
+        popular_items = list(data.items)
+        rnd.shuffle(popular_items)  # bestsellers are not simply the lowest ids
+        item_pick = _Weighted(rnd, popular_items, _zipf_weights(len(popular_items), spec.popularity_skew)) if popular_items else None
+        currency_pick = _Weighted(rnd, list(CURRENCIES), list(CURRENCIES.values()))
+        status_pick = _Weighted(rnd, list(ORDER_STATUSES), list(ORDER_STATUSES.values()))
+
+        user_rows, customer_rows, cart_rows = [], [], []
+        cart_line_rows, favorite_rows, history_rows, order_rows, order_item_rows = [], [], [], [], []
+        order_id = order_first
+        for n, (customer_id, cart_id) in enumerate(zip(data.customers, data.carts)):
+            username = f"{spec.prefix}_c{n}"
+            user_rows.append((customer_id, username, password_hash, f"Synthetic Customer {n}", f"{username}@omnistore.local"))
+            customer_rows.append((customer_id, currency_pick.pick()))
+            cart_rows.append((cart_id, customer_id))
+            if item_pick is None:
+                continue
+
+            if rnd.random() < spec.cart_share:
+                for item_id in item_pick.distinct(rnd.randint(1, spec.max_cart_lines)):
+                    cart_line_rows.append((cart_id, item_id, rnd.choices((1, 2, 3), (0.8, 0.15, 0.05))[0]))
+
+            for item_id in item_pick.distinct(_geometric(rnd, spec.favorites_mean, 200)):
+                favorite_rows.append((customer_id, item_id))
+
+            for _ in range(_geometric(rnd, spec.history_mean, 1000)):
+                history_rows.append((customer_id, item_pick.pick(), _timestamp(rnd, until, spec.days).isoformat()))
+
+            for _ in range(_geometric(rnd, spec.orders_mean, 100)):
+                lines = [(item_id, rnd.choices((1, 2, 3), (0.8, 0.15, 0.05))[0])
+                         for item_id in item_pick.distinct(rnd.randint(1, spec.max_order_lines))]
+                total = round(sum(prices[item_id] * qty for item_id, qty in lines), 2)
+                created_at = _timestamp(rnd, until, spec.days).isoformat()
+                order_rows.append((order_id, customer_id, created_at, status_pick.pick(), total))
+                order_item_rows.extend(
+                    (order_id, item_id, names[item_id], prices[item_id], qty) for item_id, qty in lines
+                )
+                data.orders.append(order_id)
+                order_id += 1
+
+        conn.executemany('INSERT INTO "User"(ID, Username, Password, Name, Email) VALUES (?, ?, ?, ?, ?)', user_rows)
+        conn.executemany('INSERT INTO "Customer"(UserID, Currency) VALUES (?, ?)', customer_rows)
+        conn.executemany('INSERT INTO "Cart"(ID, CustomerUserID) VALUES (?, ?)', cart_rows)
+        conn.executemany('INSERT INTO "Item_Cart"(CartID, ItemID, Quantity) VALUES (?, ?, ?)', cart_line_rows)
+        conn.executemany('INSERT INTO "Favorites"(CustomerUserID, ItemID) VALUES (?, ?)', favorite_rows)
+        # Two views of the same item can land on the same timestamp only by chance: keep the first
+        conn.executemany('INSERT OR IGNORE INTO "History"(CustomerUserID, ItemID, ViewedAt) VALUES (?, ?, ?)', history_rows)
+        conn.executemany(
+            'INSERT INTO "Order"(ID, CustomerUserID, CreatedAt, Status, TotalBase) VALUES (?, ?, ?, ?, ?)',
+            order_rows,
+        )
+        conn.executemany(
+            'INSERT INTO "OrderItem"(OrderID, ItemID, ItemName, UnitPriceBase, Quantity) VALUES (?, ?, ?, ?, ?)',
+            order_item_rows,
+        )
+
+    data.seconds = time.perf_counter() - started
+    data.counts = {
+        "users": len(user_rows) + 1,
+        "categories": len(data.categories),
+        "items": len(item_rows),
+        "pictures": len(picture_rows),
+        "item_categories": len(link_rows),
+        "carts": len(cart_rows),
+        "cart_lines": len(cart_line_rows),
+        "favorites": len(favorite_rows),
+        "history": len(history_rows),
+        "orders": len(order_rows),
+        "order_items": len(order_item_rows),
+    }
+    return data
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Fill an OmniStore database with a synthetic dataset.")
+    parser.add_argument("--db", type=Path, help="database file (default: OMNISTORE_DB_PATH / data/omnistore.db)")
+    parser.add_argument("--items", type=int, default=SyntheticSpec.items)
+    parser.add_argument("--categories", type=int, default=SyntheticSpec.categories)
+    parser.add_argument("--customers", type=int, default=SyntheticSpec.customers)
+    parser.add_argument("--seed", type=int, default=SyntheticSpec.seed)
+    parser.add_argument("--prefix", default=SyntheticSpec.prefix)
+    args = parser.parse_args(argv)
+
+    from app.db.schema import init_db
+
+    if args.db is not None:
+        db_connection.DB_PATH = args.db
+    init_db()
+
+    spec = SyntheticSpec(
+        items=args.items, categories=args.categories, customers=args.customers, seed=args.seed, prefix=args.prefix
+    )
+    data = seed_synthetic(spec)
+    print(f"Seeded {db_connection.DB_PATH} in {data.seconds:.2f}s (seed={spec.seed}):")
+    for table, count in data.counts.items():
+        print(f"  {table:<16} {count:>10}")
+    print(f"Password for every synthetic user: {SYNTHETIC_PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
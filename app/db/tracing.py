@@ -0,0 +1,241 @@
+"""
+Optional SQL tracing and slow-query log for every connection from get_connection().
+
+- OMNISTORE_SQL_TRACE=1: every statement is timed and aggregated per normalized text
+  (sql_tracer.summary()); each one is also logged to the "omnistore.sql" logger at DEBUG.
+- OMNISTORE_SLOW_QUERY_MS=<ms>: statements slower than that go to the "omnistore.sql.slow"
+  logger (and sql_tracer.slow_queries) with the calling repository method and the
+  EXPLAIN QUERY PLAN of the statement, e.g. "SCAN History" + "USE TEMP B-TREE FOR ORDER BY".
+- OMNISTORE_SLOW_QUERY_LOG=<path>: also append the slow-query log to that file.
+
+Time is measured around execute(): prepare + first step. For sorted, grouped or
+aggregated queries that is the whole query; rows fetched later are not included.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+
+logger = logging.getLogger("omnistore.sql")
+slow_logger = logging.getLogger("omnistore.sql.slow")
+
+_WS = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+# Statements that are never explained (no query plan / would change state)
+_NO_PLAN = ("PRAGMA", "BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "EXPLAIN", "CREATE", "DROP", "ANALYZE", "VACUUM")
+
+# Frames of these modules are the "caller" of a statement
+_CALLER_MODULES = ("app.repositories.", "app.services.", "app.db.seed", "app.db.synthetic_seed")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    One line, literals and IN (?, ?, ...) lists folded, so the same query groups together.
+    """
+    text = _WS.sub(" ", sql).strip()
+    text = _STRING.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    return _IN_LIST.sub("(?...)", text)
+
+
+def _caller() -> str:
+    """
+    First repository/service frame on the stack, as Class.method (or module.function).
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(_CALLER_MODULES):
+            qualname = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+            if "<locals>" in qualname:
+                return qualname.replace(".<locals>", "")  # StoreAppService.ui_list_history.op
+            owner = frame.f_locals.get("self")
+            prefix = type(owner).__name__ if owner is not None else module.rsplit(".", 1)[-1]
+            return f"{prefix}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "?"
+
+
+def explain(conn: sqlite3.Connection, sql: str, parameters=()) -> List[str]:
+    """
+    EXPLAIN QUERY PLAN as indented lines ("SEARCH Item USING INTEGER PRIMARY KEY (rowid=?)").
+    """
+    if sql.lstrip().upper().startswith(_NO_PLAN):
+        return []
+    try:
+        rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+    except sqlite3.Error as e:
+        return [f"(no plan: {e})"]
+
+    depth: Dict[int, int] = {0: -1}
+    lines = []
+    for row in rows:
+        node_id, parent, detail = row[0], row[1], row[3]
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + str(detail))
+    return lines
+
+
+@dataclass
+class StatementStats:
+    sql: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    callers: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict:
+        return {
+            "sql": self.sql,
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.calls, 4) if self.calls else None,
+            "max_ms": round(self.max_ms, 3),
+            "callers": dict(sorted(self.callers.items(), key=lambda kv: -kv[1])),
+        }
+
+
+@dataclass
+class SlowQuery:
+    at: float
+    sql: str
+    duration_ms: float
+    caller: str
+    plan: List[str]
+
+    def as_dict(self) -> Dict:
+        return {
+            "at": self.at,
+            "sql": self.sql,
+            "duration_ms": round(self.duration_ms, 3),
+            "caller": self.caller,
+            "plan": self.plan,
+        }
+
+    def format(self) -> str:
+        plan = "\n".join(f"    {line}" for line in self.plan) or "    (no plan)"
+        return f"slow query {self.duration_ms:.1f} ms in {self.caller}: {self.sql}\n{plan}"
+
+
+class SqlTracer:
+    """
+    Times statements run through PooledConnection.execute/executemany.
+    Inactive (and never consulted by connections) unless tracing or a slow threshold is on.
+    """
+
+    def __init__(self, trace: bool = False, slow_ms: Optional[float] = None, keep_slow: int = 200):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, StatementStats] = {}
+        self.slow_queries: Deque[SlowQuery] = deque(maxlen=keep_slow)
+        self.trace = trace
+        self.slow_ms = slow_ms
+
+    @property
+    def active(self) -> bool:
+        return self.trace or self.slow_ms is not None
+
+    def run(self, conn: sqlite3.Connection, cursor: sqlite3.Cursor, sql: str, parameters, many: bool = False):
+        started = time.perf_counter()
+        try:
+            return cursor.executemany(sql, parameters) if many else cursor.execute(sql, parameters)
+        finally:
+            self.record(conn, sql, None if many else parameters, (time.perf_counter() - started) * 1000.0)
+
+    def record(self, conn: sqlite3.Connection, sql: str, parameters, duration_ms: float) -> None:
+        slow = self.slow_ms is not None and duration_ms >= self.slow_ms
+        if not (self.trace or slow):
+            return
+
+        normalized = normalize_sql(sql)
+        caller = _caller()
+        if self.trace:
+            with self._lock:
+                stats = self._stats.get(normalized)
+                if stats is None:
+                    stats = self._stats[normalized] = StatementStats(normalized)
+                stats.calls += 1
+                stats.total_ms += duration_ms
+                stats.max_ms = max(stats.max_ms, duration_ms)
+                stats.callers[caller] = stats.callers.get(caller, 0) + 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%.3f ms %s: %s", duration_ms, caller, normalized)
+
+        if slow:
+            # executemany has no single parameter set to explain with: use NULLs
+            params = parameters if parameters is not None else [None] * sql.count("?")
+            entry = SlowQuery(time.time(), normalized, duration_ms, caller, explain(conn, sql, params))
+            self.slow_queries.append(entry)
+            slow_logger.warning(entry.format())
+
+    def summary(self, top: Optional[int] = None, order_by: str = "total_ms") -> List[Dict]:
+        with self._lock:
+            rows = [s.as_dict() for s in self._stats.values()]
+        rows.sort(key=lambda r: -(r[order_by] or 0))
+        return rows[:top] if top else rows
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.slow_queries.clear()
+
+
+def _env_slow_ms() -> Optional[float]:
+    value = os.getenv("OMNISTORE_SLOW_QUERY_MS")
+    return float(value) if value not in (None, "") else None
+
+
+sql_tracer = SqlTracer(trace=os.getenv("OMNISTORE_SQL_TRACE", "0") == "1", slow_ms=_env_slow_ms())
+
+_file_handler: Optional[logging.Handler] = None
+
+
+def active_tracer() -> Optional[SqlTracer]:
+    return sql_tracer if sql_tracer.active else None
+
+
+def configure_tracing(
+    trace: Optional[bool] = None,
+    slow_ms: Optional[float] = None,
+    slow_log_path: Optional[Path] = None,
+    disable_slow_log: bool = False,
+) -> SqlTracer:
+    """
+    Runtime switch (benchmarks, debugging sessions). Only the given settings change.
+    """
+    global _file_handler
+    if trace is not None:
+        sql_tracer.trace = trace
+    if slow_ms is not None:
+        sql_tracer.slow_ms = slow_ms
+    if disable_slow_log:
+        sql_tracer.slow_ms = None
+
+    if slow_log_path is not None:
+        if _file_handler is not None:
+            slow_logger.removeHandler(_file_handler)
+            _file_handler.close()
+        path = Path(slow_log_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _file_handler = logging.FileHandler(path, encoding="utf-8")
+        _file_handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        slow_logger.addHandler(_file_handler)
+        slow_logger.setLevel(logging.WARNING)
+    return sql_tracer
+
+
+if os.getenv("OMNISTORE_SLOW_QUERY_LOG"):
+    configure_tracing(slow_log_path=Path(os.environ["OMNISTORE_SLOW_QUERY_LOG"]))
+
@@ -14,3 +14,19 @@ class CartItem:
     def __post_init__(self):
         if self.quantity <= 0:
             raise ValueError("CartItem quantity must be positive")
+
+
+@dataclass
+class CartLine:
+    """
+    Read model for one cart line joined with its Item (Item_Cart JOIN Item).
+    """
+
+    item_id: int
+    name: str
+    unit_price_base: float
+    quantity: int
+
+    @property
+    def subtotal_base(self) -> float:
+        return self.unit_price_base * self.quantity
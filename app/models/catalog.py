@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+
+SORT_FIELDS = ("id", "name", "price")
+
+
+@dataclass(frozen=True)
+class CatalogQuery:
+    """
+    One catalog page request: filters + sort + keyset cursor.
+
+    after = (sort_value, item_id) of the last row of the previous page.
+    Dimension filters are in centimeters (length = Depth column).
+    """
+
+    sort: str = "id"  # id | name | price
+    descending: bool = False
+
+    category_id: Optional[int] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_height: Optional[float] = None
+    max_height: Optional[float] = None
+    min_width: Optional[float] = None
+    max_width: Optional[float] = None
+    min_length: Optional[float] = None
+    max_length: Optional[float] = None
+
+    limit: int = 50
+    after: Optional[Tuple[Any, int]] = None
+
+    def __post_init__(self):
+        if self.sort not in SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {self.sort}")
+        if self.limit <= 0:
+            raise ValueError("Limit must be positive")
+        if self.min_price is not None and self.max_price is not None and self.min_price > self.max_price:
+            raise ValueError("min_price cannot be greater than max_price")
+
+
+@dataclass(frozen=True)
+class CatalogRow:
+    """
+    Projection of Item used by catalog lists (no description/dimensions, no validation).
+    """
+
+    item_id: int
+    name: str
+    price: float
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """
+    Full-text search result: catalog projection + highlighted description snippet.
+    rank is the bm25 score (lower = better match).
+    """
+
+    item_id: int
+    name: str
+    price: float
+    snippet: str
+    rank: float
@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class RateSnapshot:
+    """
+    All quotes of one /live fetch: 1 source = quotes[source + CCY] CCY.
+    """
+
+    id: Optional[int]
+    source: str
+    fetched_at: str  # ISO timestamp (UTC)
+    quotes: Dict[str, float]
+    provider: str
+
+    @property
+    def fetched_ts(self) -> float:
+        return datetime.fromisoformat(self.fetched_at).timestamp()
+
+    def age_seconds(self, now: Optional[float] = None) -> float:
+        now = datetime.now(timezone.utc).timestamp() if now is None else now
+        return max(0.0, now - self.fetched_ts)
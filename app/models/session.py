@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from typing import Optional
+import time
+
+
+@dataclass(frozen=True)
+class UserSession:
+    """
+    A logged-in user as resolved once at login: identity, role and display currency.
+    token is opaque to callers; expires_at is unix time.
+    """
+
+    token: str
+    user_id: int
+    username: str
+    email: str
+    role: str  # USER | CUSTOMER | ADMIN
+    currency: str
+    issued_at: float
+    expires_at: float
+
+    @property
+    def is_customer(self) -> bool:
+        return self.role.upper() == "CUSTOMER"
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role.upper() == "ADMIN"
+
+    def expired(self, now: Optional[float] = None) -> bool:
+        return (time.time() if now is None else now) >= self.expires_at
@@ -14,6 +14,7 @@ class User:
     email: str
     password_hash: str
     role: str = "USER"  # USER or ADMIN
+    currency: Optional[str] = None  # set for customers when loaded together with the role
 
     def is_admin(self) -> bool:
         return self.role.upper() == "ADMIN"
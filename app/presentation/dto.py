@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 from typing import List, Dict
 
 
@@ -15,6 +16,29 @@ def item_list_dto(items) -> List[Dict]:
     ]
 
 
+def item_page_dto(page: Dict) -> Dict:
+    return {
+        "items": item_list_dto(page["items"]),
+        "next_cursor": page.get("next_cursor"),
+    }
+
+
+def item_search_dto(result: Dict) -> Dict:
+    return {
+        "query": result["query"],
+        "items": [
+            {
+                "id": it["item_id"],
+                "name": it["name"],
+                "price": it["price_base"],
+                "currency": it["currency"],
+                "snippet": it["snippet"],
+            }
+            for it in result["items"]
+        ],
+    }
+
+
 # ---------- CART ----------
 
 def cart_dto(cart: Dict) -> Dict:
@@ -40,38 +64,44 @@ def cart_dto(cart: Dict) -> Dict:
 # ---------- ORDER ----------
 
 def order_list_dto(orders: List[Dict]) -> List[Dict]:
-    return [
-        {
-            "order_id": o["order_id"],
-            "created_at": o["created_at"],
-            "status": o["status"],
-            "total": o["total_base"],
-            "currency": o["currency"],
-        }
-        for o in orders
-    ]
+    return [_order_dto(o) for o in orders]
+
+
+def _order_dto(o: Dict) -> Dict:
+    return {
+        "order_id": o["order_id"],
+        "created_at": o["created_at"],
+        "status": o["status"],
+        "total": o.get("total", o["total_base"]),
+        "currency": o["currency"],
+    }
+
+
+def _order_item_dto(it: Dict) -> Dict:
+    return {
+        "item_id": it["item_id"],
+        "name": it["item_name"],
+        "quantity": it["quantity"],
+        "unit_price": it.get("unit_price", it["unit_price_base"]),
+        "subtotal": it.get("subtotal", it["subtotal_base"]),
+        "currency": it["currency"],
+    }
 
 
 def order_details_dto(details: Dict) -> Dict:
     return {
-        "order": {
-            "order_id": details["order"]["order_id"],
-            "created_at": details["order"]["created_at"],
-            "status": details["order"]["status"],
-            "total": details["order"]["total_base"],
-            "currency": details["order"]["currency"],
-        },
-        "items": [
-            {
-                "item_id": it["item_id"],
-                "name": it["item_name"],
-                "quantity": it["quantity"],
-                "unit_price": it["unit_price_base"],
-                "subtotal": it["subtotal_base"],
-                "currency": it["currency"],
-            }
-            for it in details["items"]
+        "order": _order_dto(details["order"]),
+        "items": [_order_item_dto(it) for it in details["items"]],
+    }
+
+
+def order_page_dto(page: Dict) -> Dict:
+    return {
+        "orders": [
+            {**_order_dto(o), "items": [_order_item_dto(it) for it in o["items"]]}
+            for o in page["orders"]
         ],
+        "next_cursor": page.get("next_cursor"),
     }
 
 def item_details_dto(details: Dict) -> Dict:
@@ -93,3 +123,17 @@ def item_details_dto(details: Dict) -> Dict:
         "main_picture": details.get("main_picture"),
     }
 
+
+
+# ---------- SESSION ----------
+
+def session_dto(session) -> Dict:
+    return {
+        "token": session.token,
+        "user_id": session.user_id,
+        "username": session.username,
+        "email": session.email,
+        "role": session.role,
+        "currency": session.currency,
+        "expires_at": datetime.fromtimestamp(session.expires_at, tz=timezone.utc).isoformat(),
+    }
@@ -24,6 +24,11 @@ from app.services.currency_service import (
     CurrencyServiceError,
     UnsupportedCurrencyError,
 )
+from app.services.session_service import (
+    SessionError,
+    InvalidSessionError,
+    NotCustomerError,
+)
 
 # Facade-level error (we created it in store_app_service.py)
 from app.presentation.app_exceptions import AppError
@@ -46,6 +51,14 @@ def map_exception(exc: Exception) -> Tuple[str, str]:
     if isinstance(exc, InvalidCredentialsError):
         return "INVALID_CREDENTIALS", "Invalid email or password"
 
+    # ---- Session ----
+    if isinstance(exc, InvalidSessionError):
+        return "SESSION_EXPIRED", "Your session has expired, please log in again"
+    if isinstance(exc, NotCustomerError):
+        return "NOT_CUSTOMER", "This action requires a customer account"
+    if isinstance(exc, SessionError):
+        return "SESSION_ERROR", "Session error"
+
     # ---- Cart ----
     if isinstance(exc, ItemNotFoundError):
         return "ITEM_NOT_FOUND", "Item not found"
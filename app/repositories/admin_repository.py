@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import Optional
-from app.db.connection import get_connection
+from app.db.connection import connection, transaction
 
 
 class AdminRepository:
@@ -9,8 +9,7 @@ class AdminRepository:
         """
         Inserts (or replaces) a row in Admin table for the given user.
         """
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """
                 INSERT INTO Admin (UserID, Role)
@@ -19,29 +18,20 @@ class AdminRepository:
                 """,
                 (user_id, role),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def is_admin(self, user_id: int) -> bool:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 "SELECT 1 FROM Admin WHERE UserID = ? LIMIT 1",
                 (user_id,),
             )
             return cur.fetchone() is not None
-        finally:
-            conn.close()
 
     def get_role(self, user_id: int) -> Optional[str]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 "SELECT Role FROM Admin WHERE UserID = ?",
                 (user_id,),
             )
             row = cur.fetchone()
             return row["Role"] if row else None
-        finally:
-            conn.close()
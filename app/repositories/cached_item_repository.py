@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import copy
+import os
+from typing import Dict, Iterable, List, Optional
+
+from app.models.item import Item
+from app.repositories.item_repository import ItemRepository
+from app.utils.lru_cache import LruTtlCache
+
+
+CATALOG_CACHE_SIZE = int(os.getenv("OMNISTORE_CATALOG_CACHE_SIZE", "5000"))
+CATALOG_CACHE_TTL = float(os.getenv("OMNISTORE_CATALOG_CACHE_TTL", "300"))
+
+# Key of the cached list_all() result (item ids are ints, so no clash)
+_ALL_KEY = "__all__"
+
+
+class CachedItemRepository(ItemRepository):
+    """
+    Read-through cache in front of ItemRepository, keyed by item id.
+
+    - get_by_id / get_many / list_all are served from a bounded LRU+TTL cache.
+    - create / update / delete invalidate the affected entries (and the cached list).
+      A read that raced with such a write is not cached: reads take the cache generation
+      before querying and only store their rows if no invalidation happened meanwhile.
+    - list_all() is cached as one entry; it does not fill the per-id entries, so a full
+      listing cannot evict the hot get_by_id() items from the LRU.
+    - strict=True always reads SQLite (and refreshes the cache with what it read);
+      use strict_view() for price snapshots such as checkout.
+
+    Callers get copies, so mutating a returned Item never corrupts the cache.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[LruTtlCache] = None,
+        *,
+        max_size: int = CATALOG_CACHE_SIZE,
+        ttl_seconds: Optional[float] = CATALOG_CACHE_TTL,
+        strict: bool = False,
+    ):
+        self.cache = cache if cache is not None else LruTtlCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.strict = strict
+
+    def strict_view(self) -> "CachedItemRepository":
+        """
+        Same cache, but every read goes to SQLite first.
+        """
+        return CachedItemRepository(self.cache, strict=True)
+
+    # ---------- Reads ----------
+
+    def get_by_id(self, item_id: int) -> Optional[Item]:
+        item_id = int(item_id)
+        if not self.strict:
+            cached = self.cache.get(item_id)
+            if cached is not None:
+                return copy.copy(cached)
+
+        generation = self.cache.generation
+        item = super().get_by_id(item_id)
+        if item is None:
+            # A miss has nothing cached to drop, and invalidating would bump the generation
+            # and void concurrent fills. A strict read may still hold a stale entry.
+            if self.strict:
+                self.cache.invalidate(item_id)
+            return None
+        self.cache.put(item_id, item, if_generation=generation)
+        return copy.copy(item)
+
+    def get_many(self, item_ids: Iterable[int]) -> Dict[int, Item]:
+        ids = {int(i) for i in item_ids}
+        result: Dict[int, Item] = {}
+
+        missing = ids
+        if not self.strict:
+            missing = set()
+            for item_id in ids:
+                cached = self.cache.get(item_id)
+                if cached is None:
+                    missing.add(item_id)
+                else:
+                    result[item_id] = copy.copy(cached)
+
+        if missing:
+            generation = self.cache.generation
+            loaded = super().get_many(missing)
+            for item_id, item in loaded.items():
+                self.cache.put(item_id, item, if_generation=generation)
+                result[item_id] = copy.copy(item)
+
+        return result
+
+    def list_all(self) -> List[Item]:
+        if not self.strict:
+            cached = self.cache.get(_ALL_KEY)
+            if cached is not None:
+                return [copy.copy(it) for it in cached]
+
+        generation = self.cache.generation
+        items = super().list_all()
+        self.cache.put(_ALL_KEY, items, if_generation=generation)
+        return [copy.copy(it) for it in items]
+
+    # ---------- Writes (invalidate) ----------
+
+    def create(self, item: Item) -> int:
+        new_id = super().create(item)
+        self.cache.invalidate(_ALL_KEY)
+        return new_id
+
+    def update(self, item: Item) -> None:
+        super().update(item)
+        self.cache.invalidate(int(item.id))
+        self.cache.invalidate(_ALL_KEY)
+
+    def delete(self, item_id: int) -> None:
+        super().delete(item_id)
+        self.cache.invalidate(int(item_id))
+        self.cache.invalidate(_ALL_KEY)
+
+    def invalidate_all(self) -> None:
+        self.cache.clear()
+
+    # ---------- Stats ----------
+
+    def cache_stats(self) -> Dict:
+        stats = self.cache.stats.as_dict()
+        stats["size"] = len(self.cache)
+        return stats
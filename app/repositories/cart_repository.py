@@ -3,7 +3,7 @@ from __future__ import annotations
 import sqlite3
 from typing import Optional
 
-from app.db.connection import get_connection
+from app.db.connection import connection, transaction
 from app.models.cart import Cart
 
 
@@ -21,8 +21,7 @@ class CartRepository:
         - if a cart already exists, this will raise sqlite constraint error
           unless you call get_or_create_for_customer().
         """
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             cur = conn.execute(
                 """
                 INSERT INTO Cart (CustomerUserID)
@@ -30,34 +29,25 @@ class CartRepository:
                 """,
                 (customer_user_id,),
             )
-            conn.commit()
             return int(cur.lastrowid)
-        finally:
-            conn.close()
 
     def get_by_id(self, cart_id: int) -> Optional[Cart]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """SELECT ID, CustomerUserID FROM Cart WHERE ID = ?""",
                 (cart_id,),
             )
             row = cur.fetchone()
             return self._row_to_cart(row) if row else None
-        finally:
-            conn.close()
 
     def get_by_customer(self, customer_user_id: int) -> Optional[Cart]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """SELECT ID, CustomerUserID FROM Cart WHERE CustomerUserID = ?""",
                 (customer_user_id,),
             )
             row = cur.fetchone()
             return self._row_to_cart(row) if row else None
-        finally:
-            conn.close()
 
     def get_or_create_for_customer(self, customer_user_id: int) -> Cart:
         existing = self.get_by_customer(customer_user_id)
@@ -71,12 +61,8 @@ class CartRepository:
         return created
 
     def delete(self, cart_id: int) -> None:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """DELETE FROM Cart WHERE ID = ?""",
                 (cart_id,),
             )
-            conn.commit()
-        finally:
-            conn.close()
@@ -3,7 +3,7 @@ from __future__ import annotations
 import sqlite3
 from typing import List, Optional
 
-from app.db.connection import get_connection
+from app.db.connection import connection, transaction
 from app.models.category import Category
 
 
@@ -20,92 +20,68 @@ class CategoryRepository:
         if not name:
             raise ValueError("Category name cannot be empty")
 
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             cur = conn.execute(
                 """INSERT INTO Category (Name) VALUES (?)""",
                 (name,),
             )
-            conn.commit()
             return int(cur.lastrowid)
-        finally:
-            conn.close()
 
     def get_by_id(self, category_id: int) -> Optional[Category]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """SELECT ID, Name FROM Category WHERE ID = ?""",
                 (category_id,),
             )
             row = cur.fetchone()
             return self._row_to_category(row) if row else None
-        finally:
-            conn.close()
 
     def get_by_name(self, name: str) -> Optional[Category]:
         name = (name or "").strip()
         if not name:
             return None
 
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """SELECT ID, Name FROM Category WHERE Name = ?""",
                 (name,),
             )
             row = cur.fetchone()
             return self._row_to_category(row) if row else None
-        finally:
-            conn.close()
 
     def list_all(self) -> List[Category]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """SELECT ID, Name FROM Category ORDER BY Name ASC"""
             )
             return [self._row_to_category(r) for r in cur.fetchall()]
-        finally:
-            conn.close()
 
     def update_name(self, category_id: int, new_name: str) -> None:
         new_name = (new_name or "").strip()
         if not new_name:
             raise ValueError("New category name cannot be empty")
 
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """UPDATE Category SET Name = ? WHERE ID = ?""",
                 (new_name, category_id),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def delete(self, category_id: int) -> None:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """DELETE FROM Category WHERE ID = ?""",
                 (category_id,),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def exists_name(self, name: str) -> bool:
         name = (name or "").strip()
         if not name:
             return False
 
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """SELECT 1 FROM Category WHERE Name = ? LIMIT 1""",
                 (name,),
             )
             return cur.fetchone() is not None
-        finally:
-            conn.close()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.db.connection import connection, transaction
+from app.models.exchange_rate import RateSnapshot
+
+
+class ExchangeRateRepository:
+    def __init__(self, db_path: Optional[Path] = None):
+        # None = the app DB; another path reads snapshots exported elsewhere
+        self.db_path = db_path
+
+    @staticmethod
+    def _row_to_snapshot(row: sqlite3.Row) -> RateSnapshot:
+        return RateSnapshot(
+            id=int(row["ID"]),
+            source=row["Source"],
+            fetched_at=row["FetchedAt"],
+            quotes={str(k): float(v) for k, v in json.loads(row["Quotes"]).items()},
+            provider=row["Provider"],
+        )
+
+    def save_snapshot(
+        self,
+        source: str,
+        quotes: Dict[str, float],
+        provider: str,
+        fetched_at: Optional[str] = None,
+    ) -> RateSnapshot:
+        fetched_at = fetched_at or datetime.now(timezone.utc).isoformat()
+        with transaction(self.db_path) as conn:
+            cur = conn.execute(
+                """
+                INSERT INTO ExchangeRateSnapshot (Source, FetchedAt, Quotes, Provider)
+                VALUES (?, ?, ?, ?)
+                """,
+                (source, fetched_at, json.dumps(quotes, sort_keys=True), provider),
+            )
+            snapshot_id = int(cur.lastrowid)
+        return RateSnapshot(id=snapshot_id, source=source, fetched_at=fetched_at, quotes=dict(quotes), provider=provider)
+
+    def latest(self) -> Optional[RateSnapshot]:
+        with connection(self.db_path) as conn:
+            cur = conn.execute(
+                """
+                SELECT ID, Source, FetchedAt, Quotes, Provider
+                FROM ExchangeRateSnapshot
+                ORDER BY FetchedAt DESC, ID DESC
+                LIMIT 1
+                """
+            )
+            row = cur.fetchone()
+            return self._row_to_snapshot(row) if row else None
+
+    def latest_fetched_at(self) -> Optional[str]:
+        """
+        Cheap freshness probe (no JSON decoding).
+        """
+        with connection(self.db_path) as conn:
+            row = conn.execute("SELECT MAX(FetchedAt) AS FetchedAt FROM ExchangeRateSnapshot").fetchone()
+            return row["FetchedAt"] if row else None
+
+    # ---------- History (as-of lookups) ----------
+
+    def index_between(self, start: str, end: str) -> List[Tuple[int, str]]:
+        """
+        (ID, FetchedAt) of every snapshot that was in effect somewhere in [start, end], oldest first:
+        the latest one at or before start + all fetched up to end.
+        Empty if nothing was fetched by end. No JSON is decoded here.
+        """
+        with connection(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                SELECT ID, FetchedAt FROM (
+                    SELECT ID, FetchedAt FROM ExchangeRateSnapshot
+                    WHERE FetchedAt <= ?
+                    ORDER BY FetchedAt DESC, ID DESC
+                    LIMIT 1
+                )
+                UNION
+                SELECT ID, FetchedAt FROM ExchangeRateSnapshot
+                WHERE FetchedAt > ? AND FetchedAt <= ?
+                ORDER BY FetchedAt ASC, ID ASC
+                """,
+                (start, start, end),
+            ).fetchall()
+            return [(int(r["ID"]), r["FetchedAt"]) for r in rows]
+
+    def get_many(self, snapshot_ids: Iterable[int]) -> Dict[int, RateSnapshot]:
+        ids = sorted({int(i) for i in snapshot_ids})
+        if not ids:
+            return {}
+        placeholders = ", ".join("?" for _ in ids)
+        with connection(self.db_path) as conn:
+            cur = conn.execute(
+                f"""
+                SELECT ID, Source, FetchedAt, Quotes, Provider
+                FROM ExchangeRateSnapshot
+                WHERE ID IN ({placeholders})
+                """,
+                ids,
+            )
+            return {int(r["ID"]): self._row_to_snapshot(r) for r in cur.fetchall()}
+
+    # ---------- Leases ----------
+
+    def acquire_lease(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        """
+        Takes the named lease if it is free, expired or already ours (one atomic statement,
+        so exactly one process/thread wins). The lease ends by itself after ttl_seconds.
+        """
+        now = time.time()
+        with transaction(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                INSERT INTO Lease (Name, Owner, ExpiresAt)
+                VALUES (?, ?, ?)
+                ON CONFLICT(Name) DO UPDATE SET Owner = excluded.Owner, ExpiresAt = excluded.ExpiresAt
+                WHERE Lease.ExpiresAt < ? OR Lease.Owner = excluded.Owner
+                RETURNING Owner
+                """,
+                (name, owner, now + ttl_seconds, now),
+            ).fetchall()
+        return bool(rows)
+
+    def release_lease(self, name: str, owner: str) -> None:
+        with transaction(self.db_path) as conn:
+            conn.execute(
+                """
+                DELETE FROM Lease
+                WHERE Name = ? AND Owner = ?
+                """,
+                (name, owner),
+            )
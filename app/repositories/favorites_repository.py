@@ -3,13 +3,12 @@ from __future__ import annotations
 import sqlite3
 from typing import List
 
-from app.db.connection import get_connection
+from app.db.connection import connection, transaction
 
 
 class FavoritesRepository:
     def add(self, customer_user_id: int, item_id: int) -> None:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """
                 INSERT OR IGNORE INTO Favorites (CustomerUserID, ItemID)
@@ -17,13 +16,9 @@ class FavoritesRepository:
                 """,
                 (customer_user_id, item_id),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def remove(self, customer_user_id: int, item_id: int) -> None:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """
                 DELETE FROM Favorites
@@ -31,13 +26,9 @@ class FavoritesRepository:
                 """,
                 (customer_user_id, item_id),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def is_favorite(self, customer_user_id: int, item_id: int) -> bool:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """
                 SELECT 1 FROM Favorites
@@ -47,12 +38,9 @@ class FavoritesRepository:
                 (customer_user_id, item_id),
             )
             return cur.fetchone() is not None
-        finally:
-            conn.close()
 
     def list_item_ids(self, customer_user_id: int) -> List[int]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """
                 SELECT ItemID
@@ -63,5 +51,3 @@ class FavoritesRepository:
                 (customer_user_id,),
             )
             return [int(r["ItemID"]) for r in cur.fetchall()]
-        finally:
-            conn.close()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import List, Tuple, Optional
-from app.db.connection import get_connection
+from app.db.connection import connection, transaction
 
 
 class HistoryRepository:
@@ -9,8 +9,7 @@ class HistoryRepository:
         """
         Inserts a history record. (CustomerUserID, ItemID, ViewedAt) is the PK.
         """
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """
                 INSERT INTO History (CustomerUserID, ItemID, ViewedAt)
@@ -18,9 +17,6 @@ class HistoryRepository:
                 """,
                 (customer_user_id, item_id, viewed_at),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def list_views(
         self,
@@ -33,8 +29,7 @@ class HistoryRepository:
         """
         order = "DESC" if newest_first else "ASC"
 
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 f"""
                 SELECT ItemID, ViewedAt
@@ -47,16 +42,10 @@ class HistoryRepository:
             )
             rows = cur.fetchall()
             return [(int(r["ItemID"]), str(r["ViewedAt"])) for r in rows]
-        finally:
-            conn.close()
 
     def clear(self, customer_user_id: int) -> None:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """DELETE FROM History WHERE CustomerUserID = ?""",
                 (customer_user_id,),
             )
-            conn.commit()
-        finally:
-            conn.close()
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import sqlite3
-from typing import List, Optional
+from typing import Dict, List, Mapping, Optional
 
-from app.db.connection import get_connection
-from app.models.cart_item import CartItem
+from app.db.connection import connection, transaction
+from app.models.cart_item import CartItem, CartLine
 
 
 class ItemCartRepository:
@@ -24,8 +24,7 @@ class ItemCartRepository:
         if quantity <= 0:
             raise ValueError("Quantity must be positive")
 
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """
                 INSERT INTO Item_Cart (CartID, ItemID, Quantity)
@@ -34,98 +33,97 @@ class ItemCartRepository:
                 """,
                 (cart_id, item_id, quantity),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
-    def increment(self, cart_id: int, item_id: int, delta: int = 1) -> None:
+    def increment(self, cart_id: int, item_id: int, delta: int = 1) -> int:
         """
         Adds delta to quantity if exists, otherwise inserts with delta.
-        delta must be positive.
+        delta must be positive. Returns the new quantity.
+
+        One atomic UPSERT statement, so concurrent increments are never lost.
         """
         if delta <= 0:
             raise ValueError("Delta must be positive")
 
-        conn = get_connection()
-        try:
-            cur = conn.execute(
+        with transaction() as conn:
+            rows = conn.execute(
                 """
-                SELECT Quantity FROM Item_Cart
-                WHERE CartID = ? AND ItemID = ?
+                INSERT INTO Item_Cart (CartID, ItemID, Quantity)
+                VALUES (?, ?, ?)
+                ON CONFLICT(CartID, ItemID) DO UPDATE SET Quantity = Quantity + excluded.Quantity
+                RETURNING Quantity
                 """,
-                (cart_id, item_id),
-            )
-            row = cur.fetchone()
-            if row:
-                new_q = int(row["Quantity"]) + delta
-                conn.execute(
-                    """
-                    UPDATE Item_Cart
-                    SET Quantity = ?
-                    WHERE CartID = ? AND ItemID = ?
-                    """,
-                    (new_q, cart_id, item_id),
-                )
-            else:
-                conn.execute(
-                    """
-                    INSERT INTO Item_Cart (CartID, ItemID, Quantity)
-                    VALUES (?, ?, ?)
-                    """,
-                    (cart_id, item_id, delta),
-                )
-            conn.commit()
-        finally:
-            conn.close()
+                (cart_id, item_id, delta),
+            ).fetchall()
+            return int(rows[0]["Quantity"])
 
-    def decrement(self, cart_id: int, item_id: int, delta: int = 1) -> None:
+    def decrement(self, cart_id: int, item_id: int, delta: int = 1) -> int:
         """
         Subtracts delta from quantity; if it becomes 0 or less, removes row.
-        delta must be positive.
+        delta must be positive. Returns the new quantity (0 = line removed / not in cart).
         """
         if delta <= 0:
             raise ValueError("Delta must be positive")
 
-        conn = get_connection()
-        try:
-            cur = conn.execute(
+        with transaction() as conn:
+            return self._apply_one(conn, cart_id, item_id, -delta)
+
+    def apply_delta(self, cart_id: int, deltas: Mapping[int, int]) -> Dict[int, int]:
+        """
+        Applies several quantity changes {item_id: +n / -n} in ONE transaction.
+        Lines that drop to 0 or below are removed. Returns {item_id: new quantity}.
+        """
+        result: Dict[int, int] = {}
+        changes = [(int(item_id), int(delta)) for item_id, delta in deltas.items() if int(delta) != 0]
+        if not changes:
+            return result
+
+        with transaction() as conn:
+            for item_id, delta in sorted(changes):
+                result[item_id] = self._apply_one(conn, cart_id, item_id, delta)
+        return result
+
+    @staticmethod
+    def _apply_one(conn: sqlite3.Connection, cart_id: int, item_id: int, delta: int) -> int:
+        if delta > 0:
+            rows = conn.execute(
                 """
-                SELECT Quantity FROM Item_Cart
-                WHERE CartID = ? AND ItemID = ?
+                INSERT INTO Item_Cart (CartID, ItemID, Quantity)
+                VALUES (?, ?, ?)
+                ON CONFLICT(CartID, ItemID) DO UPDATE SET Quantity = Quantity + excluded.Quantity
+                RETURNING Quantity
                 """,
-                (cart_id, item_id),
-            )
-            row = cur.fetchone()
-            if not row:
-                return
-
-            current = int(row["Quantity"])
-            new_q = current - delta
-
-            if new_q > 0:
-                conn.execute(
-                    """
-                    UPDATE Item_Cart
-                    SET Quantity = ?
-                    WHERE CartID = ? AND ItemID = ?
-                    """,
-                    (new_q, cart_id, item_id),
-                )
-            else:
-                conn.execute(
-                    """
-                    DELETE FROM Item_Cart
-                    WHERE CartID = ? AND ItemID = ?
-                    """,
-                    (cart_id, item_id),
-                )
-            conn.commit()
-        finally:
-            conn.close()
+                (cart_id, item_id, delta),
+            ).fetchall()
+            return int(rows[0]["Quantity"])
+
+        # The UPDATE takes the write lock, so nobody can change the line before the DELETE
+        rows = conn.execute(
+            """
+            UPDATE Item_Cart
+            SET Quantity = Quantity + ?
+            WHERE CartID = ? AND ItemID = ?
+            RETURNING Quantity
+            """,
+            (delta, cart_id, item_id),
+        ).fetchall()
+        if not rows:
+            return 0
+
+        new_q = int(rows[0]["Quantity"])
+        if new_q > 0:
+            return new_q
+
+        conn.execute(
+            """
+            DELETE FROM Item_Cart
+            WHERE CartID = ? AND ItemID = ?
+            """,
+            (cart_id, item_id),
+        )
+        return 0
 
     def remove_item(self, cart_id: int, item_id: int) -> None:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """
                 DELETE FROM Item_Cart
@@ -133,13 +131,22 @@ class ItemCartRepository:
                 """,
                 (cart_id, item_id),
             )
-            conn.commit()
-        finally:
-            conn.close()
+
+    def clear(self, cart_id: int) -> None:
+        """
+        Removes all items from a cart (the Cart row itself is kept).
+        """
+        with transaction() as conn:
+            conn.execute(
+                """
+                DELETE FROM Item_Cart
+                WHERE CartID = ?
+                """,
+                (cart_id,),
+            )
 
     def list_items(self, cart_id: int) -> List[CartItem]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """
                 SELECT CartID, ItemID, Quantity
@@ -150,12 +157,34 @@ class ItemCartRepository:
                 (cart_id,),
             )
             return [self._row_to_cart_item(r) for r in cur.fetchall()]
-        finally:
-            conn.close()
+
+    def list_lines(self, cart_id: int) -> List[CartLine]:
+        """
+        Cart lines joined with Item in ONE query (lines whose item was deleted are dropped).
+        """
+        with connection() as conn:
+            cur = conn.execute(
+                """
+                SELECT ic.ItemID, i.Name, i.Price, ic.Quantity
+                FROM Item_Cart ic
+                JOIN Item i ON i.ID = ic.ItemID
+                WHERE ic.CartID = ?
+                ORDER BY ic.ItemID ASC
+                """,
+                (cart_id,),
+            )
+            return [
+                CartLine(
+                    item_id=int(r["ItemID"]),
+                    name=r["Name"],
+                    unit_price_base=float(r["Price"]),
+                    quantity=int(r["Quantity"]),
+                )
+                for r in cur.fetchall()
+            ]
 
     def get_item(self, cart_id: int, item_id: int) -> Optional[CartItem]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """
                 SELECT CartID, ItemID, Quantity
@@ -166,5 +195,3 @@ class ItemCartRepository:
             )
             row = cur.fetchone()
             return self._row_to_cart_item(row) if row else None
-        finally:
-            conn.close()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import List
 
-from app.db.connection import get_connection
+from app.db.connection import connection, transaction
 from app.models.category import Category
 from app.models.item import Item
 from app.models.product import Dimensions
@@ -10,8 +10,7 @@ from app.models.product import Dimensions
 
 class ItemCategoryRepository:
     def add(self, item_id: int, category_id: int) -> None:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """
                 INSERT OR IGNORE INTO Item_Category (ItemID, CategoryID)
@@ -19,13 +18,9 @@ class ItemCategoryRepository:
                 """,
                 (item_id, category_id),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def remove(self, item_id: int, category_id: int) -> None:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """
                 DELETE FROM Item_Category
@@ -33,13 +28,9 @@ class ItemCategoryRepository:
                 """,
                 (item_id, category_id),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def list_categories_for_item(self, item_id: int) -> List[Category]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """
                 SELECT c.ID, c.Name
@@ -52,12 +43,9 @@ class ItemCategoryRepository:
             )
             rows = cur.fetchall()
             return [Category(id=r["ID"], name=r["Name"]) for r in rows]
-        finally:
-            conn.close()
 
     def list_items_for_category(self, category_id: int) -> List[Item]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """
                 SELECT i.ID, i.AdminUserID, i.Name, i.Description, i.Height, i.Width, i.Depth, i.Weight, i.Price
@@ -87,5 +75,3 @@ class ItemCategoryRepository:
                     )
                 )
             return items
-        finally:
-            conn.close()
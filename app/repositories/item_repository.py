@@ -1,13 +1,54 @@
 from __future__ import annotations
 
+import re
 import sqlite3
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
-from app.db.connection import get_connection
+from app.db.connection import connection, transaction
+from app.models.catalog import CatalogQuery, CatalogRow, SearchHit
 from app.models.item import Item
 from app.models.product import Dimensions
 
 
+# Keep IN (...) lists well below SQLite's host-parameter limit
+_MAX_IN_PARAMS = 500
+
+# CatalogQuery.sort -> column (ID breaks ties, so (column, ID) is a unique keyset)
+_SORT_COLUMNS = {"id": "i.ID", "name": "i.Name", "price": "i.Price"}
+
+# CatalogQuery range filters -> (column, operator)
+_RANGE_FILTERS = (
+    ("min_price", "i.Price", ">="),
+    ("max_price", "i.Price", "<="),
+    ("min_height", "i.Height", ">="),
+    ("max_height", "i.Height", "<="),
+    ("min_width", "i.Width", ">="),
+    ("max_width", "i.Width", "<="),
+    ("min_length", "i.Depth", ">="),
+    ("max_length", "i.Depth", "<="),
+)
+
+# bm25 column weights for Item_FTS(Name, Description): a hit in the name counts more
+_BM25_WEIGHTS = (10.0, 1.0)
+
+# Words of the user's search text (FTS5 syntax characters are dropped)
+_SEARCH_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    Turns free text into an FTS5 MATCH expression: every word must match,
+    the last one as a prefix ("desk lam" -> '"desk" "lam"*').
+    Returns None when the text has no searchable words.
+    """
+    words = _SEARCH_TOKEN.findall(text or "")
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
 class ItemRepository:
     @staticmethod
     def _row_to_item(row: sqlite3.Row) -> Item:
@@ -26,8 +67,7 @@ class ItemRepository:
         )
 
     def create(self, item: Item) -> int:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             cur = conn.execute(
                 """
                 INSERT INTO "Item" (
@@ -47,14 +87,10 @@ class ItemRepository:
                     item.price,
                 ),
             )
-            conn.commit()
             return int(cur.lastrowid)
-        finally:
-            conn.close()
 
     def get_by_id(self, item_id: int) -> Optional[Item]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """
                 SELECT ID, AdminUserID, Name, Description, Height, Width, Depth, Weight, Price
@@ -65,12 +101,35 @@ class ItemRepository:
             )
             row = cur.fetchone()
             return self._row_to_item(row) if row else None
-        finally:
-            conn.close()
+
+    def get_many(self, item_ids: Iterable[int]) -> Dict[int, Item]:
+        """
+        Set-based lookup: returns {item_id: Item} for the ids that exist.
+        Missing ids are simply absent from the result.
+        """
+        ids = sorted({int(i) for i in item_ids})
+        result: Dict[int, Item] = {}
+        if not ids:
+            return result
+
+        with connection() as conn:
+            for start in range(0, len(ids), _MAX_IN_PARAMS):
+                chunk = ids[start:start + _MAX_IN_PARAMS]
+                placeholders = ", ".join("?" for _ in chunk)
+                cur = conn.execute(
+                    f"""
+                    SELECT ID, AdminUserID, Name, Description, Height, Width, Depth, Weight, Price
+                    FROM "Item"
+                    WHERE ID IN ({placeholders})
+                    """,
+                    chunk,
+                )
+                for r in cur.fetchall():
+                    result[int(r["ID"])] = self._row_to_item(r)
+        return result
 
     def list_all(self) -> List[Item]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """
                 SELECT ID, AdminUserID, Name, Description, Height, Width, Depth, Weight, Price
@@ -79,12 +138,94 @@ class ItemRepository:
                 """
             )
             return [self._row_to_item(r) for r in cur.fetchall()]
-        finally:
-            conn.close()
+
+    def query_catalog(self, query: CatalogQuery) -> List[CatalogRow]:
+        """
+        One page of the catalog: only ID/Name/Price are read, filters and keyset
+        pagination are done in SQL. Returns at most query.limit rows.
+        """
+        where: List[str] = []
+        params: List = []
+
+        if query.category_id is not None:
+            where.append("EXISTS (SELECT 1 FROM Item_Category ic WHERE ic.ItemID = i.ID AND ic.CategoryID = ?)")
+            params.append(int(query.category_id))
+
+        for attr, column, op in _RANGE_FILTERS:
+            value = getattr(query, attr)
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                params.append(float(value))
+
+        sort_col = _SORT_COLUMNS[query.sort]
+        direction = "DESC" if query.descending else "ASC"
+
+        if query.after is not None:
+            sort_value, last_id = query.after
+            op = "<" if query.descending else ">"
+            if query.sort == "id":
+                where.append(f"i.ID {op} ?")
+                params.append(int(last_id))
+            else:
+                where.append(f"({sort_col}, i.ID) {op} (?, ?)")
+                params.extend([sort_value, int(last_id)])
+
+        where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+        order_sql = f"i.ID {direction}" if query.sort == "id" else f"{sort_col} {direction}, i.ID {direction}"
+
+        with connection() as conn:
+            cur = conn.execute(
+                f"""
+                SELECT i.ID, i.Name, i.Price
+                FROM "Item" i
+                {where_sql}
+                ORDER BY {order_sql}
+                LIMIT ?
+                """,
+                (*params, int(query.limit)),
+            )
+            return [
+                CatalogRow(item_id=int(r["ID"]), name=r["Name"], price=float(r["Price"]))
+                for r in cur.fetchall()
+            ]
+
+    def search(self, text: str, limit: int = 20, snippet_tokens: int = 12) -> List[SearchHit]:
+        """
+        Ranked full-text search over Item name/description (FTS5, bm25).
+        The snippet comes from the description with matches wrapped in [ ].
+        """
+        match = build_match_query(text)
+        if match is None:
+            return []
+
+        name_w, desc_w = _BM25_WEIGHTS
+        with connection() as conn:
+            cur = conn.execute(
+                """
+                SELECT i.ID, i.Name, i.Price,
+                       snippet(Item_FTS, 1, '[', ']', '…', ?) AS Snippet,
+                       bm25(Item_FTS, ?, ?) AS Rank
+                FROM Item_FTS
+                JOIN "Item" i ON i.ID = Item_FTS.rowid
+                WHERE Item_FTS MATCH ?
+                ORDER BY Rank
+                LIMIT ?
+                """,
+                (int(snippet_tokens), name_w, desc_w, match, int(limit)),
+            )
+            return [
+                SearchHit(
+                    item_id=int(r["ID"]),
+                    name=r["Name"],
+                    price=float(r["Price"]),
+                    snippet=r["Snippet"] or "",
+                    rank=float(r["Rank"]),
+                )
+                for r in cur.fetchall()
+            ]
 
     def list_by_admin(self, admin_user_id: int) -> List[Item]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """
                 SELECT ID, AdminUserID, Name, Description, Height, Width, Depth, Weight, Price
@@ -95,15 +236,12 @@ class ItemRepository:
                 (admin_user_id,),
             )
             return [self._row_to_item(r) for r in cur.fetchall()]
-        finally:
-            conn.close()
 
     def update(self, item: Item) -> None:
         if item.id is None:
             raise ValueError("Cannot update item without id")
 
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """
                 UPDATE "Item"
@@ -127,17 +265,10 @@ class ItemRepository:
                     item.id,
                 ),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def delete(self, item_id: int) -> None:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """DELETE FROM "Item" WHERE ID = ?""",
                 (item_id,),
             )
-            conn.commit()
-        finally:
-            conn.close()
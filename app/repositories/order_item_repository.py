@@ -3,7 +3,7 @@ from __future__ import annotations
 import sqlite3
 from typing import List, Optional
 
-from app.db.connection import get_connection
+from app.db.connection import connection, transaction
 from app.models.order_item import OrderItem
 
 
@@ -19,8 +19,7 @@ class OrderItemRepository:
         )
 
     def add(self, order_item: OrderItem) -> None:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """
                 INSERT INTO OrderItem (OrderID, ItemID, ItemName, UnitPriceBase, Quantity)
@@ -34,13 +33,31 @@ class OrderItemRepository:
                     int(order_item.quantity),
                 ),
             )
-            conn.commit()
-        finally:
-            conn.close()
+
+    def add_many(self, order_items: List[OrderItem]) -> None:
+        """
+        Inserts several order lines with one executemany (same transaction).
+        """
+        with transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO OrderItem (OrderID, ItemID, ItemName, UnitPriceBase, Quantity)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        oi.order_id,
+                        oi.item_id,
+                        oi.item_name,
+                        float(oi.unit_price_base),
+                        int(oi.quantity),
+                    )
+                    for oi in order_items
+                ],
+            )
 
     def list_for_order(self, order_id: int) -> List[OrderItem]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """
                 SELECT OrderID, ItemID, ItemName, UnitPriceBase, Quantity
@@ -51,12 +68,9 @@ class OrderItemRepository:
                 (order_id,),
             )
             return [self._row_to_order_item(r) for r in cur.fetchall()]
-        finally:
-            conn.close()
 
     def get(self, order_id: int, item_id: Optional[int]) -> Optional[OrderItem]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """
                 SELECT OrderID, ItemID, ItemName, UnitPriceBase, Quantity
@@ -67,5 +81,3 @@ class OrderItemRepository:
             )
             row = cur.fetchone()
             return self._row_to_order_item(row) if row else None
-        finally:
-            conn.close()
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import sqlite3
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from app.db.connection import get_connection
+from app.db.connection import connection, transaction
 from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.repositories.order_item_repository import OrderItemRepository
 
 
 class OrderRepository:
@@ -19,8 +21,7 @@ class OrderRepository:
         )
 
     def create(self, customer_user_id: int, created_at: str, status: str = "CREATED", total_base: float = 0.0) -> int:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             cur = conn.execute(
                 """
                 INSERT INTO "Order" (CustomerUserID, CreatedAt, Status, TotalBase)
@@ -28,58 +29,100 @@ class OrderRepository:
                 """,
                 (customer_user_id, created_at, status, float(total_base)),
             )
-            conn.commit()
             return int(cur.lastrowid)
-        finally:
-            conn.close()
 
     def update_status(self, order_id: int, status: str) -> None:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """UPDATE "Order" SET Status = ? WHERE ID = ?""",
                 (status, order_id),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def update_total_base(self, order_id: int, total_base: float) -> None:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """UPDATE "Order" SET TotalBase = ? WHERE ID = ?""",
                 (float(total_base), order_id),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def get_by_id(self, order_id: int) -> Optional[Order]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """SELECT ID, CustomerUserID, CreatedAt, Status, TotalBase FROM "Order" WHERE ID = ?""",
                 (order_id,),
             )
             row = cur.fetchone()
             return self._row_to_order(row) if row else None
-        finally:
-            conn.close()
 
-    def list_for_customer(self, customer_user_id: int, limit: int = 50) -> List[Order]:
-        conn = get_connection()
-        try:
+    @staticmethod
+    def _keyset_filter(before: Optional[Tuple[str, int]]) -> Tuple[str, tuple]:
+        """
+        Keyset condition for pages ordered by (CreatedAt DESC, ID DESC):
+        rows strictly older than the (created_at, order_id) cursor.
+        """
+        if before is None:
+            return "", ()
+        created_at, order_id = before
+        return "AND (CreatedAt, ID) < (?, ?)", (created_at, int(order_id))
+
+    def list_for_customer(
+        self,
+        customer_user_id: int,
+        limit: int = 50,
+        before: Optional[Tuple[str, int]] = None,
+    ) -> List[Order]:
+        """
+        Newest first. Pass the (created_at, id) of the last order of the previous page as `before`
+        to get the next page (keyset pagination, cost does not grow with the page number).
+        """
+        cond, cond_params = self._keyset_filter(before)
+        with connection() as conn:
             cur = conn.execute(
-                """
+                f"""
                 SELECT ID, CustomerUserID, CreatedAt, Status, TotalBase
                 FROM "Order"
-                WHERE CustomerUserID = ?
-                ORDER BY CreatedAt DESC
+                WHERE CustomerUserID = ? {cond}
+                ORDER BY CreatedAt DESC, ID DESC
                 LIMIT ?
                 """,
-                (customer_user_id, limit),
+                (customer_user_id, *cond_params, limit),
             )
             return [self._row_to_order(r) for r in cur.fetchall()]
-        finally:
-            conn.close()
+
+    def list_with_items_for_customer(
+        self,
+        customer_user_id: int,
+        limit: int = 20,
+        before: Optional[Tuple[str, int]] = None,
+    ) -> List[Tuple[Order, List[OrderItem]]]:
+        """
+        One page of orders together with their OrderItem rows, in ONE query.
+        Same ordering / keyset cursor as list_for_customer().
+        """
+        cond, cond_params = self._keyset_filter(before)
+        with connection() as conn:
+            cur = conn.execute(
+                f"""
+                WITH page AS (
+                    SELECT ID, CustomerUserID, CreatedAt, Status, TotalBase
+                    FROM "Order"
+                    WHERE CustomerUserID = ? {cond}
+                    ORDER BY CreatedAt DESC, ID DESC
+                    LIMIT ?
+                )
+                SELECT p.ID, p.CustomerUserID, p.CreatedAt, p.Status, p.TotalBase,
+                       oi.OrderID, oi.ItemID, oi.ItemName, oi.UnitPriceBase, oi.Quantity
+                FROM page p
+                LEFT JOIN OrderItem oi ON oi.OrderID = p.ID
+                ORDER BY p.CreatedAt DESC, p.ID DESC, oi.ItemName ASC
+                """,
+                (customer_user_id, *cond_params, limit),
+            )
+
+            result: List[Tuple[Order, List[OrderItem]]] = []
+            for r in cur.fetchall():
+                if not result or result[-1][0].id != r["ID"]:
+                    result.append((self._row_to_order(r), []))
+                if r["OrderID"] is not None:
+                    result[-1][1].append(OrderItemRepository._row_to_order_item(r))
+            return result
@@ -3,7 +3,7 @@ from __future__ import annotations
 import sqlite3
 from typing import List, Optional
 
-from app.db.connection import get_connection
+from app.db.connection import connection, transaction
 from app.models.picture import Picture
 
 
@@ -26,8 +26,7 @@ class PictureRepository:
         if not file_path:
             raise ValueError("file_path cannot be empty")
 
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             cur = conn.execute(
                 """
                 INSERT INTO Picture (ItemID, FilePath, IsMain)
@@ -48,26 +47,19 @@ class PictureRepository:
                     (item_id, new_id),
                 )
 
-            conn.commit()
             return new_id
-        finally:
-            conn.close()
 
     def get_by_id(self, picture_id: int) -> Optional[Picture]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """SELECT ID, ItemID, FilePath, IsMain FROM Picture WHERE ID = ?""",
                 (picture_id,),
             )
             row = cur.fetchone()
             return self._row_to_picture(row) if row else None
-        finally:
-            conn.close()
 
     def list_for_item(self, item_id: int) -> List[Picture]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """
                 SELECT ID, ItemID, FilePath, IsMain
@@ -78,12 +70,9 @@ class PictureRepository:
                 (item_id,),
             )
             return [self._row_to_picture(r) for r in cur.fetchall()]
-        finally:
-            conn.close()
 
     def get_main_for_item(self, item_id: int) -> Optional[Picture]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """
                 SELECT ID, ItemID, FilePath, IsMain
@@ -95,15 +84,12 @@ class PictureRepository:
             )
             row = cur.fetchone()
             return self._row_to_picture(row) if row else None
-        finally:
-            conn.close()
 
     def set_main(self, picture_id: int) -> None:
         """
         Sets a picture as main for its item (and unsets others).
         """
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             # Find which item this picture belongs to
             cur = conn.execute(
                 """SELECT ItemID FROM Picture WHERE ID = ?""",
@@ -124,17 +110,10 @@ class PictureRepository:
                 """UPDATE Picture SET IsMain = 0 WHERE ItemID = ? AND ID != ?""",
                 (item_id, picture_id),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def delete(self, picture_id: int) -> None:
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             conn.execute(
                 """DELETE FROM Picture WHERE ID = ?""",
                 (picture_id,),
             )
-            conn.commit()
-        finally:
-            conn.close()
@@ -3,7 +3,7 @@ from __future__ import annotations
 import sqlite3
 from typing import Optional
 
-from app.db.connection import get_connection
+from app.db.connection import connection, transaction
 from app.models.user import User
 
 
@@ -11,7 +11,8 @@ class UserRepository:
     """
     Data access for the User table.
     Works only with base user data (id, username, email, password_hash, name).
-    Roles/admin/customer-specific data will be handled by separate repositories/services.
+    Roles/admin/customer-specific data will be handled by separate repositories/services;
+    the get_with_role_* lookups only read them (login/register in one query).
     """
 
     @staticmethod
@@ -25,6 +26,27 @@ class UserRepository:
             role="USER",  # role is derived from Admin/Customer tables later
         )
 
+    # User + role + customer currency in one statement (ADMIN > CUSTOMER > USER)
+    _WITH_ROLE_SQL = """
+        SELECT u.ID, u.Username, u.Password, u.Name, u.Email,
+               CASE
+                   WHEN a.UserID IS NOT NULL THEN 'ADMIN'
+                   WHEN c.UserID IS NOT NULL THEN 'CUSTOMER'
+                   ELSE 'USER'
+               END AS ResolvedRole,
+               c.Currency AS Currency
+        FROM "User" u
+        LEFT JOIN Admin a ON a.UserID = u.ID
+        LEFT JOIN Customer c ON c.UserID = u.ID
+    """
+
+    @classmethod
+    def _row_to_user_with_role(cls, row: sqlite3.Row) -> User:
+        user = cls._row_to_user(row)
+        user.role = row["ResolvedRole"]
+        user.currency = row["Currency"]
+        return user
+
     def create(
         self,
         username: str,
@@ -35,8 +57,7 @@ class UserRepository:
         """
         Inserts a new user into the database and returns the new user ID.
         """
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             cur = conn.execute(
                 """
                 INSERT INTO "User" (Username, Password, Name, Email)
@@ -44,65 +65,70 @@ class UserRepository:
                 """,
                 (username, password_hash, name, email),
             )
-            conn.commit()
             return int(cur.lastrowid)
-        finally:
-            conn.close()
 
     def get_by_id(self, user_id: int) -> Optional[User]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """SELECT ID, Username, Password, Name, Email FROM "User" WHERE ID = ?""",
                 (user_id,),
             )
             row = cur.fetchone()
             return self._row_to_user(row) if row else None
-        finally:
-            conn.close()
 
     def get_by_email(self, email: str) -> Optional[User]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """SELECT ID, Username, Password, Name, Email FROM "User" WHERE Email = ?""",
                 (email,),
             )
             row = cur.fetchone()
             return self._row_to_user(row) if row else None
-        finally:
-            conn.close()
 
     def get_by_username(self, username: str) -> Optional[User]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """SELECT ID, Username, Password, Name, Email FROM "User" WHERE Username = ?""",
                 (username,),
             )
             row = cur.fetchone()
             return self._row_to_user(row) if row else None
-        finally:
-            conn.close()
+
+    def get_with_role_by_id(self, user_id: int) -> Optional[User]:
+        """
+        Like get_by_id, with role (and customer currency) resolved in the same query.
+        """
+        with connection() as conn:
+            row = conn.execute(self._WITH_ROLE_SQL + " WHERE u.ID = ?", (user_id,)).fetchone()
+            return self._row_to_user_with_role(row) if row else None
+
+    def get_with_role_by_email(self, email: str) -> Optional[User]:
+        """
+        Like get_by_email, with role (and customer currency) resolved in the same query.
+        """
+        with connection() as conn:
+            row = conn.execute(self._WITH_ROLE_SQL + " WHERE u.Email = ?", (email,)).fetchone()
+            return self._row_to_user_with_role(row) if row else None
 
     def exists_email(self, email: str) -> bool:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """SELECT 1 FROM "User" WHERE Email = ? LIMIT 1""",
                 (email,),
             )
             return cur.fetchone() is not None
-        finally:
-            conn.close()
 
     def exists_username(self, username: str) -> bool:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.execute(
                 """SELECT 1 FROM "User" WHERE Username = ? LIMIT 1""",
                 (username,),
             )
             return cur.fetchone() is not None
-        finally:
-            conn.close()
+
+    def update_password_hash(self, user_id: int, password_hash: str) -> None:
+        with transaction() as conn:
+            conn.execute(
+                """UPDATE "User" SET Password = ? WHERE ID = ?""",
+                (password_hash, user_id),
+            )
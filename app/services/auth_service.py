@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from typing import Optional
 
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
-from app.utils.security import hash_password, verify_password
+from app.utils.security import HashPolicy, HashWorkerPool, hash_password, policy_from_env, verify_password
 
 
 # --------- Domain/service-level exceptions (за UI съобщения) ---------
@@ -36,6 +36,40 @@ class WeakPasswordError(AuthError):
 class AuthService:
     user_repo: UserRepository
 
+    # How new hashes are made; older hashes are upgraded on the next successful login
+    hash_policy: HashPolicy = field(default_factory=policy_from_env)
+
+    # Bounded worker pool for hashing (None = hash on the calling thread)
+    hash_pool: Optional[HashWorkerPool] = None
+
+    # ---------- Hashing ----------
+
+    def _hash(self, password: str) -> str:
+        if self.hash_pool is not None:
+            return self.hash_pool.hash(password, self.hash_policy)
+        return hash_password(password, self.hash_policy)
+
+    def _verify(self, password: str, stored_hash: str) -> bool:
+        if self.hash_pool is not None:
+            return self.hash_pool.verify(password, stored_hash)
+        return verify_password(password, stored_hash)
+
+    def _rehash_if_needed(self, user: User, password: str) -> User:
+        """
+        Re-hashes with the current policy after a successful login (the only time the
+        plain password is known). A failed write keeps the old, still valid hash.
+        """
+        if not self.hash_policy.needs_rehash(user.password_hash):
+            return user
+        new_hash = self._hash(password)
+        try:
+            self.user_repo.update_password_hash(user.id, new_hash)
+        except Exception:
+            return user
+        return replace(user, password_hash=new_hash)
+
+    # ---------- Use cases ----------
+
     def register(self, username: str, email: str, name: str, password: str) -> User:
         username = (username or "").strip()
         email = (email or "").strip()
@@ -58,7 +92,7 @@ class AuthService:
         if self.user_repo.exists_username(username):
             raise UsernameAlreadyExistsError("Username is already taken")
 
-        pw_hash = hash_password(password)
+        pw_hash = self._hash(password)
         user_id = self.user_repo.create(
             username=username,
             email=email,
@@ -66,7 +100,7 @@ class AuthService:
             name=name,
         )
 
-        created = self.user_repo.get_by_id(user_id)
+        created = self.user_repo.get_with_role_by_id(user_id)
         # created няма как да е None, но пазим sanity check:
         if created is None:
             raise AuthError("User creation failed unexpectedly")
@@ -79,11 +113,12 @@ class AuthService:
         if not email or not password:
             raise InvalidCredentialsError("Invalid email or password")
 
-        user = self.user_repo.get_by_email(email)
+        # role + currency come with the same query (no RoleService round trips afterwards)
+        user = self.user_repo.get_with_role_by_email(email)
         if user is None:
             raise InvalidCredentialsError("Invalid email or password")
 
-        if not verify_password(password, user.password_hash):
+        if not self._verify(password, user.password_hash):
             raise InvalidCredentialsError("Invalid email or password")
 
-        return user
+        return self._rehash_if_needed(user, password)
@@ -49,6 +49,21 @@ class CartService:
         cart = self.get_cart_for_customer(customer_user_id)
         self.item_cart_repo.increment(cart.id, item_id, delta=quantity)
 
+    def apply_delta(self, customer_user_id: int, deltas: Dict[int, int]) -> Dict[int, int]:
+        """
+        Multi-line cart change in one transaction: {item_id: +n to add / -n to remove}.
+        Returns {item_id: new quantity} (0 = line removed).
+        """
+        added = [int(item_id) for item_id, delta in deltas.items() if int(delta) > 0]
+        if added:
+            existing = self.item_repo.get_many(added)
+            missing = sorted(set(added) - set(existing))
+            if missing:
+                raise ItemNotFoundError(f"Item {missing[0]} does not exist")
+
+        cart = self.get_cart_for_customer(customer_user_id)
+        return self.item_cart_repo.apply_delta(cart.id, deltas)
+
     def set_quantity(self, customer_user_id: int, item_id: int, quantity: int) -> None:
         if quantity <= 0:
             raise InvalidQuantityError("Quantity must be positive")
@@ -72,54 +87,57 @@ class CartService:
         cart = self.get_cart_for_customer(customer_user_id)
         return self.item_cart_repo.list_items(cart.id)
 
-    def get_detailed_items(
+    def get_cart_view(
         self,
         customer_user_id: int,
         display_currency: Optional[str] = None,
-    ) -> List[Dict]:
+    ) -> Dict:
         """
-        Returns list of dicts ready for UI:
+        Builds the whole cart view ONCE (one JOIN query for all lines):
         {
-          item_id, name,
-          unit_price_base, subtotal_base,
-          unit_price, subtotal,
-          quantity,
-          currency
+          "items": [ {item_id, name, quantity, unit_price_base, subtotal_base, unit_price, subtotal, currency}, ... ],
+          "total": {total_base, total, currency}
         }
 
-        - unit_price_base/subtotal_base are in EUR (base_currency)
-        - unit_price/subtotal are in display_currency
+        - *_base values are in EUR (base_currency)
+        - unit_price/subtotal/total are in display_currency
         """
         cart = self.get_cart_for_customer(customer_user_id)
-        cart_items = self.item_cart_repo.list_items(cart.id)
+        lines = self.item_cart_repo.list_lines(cart.id)
 
         target = (display_currency or self._get_customer_currency(customer_user_id)).upper()
 
-        result: List[Dict] = []
-        for ci in cart_items:
-            item = self.item_repo.get_by_id(ci.item_id)
-            if item is None:
-                continue  # if item was deleted
+        convert = (target != self.base_currency) and currency_service.enabled
+        if not convert:
+            target = self.base_currency  # show EUR whilst API is turned off
 
-            unit_base = float(item.price)
-            subtotal_base = unit_base * ci.quantity
-
-            api_enabled = bool(getattr(currency_service, "access_key", None))
-
-            if (target == self.base_currency) or (not api_enabled):
-                unit_disp = round(unit_base, 2)
-                subtotal_disp = round(subtotal_base, 2)
-                target = self.base_currency  # show EUR whilst API is turned off
-            else:
-                unit_disp = currency_service.convert(unit_base, to_currency=target, from_currency=self.base_currency)
-                subtotal_disp = currency_service.convert(subtotal_base, to_currency=target, from_currency=self.base_currency)
+        units_base = [line.unit_price_base for line in lines]
+        subtotals_base = [line.subtotal_base for line in lines]
+        total_base = round(sum(round(v, 2) for v in subtotals_base), 2)
 
+        if convert:
+            # One bulk conversion for every unit price, subtotal and the total
+            converted = currency_service.convert_many(
+                [*units_base, *subtotals_base, total_base],
+                to_currency=target,
+                from_currency=self.base_currency,
+            )
+            n = len(lines)
+            units_disp, subtotals_disp, total = converted[:n], converted[n:2 * n], converted[2 * n]
+        else:
+            units_disp = [round(v, 2) for v in units_base]
+            subtotals_disp = [round(v, 2) for v in subtotals_base]
+            total = total_base
 
-            result.append(
+        items: List[Dict] = []
+        for line, unit_base, subtotal_base, unit_disp, subtotal_disp in zip(
+            lines, units_base, subtotals_base, units_disp, subtotals_disp
+        ):
+            items.append(
                 {
-                    "item_id": item.id,
-                    "name": item.name,
-                    "quantity": ci.quantity,
+                    "item_id": line.item_id,
+                    "name": line.name,
+                    "quantity": line.quantity,
                     "unit_price_base": round(unit_base, 2),
                     "subtotal_base": round(subtotal_base, 2),
                     "unit_price": unit_disp,
@@ -128,7 +146,21 @@ class CartService:
                 }
             )
 
-        return result
+        return {
+            "items": items,
+            "total": {"total_base": total_base, "total": total, "currency": target},
+        }
+
+    def get_detailed_items(
+        self,
+        customer_user_id: int,
+        display_currency: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Returns list of dicts ready for UI (see get_cart_view()["items"]).
+        Prefer get_cart_view() when the total is needed too.
+        """
+        return self.get_cart_view(customer_user_id, display_currency=display_currency)["items"]
 
     def get_total(
         self,
@@ -143,17 +175,4 @@ class CartService:
           currency: <display currency>
         }
         """
-        target = (display_currency or self._get_customer_currency(customer_user_id)).upper()
-
-        detailed = self.get_detailed_items(customer_user_id, display_currency=target)
-        total_base = round(sum(row["subtotal_base"] for row in detailed), 2)
-
-        api_enabled = bool(getattr(currency_service, "access_key", None))
-
-        if (target == self.base_currency) or (not api_enabled):
-            total = total_base
-            target = self.base_currency
-        else:
-            total = currency_service.convert(total_base, to_currency=target, from_currency=self.base_currency)
-
-        return {"total_base": total_base, "total": total, "currency": target}
+        return self.get_cart_view(customer_user_id, display_currency=display_currency)["total"]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+
+from app.models.catalog import CatalogQuery, CatalogRow, SearchHit
+from app.repositories.item_repository import ItemRepository
+
+
+# CatalogQuery.sort -> CatalogRow attribute carried in the cursor
+_SORT_ATTRS = {"id": "item_id", "name": "name", "price": "price"}
+
+
+@dataclass
+class CatalogService:
+    item_repo: ItemRepository
+
+    # System base currency (prices in DB are in EUR)
+    base_currency: str = "EUR"
+
+    page_size_max: int = 500
+    search_limit_max: int = 100
+
+    def _row_dict(self, row: CatalogRow) -> Dict:
+        return {"item_id": row.item_id, "name": row.name, "price_base": row.price, "currency": self.base_currency}
+
+    def list_page(self, query: CatalogQuery) -> Dict:
+        """
+        Returns one catalog page:
+        {
+          "items": [ {item_id, name, price_base, currency}, ... ],
+          "next_cursor": {"sort_value", "item_id"} | None
+        }
+        """
+        limit = min(query.limit, self.page_size_max)
+
+        # One extra row tells us whether another page exists
+        rows = self.item_repo.query_catalog(replace(query, limit=limit + 1))
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor: Optional[Dict] = None
+        if has_more and rows:
+            last = rows[-1]
+            next_cursor = {"sort_value": getattr(last, _SORT_ATTRS[query.sort]), "item_id": last.item_id}
+
+        return {"items": [self._row_dict(r) for r in rows], "next_cursor": next_cursor}
+
+    def list_all(self) -> List[Dict]:
+        """
+        Whole catalog as light rows, read page by page (no Item models are built).
+        """
+        result: List[Dict] = []
+        query = CatalogQuery(limit=self.page_size_max)
+        while True:
+            page = self.list_page(query)
+            result.extend(page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                return result
+            query = replace(query, after=(cursor["sort_value"], cursor["item_id"]))
+
+    def search(self, text: str, limit: int = 20) -> Dict:
+        """
+        Ranked full-text search (best match first, last word matched as a prefix):
+        {
+          "query": str,
+          "items": [ {item_id, name, price_base, currency, snippet}, ... ]
+        }
+        """
+        text = (text or "").strip()
+        limit = max(1, min(int(limit), self.search_limit_max))
+        hits = self.item_repo.search(text, limit=limit) if text else []
+        return {"query": text, "items": [self._hit_dict(h) for h in hits]}
+
+    def _hit_dict(self, hit: SearchHit) -> Dict:
+        return {
+            "item_id": hit.item_id,
+            "name": hit.name,
+            "price_base": hit.price,
+            "currency": self.base_currency,
+            "snippet": hit.snippet,
+        }
+
+    @staticmethod
+    def build_query(
+        *,
+        limit: int = 50,
+        cursor: Optional[Dict] = None,
+        sort: str = "id",
+        descending: bool = False,
+        **filters,
+    ) -> CatalogQuery:
+        after = (cursor["sort_value"], int(cursor["item_id"])) if cursor else None
+        return CatalogQuery(sort=sort, descending=descending, limit=limit, after=after, **filters)
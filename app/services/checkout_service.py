@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
+from app.db.connection import unit_of_work
 from app.repositories.cart_repository import CartRepository
 from app.repositories.item_cart_repository import ItemCartRepository
 from app.repositories.item_repository import ItemRepository
@@ -33,53 +34,54 @@ class CheckoutService:
         """
         Creates an Order + OrderItems snapshot from the customer's cart, then clears the cart.
         Prices are snapshot-ed in EUR (base currency).
+
+        Everything runs in ONE unit of work (BEGIN IMMEDIATE ... COMMIT):
+        either the order, its lines and the emptied cart are all stored, or nothing is.
         """
-        cart = self.cart_repo.get_or_create_for_customer(customer_user_id)
-        cart_items = self.item_cart_repo.list_items(cart.id)
-
-        if not cart_items:
-            raise EmptyCartError("Cart is empty")
-
-        created_at = datetime.now(timezone.utc).isoformat()
-        order_id = self.order_repo.create(customer_user_id, created_at, status="CREATED", total_base=0.0)
-
-        total_base = 0.0
-        for ci in cart_items:
-            item = self.item_repo.get_by_id(ci.item_id)
-            if item is None:
-                # If item vanished, just skip it (or you can raise)
-                continue
-
-            unit_price = float(item.price)
-            total_base += unit_price * ci.quantity
-
-            self.order_item_repo.add(
-                OrderItem(
-                    order_id=order_id,
-                    item_id=item.id,
-                    item_name=item.name,          # snapshot
-                    unit_price_base=unit_price,   # snapshot in EUR
-                    quantity=ci.quantity,
-                )
+        with unit_of_work():
+            cart = self.cart_repo.get_or_create_for_customer(customer_user_id)
+            cart_items = self.item_cart_repo.list_items(cart.id)
+
+            if not cart_items:
+                raise EmptyCartError("Cart is empty")
+
+            items = self.item_repo.get_many(ci.item_id for ci in cart_items)
+
+            lines = []
+            total_base = 0.0
+            for ci in cart_items:
+                item = items.get(ci.item_id)
+                if item is None:
+                    # If item vanished, just skip it (or you can raise)
+                    continue
+
+                unit_price = float(item.price)
+                total_base += unit_price * ci.quantity
+                lines.append((item, unit_price, ci.quantity))
+
+            created_at = datetime.now(timezone.utc).isoformat()
+            order_id = self.order_repo.create(
+                customer_user_id,
+                created_at,
+                status="CREATED",
+                total_base=round(total_base, 2),
             )
 
-        self.order_repo.update_total_base(order_id, round(total_base, 2))
+            self.order_item_repo.add_many(
+                [
+                    OrderItem(
+                        order_id=order_id,
+                        item_id=item.id,
+                        item_name=item.name,          # snapshot
+                        unit_price_base=unit_price,   # snapshot in EUR
+                        quantity=quantity,
+                    )
+                    for item, unit_price, quantity in lines
+                ]
+            )
 
-        # Clear cart after successful order creation
-        # (no need to delete cart row; just items)
-        self._clear_cart(cart.id)
+            # Clear cart after successful order creation
+            # (no need to delete cart row; just items)
+            self.item_cart_repo.clear(cart.id)
 
         return order_id
-
-    def _clear_cart(self, cart_id: int) -> None:
-        # minimal, local cleanup without asking you to add new repo methods
-        # (keeps your "don't add extra stuff now" request)
-        import sqlite3
-        from app.db.connection import get_connection
-
-        conn = get_connection()
-        try:
-            conn.execute("DELETE FROM Item_Cart WHERE CartID = ?", (cart_id,))
-            conn.commit()
-        finally:
-            conn.close()
@@ -1,42 +1,90 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import Dict, Optional, Set
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 import os
+import socket
+import sqlite3
+import threading
 import time
-import requests
 
+from app.models.exchange_rate import RateSnapshot
+from app.repositories.exchange_rate_repository import ExchangeRateRepository
+from app.services.rate_providers import (  # errors re-exported: callers import them from here
+    DEFAULT_LIVE_URL,
+    CurrencyServiceError,
+    HttpRateProvider,
+    RateLimitedError,
+    RateProvider,
+    UnsupportedCurrencyError,
+    provider_from_env,
+)
+from app.utils.lru_cache import LruTtlCache
+from app.utils.rate_matrix import CrossRateMatrix
 
-class CurrencyServiceError(Exception):
-    pass
 
+# Lease name used so only one process on the host refreshes the shared snapshot
+REFRESH_LEASE = "exchange-rates-refresh"
 
-class UnsupportedCurrencyError(CurrencyServiceError):
-    pass
+# refresh() outcomes
+REFRESH_OK = "refreshed"
+REFRESH_FRESH = "fresh"
+REFRESH_ADOPTED = "adopted"
+REFRESH_BUSY = "busy"
+
+
+def _utc_iso(ts: str) -> str:
+    """
+    Normalizes an ISO timestamp to UTC (naive = UTC), the format snapshots are stored in.
+    """
+    dt = datetime.fromisoformat(ts)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat()
 
 
 @dataclass
 class CurrencyService:
     """
-    Currency conversion service using exchangerate.host /live (apilayer).
+    Currency conversion service; quotes come from a RateProvider
+    (default: exchangerate.host /live over HTTP, see app/services/rate_providers.py).
     Goals:
     - ONE request per TTL (fetch ALL quotes, no per-currency fetch) -> protects quota & avoids rate-limit bursts
-    - In-memory cache with TTL
+    - Quotes persisted as snapshots in SQLite (ExchangeRateSnapshot), shared by every process
+      using the DB (UI, main.py, seed runs) -> a restart does not cost a request
+    - Stale-while-revalidate: quotes older than the TTL are still served (up to max_stale_seconds)
+      while ONE process, holding the refresh lease, fetches new ones in the background
     - Cross-rate conversion supported (from -> to) via SOURCE currency (usually USD)
     - Graceful fallback if missing key or temporary rate-limit (use cached rates if available)
     """
 
-    live_url: str = "https://api.exchangerate.host/live"
+    live_url: str = os.getenv("OMNISTORE_RATE_URL") or DEFAULT_LIVE_URL
     cache_ttl_seconds: int = 6 * 3600  # 6 hours by default (better for 100 requests/month)
     access_key: Optional[str] = None  # or env EXCHANGERATE_HOST_KEY
 
+    # Persisted snapshots (defaults to the app DB; OMNISTORE_RATE_STORE=0 keeps quotes in memory only)
+    rate_repo: Optional[ExchangeRateRepository] = None
+    max_stale_seconds: int = 7 * 24 * 3600  # stale quotes older than this are not served
+    retry_after_seconds: int = 300          # after a failed fetch, wait before trying again
+    lease_seconds: float = 30.0             # max time one refresh may hold the lease
+    store_poll_seconds: float = 5.0         # how often a stale process re-reads the store
+
+    # Offline quote source (file / SQLite snapshot / fake); None = HTTP, only when access_key is set.
+    # Default comes from OMNISTORE_RATE_PROVIDER.
+    provider: Optional[RateProvider] = None
+
     _source_currency: str = "USD"
     _quotes_cache: Dict[str, float] = None  # e.g. {"USDEUR": 0.92, "USDGBP": 0.79, ...}
-    _cache_timestamp: float = 0.0
+    _cache_timestamp: float = 0.0  # when the quotes in memory were fetched (unix time)
+    _matrix: Optional[CrossRateMatrix] = None  # cross rates built from _quotes_cache
 
     def __post_init__(self):
         if self._quotes_cache is None:
             self._quotes_cache = {}
+        if self._quotes_cache and self._matrix is None:
+            self._matrix = CrossRateMatrix(self._source_currency, self._quotes_cache)
         # Hard switch: API disabled by default during development
         _enable = os.getenv("OMNISTORE_ENABLE_CURRENCY_API", "0") == "1"
 
@@ -47,88 +95,255 @@ class CurrencyService:
             if self.access_key is None:
                 self.access_key = os.getenv("EXCHANGERATE_HOST_KEY")
 
+        if self.provider is None:
+            self.provider = provider_from_env()
+        self._http_provider: Optional[HttpRateProvider] = None
+
+        if self.rate_repo is None and os.getenv("OMNISTORE_RATE_STORE", "1") == "1":
+            self.rate_repo = ExchangeRateRepository()
+
+        self._refresh_lock = threading.Lock()
+        self._refresher_attached = False
+        self._revalidate_lock = threading.Lock()
+        self._revalidating = False
+        self._store_checked_at = 0.0
+        self._next_fetch_at = 0.0
+        self._lease_owner = f"{socket.gethostname()}:{os.getpid()}:{id(self)}"
+
+        # Historical snapshots are immutable: their matrices are cached by snapshot id
+        self._history_matrices: LruTtlCache = LruTtlCache(max_size=64)
+
 
     # ---------- Internal ----------
 
-    def _api_get(self, url: str, params: dict) -> dict:
+    @property
+    def enabled(self) -> bool:
+        """
+        True when conversion is on: an offline provider is configured or the HTTP API has a key.
+        """
+        return self.provider is not None or bool(self.access_key)
+
+    def _active_provider(self) -> Optional[RateProvider]:
+        if self.provider is not None:
+            return self.provider
+        if not self.access_key:
+            return None
+        # Built lazily: live_url / access_key may be changed after construction
+        http = self._http_provider
+        if http is None or http.live_url != self.live_url or http.access_key != self.access_key:
+            if http is not None:
+                http.close()
+            http = self._http_provider = HttpRateProvider(self.live_url, self.access_key)
+        return http
+
+    def fetch_metrics(self) -> Dict:
+        """
+        Per-fetch stats of the active provider (HTTP: latency histogram, retries, 304s...).
+        """
+        provider = self._active_provider()
+        return provider.metrics() if provider is not None else {"provider": None}
+
+    def close(self) -> None:
+        """
+        Releases provider resources (the HTTP keep-alive session).
+        """
+        for provider in (self.provider, self._http_provider):
+            if provider is not None:
+                provider.close()
+
+    def _fetch_quotes(self) -> Tuple[RateProvider, str, Dict[str, float]]:
+        """
+        Fetches ALL quotes in one call. Returns (provider used, source, quotes).
+        """
+        provider = self._active_provider()
+        if provider is None:
+            raise CurrencyServiceError("No exchange-rate provider configured")
+        source, quotes = provider.fetch()
+        return provider, source, quotes
+
+    def _use_quotes(self, source: str, quotes: Dict[str, float], fetched_ts: float) -> None:
+        # Build the matrix first, so readers never see new quotes with an old matrix
+        matrix = CrossRateMatrix(source, quotes)
+        self._matrix = matrix
+        self._source_currency = source
+        self._quotes_cache = quotes
+        self._cache_timestamp = fetched_ts
+
+    def _is_fresh(self, now: float, max_age: Optional[float] = None) -> bool:
+        max_age = self.cache_ttl_seconds if max_age is None else max_age
+        return bool(self._quotes_cache) and (now - self._cache_timestamp) <= max_age
+
+    # ---------- Persisted snapshots ----------
+
+    def _load_stored(self, now: float, force: bool = False) -> None:
+        """
+        Adopts the newest stored snapshot if it is newer than the quotes in memory.
+        Without force, the store is read at most once per store_poll_seconds.
+        """
+        if self.rate_repo is None:
+            return
+        if not force and (now - self._store_checked_at) < self.store_poll_seconds:
+            return
+        self._store_checked_at = now
+
+        try:
+            snapshot: Optional[RateSnapshot] = self.rate_repo.latest()
+        except sqlite3.Error:
+            return  # store not available (e.g. schema not created yet): memory only
+
+        if snapshot is not None and snapshot.fetched_ts > self._cache_timestamp:
+            self._use_quotes(snapshot.source.upper(), snapshot.quotes, snapshot.fetched_ts)
+
+    def _save_snapshot(self, source: str, quotes: Dict[str, float], provider_name: str) -> float:
+        if self.rate_repo is not None:
+            try:
+                return self.rate_repo.save_snapshot(source, quotes, provider_name).fetched_ts
+            except sqlite3.Error:
+                pass
+        return time.time()
+
+    def _acquire_lease(self) -> bool:
+        if self.rate_repo is None:
+            return True
+        try:
+            return self.rate_repo.acquire_lease(REFRESH_LEASE, self._lease_owner, self.lease_seconds)
+        except sqlite3.Error:
+            return True  # no shared store -> nothing to coordinate with
+
+    def _release_lease(self) -> None:
+        if self.rate_repo is None:
+            return
         try:
-            resp = requests.get(url, params=params, timeout=8)
-            resp.raise_for_status()
-            return resp.json()
-        except requests.exceptions.HTTPError as e:
-            # Special-case 429: rate limit. We'll handle gracefully in _ensure_loaded().
-            raise CurrencyServiceError(f"HTTP error: {e}") from e
-        except Exception as e:
-            raise CurrencyServiceError("Failed to fetch exchange rates (network/HTTP error).") from e
+            self.rate_repo.release_lease(REFRESH_LEASE, self._lease_owner)
+        except sqlite3.Error:
+            pass
+
+    # ---------- Refresh ----------
+
+    def refresh(self, max_age: Optional[float] = None) -> str:
+        """
+        Fetches new quotes unless the current ones are younger than max_age
+        (default: the TTL; 0 = always fetch). Only the lease holder fetches.
 
-    def _fetch_all_quotes_live(self) -> None:
+        Returns the outcome: REFRESH_FRESH (nothing to do), REFRESH_OK, REFRESH_ADOPTED
+        (another process had just stored a new enough snapshot) or REFRESH_BUSY (lease held elsewhere).
+        Raises CurrencyServiceError / RateLimitedError if the fetch fails.
+        """
+        with self._refresh_lock:
+            now = time.time()
+            if self._is_fresh(now, max_age):
+                return REFRESH_FRESH
+
+            if not self._acquire_lease():
+                return REFRESH_BUSY
+
+            try:
+                # Another process may have refreshed between our check and the lease
+                self._load_stored(now, force=True)
+                if self._is_fresh(now, max_age):
+                    return REFRESH_ADOPTED
+
+                provider, source, quotes = self._fetch_quotes()
+                fetched_ts = self._save_snapshot(source, quotes, provider.name)
+                self._use_quotes(source, quotes, fetched_ts)
+                return REFRESH_OK
+            finally:
+                self._release_lease()
+
+    def _refresh(self, wait_for_other: bool) -> None:
         """
-        Fetches ALL quotes in one call (no 'currencies' param) to avoid extra calls.
+        On-demand refresh from _ensure_loaded (no background refresher running).
+        If another process holds the lease, optionally waits (up to lease_seconds) for its snapshot.
         """
-        params = {}
-        if self.access_key:
-            params["access_key"] = self.access_key
+        if time.time() < self._next_fetch_at:
+            return  # backing off after a failure
 
-        data = self._api_get(self.live_url, params)
+        try:
+            outcome = self.refresh()
+        except CurrencyServiceError:
+            # Keep whatever we have; do not hammer the API (429 / network errors)
+            self._next_fetch_at = time.time() + self.retry_after_seconds
+            return
 
-        if isinstance(data, dict) and data.get("success") is False:
-            err = data.get("error") or {}
-            msg = err.get("info") or err.get("type") or str(data)
-            raise CurrencyServiceError(f"ExchangeRate.host error: {msg}")
+        if outcome == REFRESH_BUSY and wait_for_other:
+            self._wait_for_other_process()
 
-        quotes = data.get("quotes")
-        source = data.get("source") or self._source_currency
+    @property
+    def staleness_seconds(self) -> Optional[float]:
+        """
+        Age of the quotes in memory (None = no quotes yet).
+        """
+        if not self._quotes_cache:
+            return None
+        return max(0.0, time.time() - self._cache_timestamp)
 
-        if not isinstance(quotes, dict) or not quotes:
-            raise CurrencyServiceError("Invalid response from /live: missing 'quotes'")
+    @property
+    def quotes_fetched_at(self) -> float:
+        return self._cache_timestamp
 
-        self._source_currency = str(source).upper()
-        self._quotes_cache = {str(k).upper(): float(v) for k, v in quotes.items()}
-        self._cache_timestamp = time.time()
+    def reload_from_store(self) -> None:
+        """
+        Picks up a snapshot stored by another process (no network).
+        """
+        self._load_stored(time.time(), force=True)
 
-    def _ensure_loaded(self) -> None:
+    def attach_refresher(self, active: bool = True) -> None:
         """
-        Loads cache if empty/expired.
-        If rate-limited (429), keeps existing cache (if any) and continues.
-        If no cache at all, does graceful fallback (no conversion).
+        While a background refresher owns refreshing, reads never fetch inline:
+        they serve the last good snapshot (memory or store) straight away.
         """
-        now = time.time()
-        expired = (now - self._cache_timestamp) > self.cache_ttl_seconds
+        self._refresher_attached = active
+
+    def _wait_for_other_process(self) -> None:
+        deadline = time.time() + self.lease_seconds
+        while time.time() < deadline:
+            time.sleep(0.25)
+            self._load_stored(time.time(), force=True)
+            if self._is_fresh(time.time()):
+                return
 
-        # No key -> never call external API
-        if not self.access_key:
+    def _revalidate_in_background(self) -> None:
+        # Own lock: _refresh_lock is held during a fetch and reads must not wait for it
+        with self._revalidate_lock:
+            if self._revalidating:
+                return
+            self._revalidating = True
+
+        def run():
+            try:
+                self._refresh(wait_for_other=False)
+            finally:
+                self._revalidating = False
+
+        threading.Thread(target=run, name="omnistore-rates-revalidate", daemon=True).start()
+
+    def _ensure_loaded(self) -> None:
+        """
+        Makes quotes available, cheapest source first:
+        memory (fresh) -> stored snapshot (fresh) -> stale quotes + background refresh
+        -> synchronous refresh (only when there is nothing usable at all).
+        If rate-limited (429), keeps existing quotes (if any) and continues.
+        If no quotes at all, does graceful fallback (no conversion).
+        """
+        # No provider (API off, no offline source) -> never fetch
+        if not self.enabled:
             if self._quotes_cache is None:
                 self._quotes_cache = {}
-            self._cache_timestamp = now
             return
 
-        if self._quotes_cache and not expired:
+        now = time.time()
+        if self._is_fresh(now):
             return
 
-        try:
-            self._fetch_all_quotes_live()
-        except CurrencyServiceError:
-            # If we already have some cache, keep it (best-effort)
-            if self._quotes_cache:
-                self._cache_timestamp = now  # prevent tight re-fetch loops
-                return
-            # No cache -> cannot convert; leave empty and let public methods fallback
-            self._quotes_cache = {}
-            self._cache_timestamp = now
+        self._load_stored(now)
+        if self._is_fresh(now) or self._refresher_attached:
+            return
 
-    def _rate_source_to(self, currency: str) -> float:
-        """
-        Returns rate: 1 SOURCE = X CURRENCY
-        """
-        currency = currency.upper()
-        if currency == self._source_currency:
-            return 1.0
+        if self._quotes_cache and (now - self._cache_timestamp) <= self.max_stale_seconds:
+            self._revalidate_in_background()
+            return
 
-        key = f"{self._source_currency}{currency}"
-        rate = self._quotes_cache.get(key)
-        if rate is None:
-            raise UnsupportedCurrencyError(f"Unsupported currency: {currency}")
-        return float(rate)
+        self._refresh(wait_for_other=True)
 
     # ---------- Public API ----------
 
@@ -137,6 +352,7 @@ class CurrencyService:
         Returns: 1 unit of from_currency expressed in to_currency.
         Cross-rate via SOURCE currency:
           rate(from->to) = (SOURCE->to) / (SOURCE->from)
+        (precomputed in the cross-rate matrix when quotes load)
         """
         from_currency = from_currency.upper()
         to_currency = to_currency.upper()
@@ -147,12 +363,15 @@ class CurrencyService:
         self._ensure_loaded()
 
         # If cache is empty (no key / rate-limited with no cache), fallback 1:1
-        if not self._quotes_cache:
+        matrix = self._matrix
+        if matrix is None or not self._quotes_cache:
             return 1.0
 
-        s_to_from = self._rate_source_to(from_currency)
-        s_to_to = self._rate_source_to(to_currency)
-        return float(s_to_to / s_to_from)
+        rate = matrix.rate(from_currency, to_currency)
+        if rate is None:
+            missing = from_currency if from_currency not in matrix else to_currency
+            raise UnsupportedCurrencyError(f"Unsupported currency: {missing}")
+        return rate
 
     def convert(self, amount: float, to_currency: str, from_currency: str = "EUR") -> float:
         if amount < 0:
@@ -164,13 +383,111 @@ class CurrencyService:
         if from_currency == to_currency:
             return round(amount, 2)
 
-        # No key -> no external calls -> graceful fallback
-        if not self.access_key:
+        # No provider -> no external calls -> graceful fallback
+        if not self.enabled:
             return round(amount, 2)
 
         rate = self.get_rate(to_currency=to_currency, from_currency=from_currency)
         return round(amount * rate, 2)
 
+    def convert_many(self, amounts: Iterable[float], to_currency: str, from_currency: str = "EUR") -> List[float]:
+        """
+        Bulk convert(): one rate lookup for the whole batch (cart lines, a catalog page, ...).
+        Results are identical to calling convert() per amount.
+        """
+        amounts = list(amounts)
+        if amounts and min(amounts) < 0:
+            raise ValueError("Amount cannot be negative")
+
+        from_currency = from_currency.upper()
+        to_currency = to_currency.upper()
+
+        if from_currency == to_currency or not self.enabled:
+            return [round(a, 2) for a in amounts]
+
+        rate = self.get_rate(to_currency=to_currency, from_currency=from_currency)
+        return [round(a * rate, 2) for a in amounts]
+
+    # ---------- Historical (as-of) conversion: store only, never the network ----------
+
+    def rates_as_of(
+        self,
+        timestamps: Sequence[str],
+        to_currency: str,
+        from_currency: str = "EUR",
+    ) -> List[Optional[Tuple[float, str]]]:
+        """
+        For each ISO timestamp: (rate from->to, FetchedAt of the snapshot used), using the
+        snapshot in effect at that moment (latest fetched at or before it).
+        None where no snapshot was fetched by then or the currency is not in it.
+
+        One index query + one query for the snapshots actually needed; no network calls.
+        """
+        from_currency = from_currency.upper()
+        to_currency = to_currency.upper()
+        stamps = [_utc_iso(ts) for ts in timestamps]
+        if not stamps:
+            return []
+        if self.rate_repo is None:
+            return [None] * len(stamps)
+
+        try:
+            index = self.rate_repo.index_between(min(stamps), max(stamps))
+            if not index:
+                return [None] * len(stamps)
+
+            fetched = [fetched_at for _id, fetched_at in index]
+            # Timestamps before the first snapshot have no rate in effect
+            positions = [bisect_right(fetched, ts) - 1 for ts in stamps]
+            chosen = [index[pos] if pos >= 0 else None for pos in positions]
+
+            matrices: Dict[int, CrossRateMatrix] = {}
+            missing = set()
+            for snapshot_id, _fetched_at in filter(None, chosen):
+                matrix = self._history_matrices.get(snapshot_id)
+                if matrix is None:
+                    missing.add(snapshot_id)
+                else:
+                    matrices[snapshot_id] = matrix
+
+            for snapshot_id, snapshot in self.rate_repo.get_many(missing).items():
+                matrix = CrossRateMatrix(snapshot.source, snapshot.quotes)
+                self._history_matrices.put(snapshot_id, matrix)
+                matrices[snapshot_id] = matrix
+        except sqlite3.Error:
+            return [None] * len(stamps)
+
+        out: List[Optional[Tuple[float, str]]] = []
+        for entry in chosen:
+            if entry is None:
+                out.append(None)
+                continue
+            snapshot_id, fetched_at = entry
+            matrix = matrices.get(snapshot_id)
+            rate = matrix.rate(from_currency, to_currency) if matrix is not None else None
+            out.append((rate, fetched_at) if rate is not None else None)
+        return out
+
+    def convert_as_of(
+        self,
+        amount: float,
+        at: str,
+        to_currency: str,
+        from_currency: str = "EUR",
+    ) -> Optional[float]:
+        """
+        convert() with the rate in effect at `at` (ISO timestamp). None if no snapshot applies.
+        """
+        if amount < 0:
+            raise ValueError("Amount cannot be negative")
+        if from_currency.upper() == to_currency.upper():
+            return round(amount, 2)
+
+        found = self.rates_as_of([at], to_currency, from_currency)[0]
+        if found is None:
+            return None
+        return round(amount * found[0], 2)
+
     def list_supported_currencies(self):
         """
         Returns currencies from the current cache.
@@ -178,12 +495,6 @@ class CurrencyService:
         """
         self._ensure_loaded()
 
-        src = self._source_currency
-        out: Set[str] = {src}
-
-        for k in self._quotes_cache.keys():
-            k = str(k).upper()
-            if k.startswith(src) and len(k) == 6:
-                out.add(k[3:])
-
-        return sorted(out)
+        if self._matrix is not None:
+            return list(self._matrix.currencies)
+        return [self._source_currency]
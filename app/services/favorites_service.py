@@ -36,10 +36,11 @@ class FavoritesService:
         Returns list of dicts with basic item info for UI.
         """
         ids = self.favorites_repo.list_item_ids(customer_user_id)
+        items = self.item_repo.get_many(ids)
         result: List[Dict] = []
 
         for item_id in ids:
-            item = self.item_repo.get_by_id(item_id)
+            item = items.get(item_id)
             if item is None:
                 continue  # safety if item deleted
             result.append(
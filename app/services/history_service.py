@@ -30,10 +30,11 @@ class HistoryService:
 
     def list_history(self, customer_user_id: int, limit: int = 50) -> List[Dict]:
         views = self.history_repo.list_views(customer_user_id, limit=limit, newest_first=True)
+        items = self.item_repo.get_many(item_id for item_id, _ in views)
 
         result: List[Dict] = []
         for item_id, viewed_at in views:
-            item = self.item_repo.get_by_id(item_id)
+            item = items.get(item_id)
             if item is None:
                 continue  # safety if item deleted
             result.append(
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+from app.models.order import Order
+from app.models.order_item import OrderItem
 from app.repositories.order_repository import OrderRepository
 from app.repositories.order_item_repository import OrderItemRepository
+from app.services.currency_service import CurrencyService
 
 
 class OrderHistoryError(Exception):
@@ -20,23 +23,131 @@ class OrderHistoryService:
     order_repo: OrderRepository
     order_item_repo: OrderItemRepository
 
-    def list_orders(self, customer_user_id: int, limit: int = 50) -> List[Dict]:
+    # Historical FX snapshots for display_currency (None = always EUR)
+    currency_service: Optional[CurrencyService] = None
+
+    # System base currency (prices in DB are in EUR)
+    base_currency: str = "EUR"
+
+    # ---------- Dict builders ----------
+
+    def _order_dict(self, o: Order) -> Dict:
+        return {
+            "order_id": o.id,
+            "created_at": o.created_at,
+            "status": o.status,
+            "total_base": o.total_base,  # EUR snapshot
+            "total": o.total_base,
+            "currency": self.base_currency,
+        }
+
+    def _item_dict(self, oi: OrderItem) -> Dict:
+        subtotal_base = round(oi.unit_price_base * oi.quantity, 2)
+        return {
+            "item_id": oi.item_id,
+            "item_name": oi.item_name,
+            "unit_price_base": oi.unit_price_base,
+            "quantity": oi.quantity,
+            "subtotal_base": subtotal_base,
+            "unit_price": oi.unit_price_base,
+            "subtotal": subtotal_base,
+            "currency": self.base_currency,
+        }
+
+    def _apply_display_currency(self, orders: List[Dict], display_currency: Optional[str]) -> None:
         """
-        Returns list of orders for customer, UI-friendly dicts.
+        Converts order (and item) amounts in place, each order with the rate in effect
+        at its CreatedAt: one bulk as-of lookup for the whole list, no network calls.
+        Orders without an applicable snapshot stay in EUR.
+        """
+        target = (display_currency or self.base_currency).upper()
+        if target == self.base_currency or self.currency_service is None or not orders:
+            return
+
+        rates = self.currency_service.rates_as_of(
+            [o["created_at"] for o in orders],
+            to_currency=target,
+            from_currency=self.base_currency,
+        )
+        for order, found in zip(orders, rates):
+            if found is None:
+                continue
+            rate, as_of = found
+            order["total"] = round(order["total_base"] * rate, 2)
+            order["currency"] = target
+            order["fx_as_of"] = as_of
+            for it in order.get("items", ()):
+                it["unit_price"] = round(it["unit_price_base"] * rate, 2)
+                it["subtotal"] = round(it["subtotal_base"] * rate, 2)
+                it["currency"] = target
+
+    @staticmethod
+    def _cursor_tuple(cursor: Optional[Dict]) -> Optional[Tuple[str, int]]:
+        if not cursor:
+            return None
+        return str(cursor["created_at"]), int(cursor["order_id"])
+
+    # ---------- Queries ----------
+
+    def list_orders(
+        self,
+        customer_user_id: int,
+        limit: int = 50,
+        cursor: Optional[Dict] = None,
+        display_currency: Optional[str] = None,
+    ) -> List[Dict]:
         """
-        orders = self.order_repo.list_for_customer(customer_user_id, limit=limit)
-        return [
-            {
-                "order_id": o.id,
-                "created_at": o.created_at,
-                "status": o.status,
-                "total_base": o.total_base,  # EUR snapshot
-                "currency": "EUR",
-            }
-            for o in orders
-        ]
-
-    def get_order_details(self, customer_user_id: int, order_id: int) -> Dict:
+        Returns list of orders for customer, UI-friendly dicts (newest first).
+        cursor = {"created_at", "order_id"} of the last order already shown.
+        display_currency: totals converted with the rate at each order's CreatedAt.
+        """
+        orders = self.order_repo.list_for_customer(customer_user_id, limit=limit, before=self._cursor_tuple(cursor))
+        result = [self._order_dict(o) for o in orders]
+        self._apply_display_currency(result, display_currency)
+        return result
+
+    def list_orders_with_items(
+        self,
+        customer_user_id: int,
+        limit: int = 20,
+        cursor: Optional[Dict] = None,
+        display_currency: Optional[str] = None,
+    ) -> Dict:
+        """
+        Returns one page of orders WITH their items (single grouped query):
+        {
+          "orders": [ {order_id, created_at, status, total_base, total, currency, items: [...]}, ... ],
+          "next_cursor": {"created_at", "order_id"} | None
+        }
+        Pass next_cursor back to get the following page.
+        """
+        if limit <= 0:
+            raise ValueError("Limit must be positive")
+
+        # Ask for one extra order to know whether another page exists
+        page = self.order_repo.list_with_items_for_customer(
+            customer_user_id,
+            limit=limit + 1,
+            before=self._cursor_tuple(cursor),
+        )
+        has_more = len(page) > limit
+        page = page[:limit]
+
+        orders = []
+        for order, items in page:
+            d = self._order_dict(order)
+            d["items"] = [self._item_dict(oi) for oi in items]
+            orders.append(d)
+        self._apply_display_currency(orders, display_currency)
+
+        next_cursor = None
+        if has_more and page:
+            last = page[-1][0]
+            next_cursor = {"created_at": last.created_at, "order_id": last.id}
+
+        return {"orders": orders, "next_cursor": next_cursor}
+
+    def get_order_details(self, customer_user_id: int, order_id: int, display_currency: Optional[str] = None) -> Dict:
         """
         Returns order + items for a specific order_id.
         Ensures the order belongs to the customer.
@@ -47,23 +158,8 @@ class OrderHistoryService:
 
         items = self.order_item_repo.list_for_order(order_id)
 
-        return {
-            "order": {
-                "order_id": order.id,
-                "created_at": order.created_at,
-                "status": order.status,
-                "total_base": order.total_base,
-                "currency": "EUR",
-            },
-            "items": [
-                {
-                    "item_id": oi.item_id,
-                    "item_name": oi.item_name,
-                    "unit_price_base": oi.unit_price_base,
-                    "quantity": oi.quantity,
-                    "subtotal_base": round(oi.unit_price_base * oi.quantity, 2),
-                    "currency": "EUR",
-                }
-                for oi in items
-            ],
-        }
+        d = self._order_dict(order)
+        d["items"] = [self._item_dict(oi) for oi in items]
+        self._apply_display_currency([d], display_currency)
+
+        return {"order": d, "items": d.pop("items")}
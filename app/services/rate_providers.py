@@ -0,0 +1,414 @@
+from __future__ import annotations
+
+import abc
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.repositories.exchange_rate_repository import ExchangeRateRepository
+from app.utils.metrics import LatencyHistogram
+
+
+# (source currency, {"USDEUR": 0.92, ...}) - the shape of one /live response
+Quotes = Tuple[str, Dict[str, float]]
+
+DEFAULT_LIVE_URL = "https://api.exchangerate.host/live"
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("OMNISTORE_RATE_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("OMNISTORE_RATE_READ_TIMEOUT", "8"))
+HTTP_RETRIES = int(os.getenv("OMNISTORE_RATE_RETRIES", "2"))
+
+# Modes understood by FakeRateProvider (and the local stub server in benchmarks/)
+FAKE_MODES = ("ok", "429", "quota", "error", "timeout")
+
+DEFAULT_FAKE_QUOTES = {"USDEUR": 0.92, "USDGBP": 0.79, "USDBGN": 1.80, "USDJPY": 149.5, "USDCHF": 0.88}
+
+
+class CurrencyServiceError(Exception):
+    pass
+
+
+class UnsupportedCurrencyError(CurrencyServiceError):
+    pass
+
+
+class RateLimitedError(CurrencyServiceError):
+    """
+    HTTP 429 / provider quota error. retry_after = seconds suggested by the server (if any).
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_live_payload(data, default_source: str = "USD") -> Quotes:
+    """
+    Validates a /live style payload ({"source": "USD", "quotes": {...}}) -> (source, quotes).
+    """
+    if not isinstance(data, dict):
+        raise CurrencyServiceError("Invalid rate payload: expected a JSON object")
+
+    if data.get("success") is False:
+        err = data.get("error") or {}
+        msg = err.get("info") or err.get("type") or str(data)
+        if "limit" in str(err.get("type") or "").lower():
+            raise RateLimitedError(f"ExchangeRate.host error: {msg}")
+        raise CurrencyServiceError(f"ExchangeRate.host error: {msg}")
+
+    quotes = data.get("quotes")
+    source = data.get("source") or default_source
+
+    if not isinstance(quotes, dict) or not quotes:
+        raise CurrencyServiceError("Invalid response from /live: missing 'quotes'")
+
+    try:
+        return str(source).upper(), {str(k).upper(): float(v) for k, v in quotes.items()}
+    except (TypeError, ValueError) as e:
+        raise CurrencyServiceError("Invalid response from /live: non-numeric quote") from e
+
+
+class RateProvider(abc.ABC):
+    """
+    Source of exchange-rate quotes for CurrencyService.
+    fetch() returns ALL quotes at once and raises CurrencyServiceError / RateLimitedError.
+    `name` is stored with every snapshot (ExchangeRateSnapshot.Provider).
+    """
+
+    name: str = "provider"
+
+    @abc.abstractmethod
+    def fetch(self) -> Quotes:
+        ...
+
+    def metrics(self) -> Dict:
+        return {"provider": self.name}
+
+    def close(self) -> None:
+        pass
+
+
+class HttpRateProvider(RateProvider):
+    """
+    exchangerate.host /live (apilayer): one request returns every quote.
+
+    - One managed requests.Session: the TCP/TLS connection is kept alive between fetches.
+    - Transient failures (connect errors, 500/502/503/504) are retried by the transport
+      adapter with backoff; 429 is NOT retried (CurrencyService/RateRefresher back off).
+      Read timeouts are not retried either, so a hung server costs one read_timeout.
+    - Conditional requests: If-None-Match / If-Modified-Since are sent when the previous
+      answer had an ETag / Last-Modified; a 304 reuses the quotes parsed last time.
+    - Every fetch is timed (latency histogram + outcome counters, see metrics()).
+    """
+
+    name = "exchangerate.host"
+
+    def __init__(
+        self,
+        live_url: str = DEFAULT_LIVE_URL,
+        access_key: Optional[str] = None,
+        timeout: Optional[float] = None,
+        connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = HTTP_READ_TIMEOUT,
+        retries: int = HTTP_RETRIES,
+        backoff_factor: float = 0.3,
+        session: Optional[requests.Session] = None,
+    ):
+        self.live_url = live_url
+        self.access_key = access_key
+        # timeout= sets both phases at once (requests style)
+        self.connect_timeout = timeout if timeout is not None else connect_timeout
+        self.read_timeout = timeout if timeout is not None else read_timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+
+        self._session = session
+        self._lock = threading.Lock()
+
+        # Conditional-request validators of the last 200 answer
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._last_quotes: Optional[Quotes] = None
+
+        self.latency = LatencyHistogram()
+        self.counters: Dict[str, int] = {
+            "fetches": 0,
+            "ok": 0,
+            "not_modified": 0,
+            "failures": 0,
+            "rate_limited": 0,
+            "retries": 0,
+        }
+
+    @property
+    def max_fetch_seconds(self) -> float:
+        """
+        Rough upper bound of one fetch: every retry can cost a connect timeout plus backoff,
+        the final attempt a full connect + read.
+        """
+        backoff = sum(self.backoff_factor * (2 ** i) for i in range(max(0, self.retries - 1)))
+        return self.connect_timeout * (self.retries + 1) + self.read_timeout + backoff
+
+    def _new_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=0,
+            status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Accept"] = "application/json"
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                self._session = self._new_session()
+            return self._session
+
+    def close(self) -> None:
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    @staticmethod
+    def _retry_after(resp) -> Optional[float]:
+        value = resp.headers.get("Retry-After")
+        try:
+            return max(0.0, float(value)) if value is not None else None
+        except ValueError:
+            return None
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[key] += n
+
+    def _conditional_headers(self) -> Dict[str, str]:
+        with self._lock:
+            if self._last_quotes is None:
+                return {}
+            headers = {}
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+            return headers
+
+    def _get(self, params: dict):
+        try:
+            resp = self.session.get(
+                self.live_url,
+                params=params,
+                headers=self._conditional_headers(),
+                timeout=(self.connect_timeout, self.read_timeout),
+            )
+            history = getattr(getattr(resp.raw, "retries", None), "history", None)
+            if history:
+                self._count("retries", len(history))
+
+            if resp.status_code == 304:
+                return None
+            if resp.status_code == 429:
+                raise RateLimitedError("HTTP 429: rate limited", retry_after=self._retry_after(resp))
+            resp.raise_for_status()
+            return resp
+        except CurrencyServiceError:
+            raise
+        except requests.exceptions.HTTPError as e:
+            raise CurrencyServiceError(f"HTTP error: {e}") from e
+        except Exception as e:
+            raise CurrencyServiceError("Failed to fetch exchange rates (network/HTTP error).") from e
+
+    def fetch(self) -> Quotes:
+        # No 'currencies' param: ALL quotes in one call
+        params = {}
+        if self.access_key:
+            params["access_key"] = self.access_key
+
+        self._count("fetches")
+        started = time.perf_counter()
+        try:
+            resp = self._get(params)
+            if resp is None:
+                with self._lock:
+                    cached = self._last_quotes
+                if cached is not None:
+                    self._count("not_modified")
+                    return cached[0], dict(cached[1])
+                raise CurrencyServiceError("HTTP 304 without cached quotes")
+
+            try:
+                data = resp.json()
+            except ValueError as e:
+                raise CurrencyServiceError("Invalid response from /live: not JSON") from e
+            quotes = parse_live_payload(data)
+
+            with self._lock:
+                self._etag = resp.headers.get("ETag")
+                self._last_modified = resp.headers.get("Last-Modified")
+                self._last_quotes = quotes
+            self._count("ok")
+            return quotes[0], dict(quotes[1])
+        except CurrencyServiceError as e:
+            self._count("failures")
+            if isinstance(e, RateLimitedError):
+                self._count("rate_limited")
+            raise
+        finally:
+            self.latency.observe((time.perf_counter() - started) * 1000.0)
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            counters = dict(self.counters)
+            conditional = bool(self._etag or self._last_modified)
+        return {
+            "provider": self.name,
+            **counters,
+            "conditional_requests": conditional,
+            "connect_timeout_s": self.connect_timeout,
+            "read_timeout_s": self.read_timeout,
+            "max_fetch_seconds": round(self.max_fetch_seconds, 2),
+            "latency": self.latency.as_dict(),
+        }
+
+
+class FileRateProvider(RateProvider):
+    """
+    Quotes from a JSON file in the /live format (e.g. a saved API response).
+    The file is re-read on every fetch, so it can be edited while the app runs.
+    """
+
+    name = "file"
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def fetch(self) -> Quotes:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CurrencyServiceError(f"Cannot read rate file {self.path}: {e}") from e
+        return parse_live_payload(data)
+
+
+class SnapshotRateProvider(RateProvider):
+    """
+    Newest ExchangeRateSnapshot of ANOTHER OmniStore database (e.g. a copy of production),
+    so a machine without API access can run on real rates.
+
+    The file is opened read-only (mode=ro) with a plain connection per fetch: not through
+    the pool, so no storage profile (journal_mode=WAL, ...) is applied to it and a
+    thread's unit of work can't redirect the read to the app's own database.
+    """
+
+    name = "sqlite-snapshot"
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+
+    def fetch(self) -> Quotes:
+        if not self.db_path.exists():
+            raise CurrencyServiceError(f"Rate snapshot DB not found: {self.db_path}")
+        try:
+            conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+            try:
+                conn.row_factory = sqlite3.Row
+                row = conn.execute(
+                    """
+                    SELECT ID, Source, FetchedAt, Quotes, Provider
+                    FROM ExchangeRateSnapshot
+                    ORDER BY FetchedAt DESC, ID DESC
+                    LIMIT 1
+                    """
+                ).fetchone()
+            finally:
+                conn.close()
+            snapshot = ExchangeRateRepository._row_to_snapshot(row) if row else None
+        except (sqlite3.Error, ValueError) as e:
+            raise CurrencyServiceError(f"Cannot read rate snapshots from {self.db_path}: {e}") from e
+        if snapshot is None:
+            raise CurrencyServiceError(f"No rate snapshots in {self.db_path}")
+        return snapshot.source.upper(), dict(snapshot.quotes)
+
+
+class FakeRateProvider(RateProvider):
+    """
+    In-process provider for tests and benchmarks: fixed quotes, optional latency,
+    and a switchable failure mode (ok | 429 | quota | error | timeout).
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        quotes: Optional[Dict[str, float]] = None,
+        source: str = "USD",
+        latency_s: float = 0.0,
+        mode: str = "ok",
+        retry_after: Optional[float] = None,
+    ):
+        self.quotes = dict(quotes or DEFAULT_FAKE_QUOTES)
+        self.source = source.upper()
+        self.latency_s = latency_s
+        self.mode = mode
+        self.retry_after = retry_after
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def fetch(self) -> Quotes:
+        with self._lock:
+            self.calls += 1
+        if self.mode not in FAKE_MODES:
+            raise ValueError(f"Unknown fake provider mode: {self.mode}")
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+        if self.mode == "429":
+            raise RateLimitedError("HTTP 429: rate limited", retry_after=self.retry_after)
+        if self.mode == "quota":
+            raise RateLimitedError("ExchangeRate.host error: usage_limit_reached")
+        if self.mode == "error":
+            raise CurrencyServiceError("HTTP error: 500 Server Error")
+        if self.mode == "timeout":
+            raise CurrencyServiceError("Failed to fetch exchange rates (network/HTTP error).")
+        return self.source, dict(self.quotes)
+
+
+def provider_from_env() -> Optional[RateProvider]:
+    """
+    OMNISTORE_RATE_PROVIDER selects an offline quote source:
+      file:<path>    JSON file in the /live format
+      sqlite:<path>  newest snapshot of another OmniStore database
+      fake           built-in fixed quotes
+    Unset / "http" -> None (CurrencyService uses exchangerate.host when it has a key).
+    """
+    spec = (os.getenv("OMNISTORE_RATE_PROVIDER") or "http").strip()
+    kind, _, arg = spec.partition(":")
+    kind = kind.lower()
+
+    if kind == "http":
+        return None
+    if kind == "fake":
+        return FakeRateProvider()
+    if kind in ("file", "sqlite") and arg:
+        return FileRateProvider(arg) if kind == "file" else SnapshotRateProvider(arg)
+    raise ValueError(f"Invalid OMNISTORE_RATE_PROVIDER: {spec!r} (expected http, fake, file:<path> or sqlite:<path>)")
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from app.services.currency_service import (
+    REFRESH_ADOPTED,
+    REFRESH_BUSY,
+    REFRESH_OK,
+    CurrencyService,
+    CurrencyServiceError,
+    RateLimitedError,
+)
+from app.utils.metrics import LatencyHistogram
+
+
+logger = logging.getLogger("omnistore.rates")
+
+
+@dataclass
+class RefresherStats:
+    refreshes: int = 0            # successful fetches by this process
+    adopted: int = 0              # refresh skipped: another process had stored new quotes
+    busy: int = 0                 # refresh skipped: another process held the lease
+    failures: int = 0
+    rate_limited: int = 0         # failures that were 429 / quota errors
+    consecutive_failures: int = 0
+    last_latency_ms: Optional[float] = None
+    last_success_at: Optional[float] = None  # unix time
+    last_error: Optional[str] = None
+    backoff_seconds: float = 0.0
+    next_run_at: Optional[float] = None      # unix time
+
+    # Duration of successful refresh cycles (fetch + snapshot write)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def latency_percentile(self, pct: float) -> Optional[float]:
+        value = self.latency.percentile(pct)
+        return round(value, 3) if value is not None else None
+
+    def as_dict(self) -> Dict:
+        return {
+            "refreshes": self.refreshes,
+            "adopted": self.adopted,
+            "busy": self.busy,
+            "failures": self.failures,
+            "rate_limited": self.rate_limited,
+            "consecutive_failures": self.consecutive_failures,
+            "last_latency_ms": self.last_latency_ms,
+            "latency_p50_ms": self.latency_percentile(50),
+            "latency_p95_ms": self.latency_percentile(95),
+            "last_success_at": self.last_success_at,
+            "last_error": self.last_error,
+            "backoff_seconds": self.backoff_seconds,
+            "next_run_at": self.next_run_at,
+        }
+
+
+@dataclass
+class RateRefresher:
+    """
+    Keeps CurrencyService quotes fresh from a daemon thread, so reads never wait for HTTP.
+
+    - Renews when the quotes reach refresh_ahead x TTL (before they expire).
+    - Failures back off exponentially (min_backoff .. max_backoff, +-jitter);
+      a 429 with Retry-After waits at least that long.
+    - Any other exception (network, SQLite, a bad payload) is logged and backs off the
+      same way, so the thread never dies and leaves the rates silently stale.
+    - If another process holds the refresh lease, its snapshot is picked up from the store.
+    - While running, the service serves the last good snapshot and never fetches inline.
+    """
+
+    service: CurrencyService
+    refresh_ahead: float = 0.8
+    min_backoff_seconds: float = 30.0
+    max_backoff_seconds: float = 3600.0
+    busy_retry_seconds: float = 15.0
+    jitter: float = 0.1
+
+    stats: RefresherStats = field(default_factory=RefresherStats)
+
+    def __post_init__(self):
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._rnd = random.Random()
+
+    # ---------- Lifecycle ----------
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._stop.clear()
+        self.service.attach_refresher(True)
+        self._thread = threading.Thread(target=self._run, name="omnistore-rate-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        self.service.attach_refresher(False)
+
+    def _run(self) -> None:
+        delay = 0.0  # first refresh straight away
+        while not self._stop.wait(delay):
+            delay = self.run_once()
+
+    # ---------- One cycle ----------
+
+    def _refresh_age(self) -> float:
+        return self.service.cache_ttl_seconds * self.refresh_ahead
+
+    def _until_due(self) -> float:
+        staleness = self.service.staleness_seconds
+        if staleness is None:
+            return 0.0
+        return max(1.0, self._refresh_age() - staleness)
+
+    def _backoff(self, retry_after: Optional[float]) -> float:
+        base = self.min_backoff_seconds * (2 ** max(0, self.stats.consecutive_failures - 1))
+        delay = min(self.max_backoff_seconds, base)
+        delay *= 1.0 + self._rnd.uniform(-self.jitter, self.jitter)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def run_once(self) -> float:
+        """
+        Refreshes if due; returns the number of seconds until the next cycle.
+        Never raises: a failed cycle is recorded and retried after a backoff.
+        """
+        try:
+            return self._cycle()
+        except Exception as e:
+            return self._failed(e)
+
+    def _cycle(self) -> float:
+        stats = self.stats
+        started = time.perf_counter()
+        outcome = self.service.refresh(max_age=self._refresh_age())
+
+        stats.consecutive_failures = 0
+        stats.backoff_seconds = 0.0
+
+        if outcome == REFRESH_OK:
+            latency = (time.perf_counter() - started) * 1000.0
+            stats.refreshes += 1
+            stats.last_latency_ms = round(latency, 3)
+            stats.latency.observe(latency)
+            stats.last_success_at = time.time()
+            stats.last_error = None
+        elif outcome == REFRESH_BUSY:
+            stats.busy += 1
+            self.service.reload_from_store()
+            if self._until_due() <= 1.0:
+                return self._schedule(self.busy_retry_seconds)
+        elif outcome == REFRESH_ADOPTED:
+            stats.adopted += 1
+
+        return self._schedule(self._until_due())
+
+    def _failed(self, e: Exception) -> float:
+        stats = self.stats
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        retry_after = None
+        if isinstance(e, CurrencyServiceError):
+            stats.last_error = str(e)
+            logger.warning("Exchange-rate refresh failed: %s", e)
+        else:
+            # Not wrapped by the provider / store: keep the traceback
+            stats.last_error = f"{type(e).__name__}: {e}"
+            logger.exception("Exchange-rate refresh failed unexpectedly")
+        if isinstance(e, RateLimitedError):
+            stats.rate_limited += 1
+            retry_after = e.retry_after
+
+        delay = self._backoff(retry_after)
+        stats.backoff_seconds = delay
+        return self._schedule(delay)
+
+    def _schedule(self, delay: float) -> float:
+        self.stats.next_run_at = time.time() + delay
+        return delay
+
+    def metrics(self) -> Dict:
+        data = self.stats.as_dict()
+        data["running"] = self.is_running
+        data["staleness_seconds"] = self.service.staleness_seconds
+        data["quotes_fetched_at"] = self.service.quotes_fetched_at or None
+        data["fetch"] = self.service.fetch_metrics()
+        return data
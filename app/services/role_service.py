@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional
 
 from app.models.user import User
 from app.repositories.admin_repository import AdminRepository
 from app.repositories.customer_repository import CustomerRepository
+from app.repositories.user_repository import UserRepository
 
 
 @dataclass
@@ -12,11 +14,21 @@ class RoleService:
     admin_repo: AdminRepository
     customer_repo: CustomerRepository
 
+    # With a user repository the role (and currency) come from one LEFT JOIN query
+    user_repo: Optional[UserRepository] = None
+
     def enrich_user_role(self, user: User) -> User:
         """
         Returns the same user instance with role set according to Admin/Customer tables.
         Priority: ADMIN > CUSTOMER > USER
         """
+        if self.user_repo is not None:
+            resolved = self.user_repo.get_with_role_by_id(user.id)
+            if resolved is not None:
+                user.role = resolved.role
+                user.currency = resolved.currency
+                return user
+
         if self.admin_repo.is_admin(user.id):
             user.role = "ADMIN"
         elif self.customer_repo.is_customer(user.id):
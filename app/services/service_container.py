@@ -1,4 +1,41 @@
 import os
 from app.services.currency_service import CurrencyService
+from app.services.rate_refresher import RateRefresher
+from app.utils.metrics import MetricsRegistry
+from app.utils.security import HashWorkerPool
 
 currency_service = CurrencyService()  # НЕ подаваме ключ тук; CurrencyService решава по флага
+
+# Password hashing for every AuthService: bounded, off the caller's thread (OMNISTORE_HASH_WORKERS / _POOL)
+hash_pool = HashWorkerPool()
+
+# Per-operation timing / SQL counts recorded by StoreAppService.run; OMNISTORE_METRICS_DUMP=<path>
+# writes them on exit (.prom = Prometheus text, otherwise JSON)
+operation_metrics = MetricsRegistry()
+METRICS_DUMP_PATH = os.getenv("OMNISTORE_METRICS_DUMP")
+
+# Background quote renewal for long-running processes (the UI); see start_rate_refresher()
+rate_refresher = RateRefresher(currency_service)
+
+
+def start_rate_refresher() -> bool:
+    """
+    Starts the background refresher if a rate provider is configured (API key or offline source).
+    Short-lived scripts (main.py, seed) do not need it: they read the shared snapshot.
+    """
+    if not currency_service.enabled:
+        return False
+    rate_refresher.start()
+    return True
+
+
+def stop_rate_refresher() -> None:
+    if rate_refresher.is_running:
+        rate_refresher.stop()
+
+
+def dump_operation_metrics() -> bool:
+    if not METRICS_DUMP_PATH:
+        return False
+    operation_metrics.dump(METRICS_DUMP_PATH)
+    return True
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Optional, Set
+
+from app.models.session import UserSession
+from app.models.user import User
+from app.repositories.customer_repository import CustomerRepository
+
+
+SESSION_TTL_SECONDS = float(os.getenv("OMNISTORE_SESSION_TTL", str(8 * 3600)))
+SESSION_MAX = int(os.getenv("OMNISTORE_SESSION_MAX", "10000"))
+
+
+class SessionError(Exception):
+    pass
+
+
+class InvalidSessionError(SessionError):
+    """Unknown, revoked or expired token."""
+
+
+class NotCustomerError(SessionError):
+    pass
+
+
+@dataclass
+class SessionService:
+    """
+    In-memory login sessions.
+
+    open() runs once per login and resolves everything later calls need (user, role,
+    currency); resolve(token) is then a dict lookup - no credential, role or Customer queries.
+
+    - Sessions expire ttl_seconds after login; at most max_sessions are kept (oldest dropped).
+    - Sessions live in this process only: a restart logs everyone out.
+    """
+
+    customer_repo: CustomerRepository
+    ttl_seconds: float = SESSION_TTL_SECONDS
+    max_sessions: int = SESSION_MAX
+    base_currency: str = "EUR"
+    clock: Callable[[], float] = time.time
+
+    def __post_init__(self):
+        self._sessions: "OrderedDict[str, UserSession]" = OrderedDict()
+        self._by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    # ---------- Lifecycle ----------
+
+    def open(self, user: User) -> UserSession:
+        """
+        Issues a token for an authenticated user whose role is already resolved
+        (AuthService.login / RoleService.enrich_user_role). Customers get their display
+        currency cached too; it is only queried if the user was loaded without it.
+        """
+        role = (user.role or "USER").upper()
+        currency = self.base_currency
+        if role == "CUSTOMER":
+            currency = (user.currency or self.customer_repo.get_currency(user.id) or self.base_currency).upper()
+
+        now = self.clock()
+        session = UserSession(
+            token=secrets.token_urlsafe(32),
+            user_id=int(user.id),
+            username=user.username,
+            email=user.email,
+            role=role,
+            currency=currency,
+            issued_at=now,
+            expires_at=now + self.ttl_seconds,
+        )
+
+        with self._lock:
+            self._sessions[session.token] = session
+            self._by_user.setdefault(session.user_id, set()).add(session.token)
+            while len(self._sessions) > self.max_sessions:
+                _token, oldest = self._sessions.popitem(last=False)
+                self._unindex(oldest)
+        return session
+
+    def close(self, token: Optional[str]) -> None:
+        if not token:
+            return
+        with self._lock:
+            session = self._sessions.pop(token, None)
+            if session is not None:
+                self._unindex(session)
+
+    def close_user(self, user_id: int) -> None:
+        """
+        Ends every session of a user (e.g. after a role change or password reset).
+        """
+        with self._lock:
+            for token in self._by_user.pop(int(user_id), set()):
+                self._sessions.pop(token, None)
+
+    def _unindex(self, session: UserSession) -> None:
+        tokens = self._by_user.get(session.user_id)
+        if tokens is not None:
+            tokens.discard(session.token)
+            if not tokens:
+                del self._by_user[session.user_id]
+
+    # ---------- Lookups ----------
+
+    def resolve(self, token: Optional[str]) -> UserSession:
+        if not token:
+            raise InvalidSessionError("Not logged in")
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is not None and session.expired(self.clock()):
+                del self._sessions[token]
+                self._unindex(session)
+                session = None
+        if session is None:
+            raise InvalidSessionError("Session expired or invalid")
+        return session
+
+    def require_customer(self, token: Optional[str]) -> UserSession:
+        session = self.resolve(token)
+        if not session.is_customer:
+            raise NotCustomerError("Customer account required")
+        return session
+
+    # ---------- Cached data ----------
+
+    def update_currency(self, user_id: int, currency: str) -> None:
+        """
+        Keeps cached sessions in line after the customer's currency changes.
+        """
+        currency = currency.upper()
+        with self._lock:
+            for token in self._by_user.get(int(user_id), ()):
+                self._sessions[token] = replace(self._sessions[token], currency=currency)
+
+    def purge_expired(self) -> int:
+        now = self.clock()
+        with self._lock:
+            expired = [s for s in self._sessions.values() if s.expired(now)]
+            for session in expired:
+                del self._sessions[session.token]
+                self._unindex(session)
+        return len(expired)
+
+    @property
+    def active_count(self) -> int:
+        with self._lock:
+            return len(self._sessions)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from typing import Optional, List, Dict
 
 from datetime import datetime, timezone
 
+from app.models.session import UserSession
 from app.models.user import User
 
 from app.repositories.user_repository import UserRepository
@@ -12,6 +14,7 @@ from app.repositories.admin_repository import AdminRepository
 from app.repositories.customer_repository import CustomerRepository
 
 from app.repositories.item_repository import ItemRepository
+from app.repositories.cached_item_repository import CachedItemRepository
 from app.repositories.category_repository import CategoryRepository
 from app.repositories.item_category_repository import ItemCategoryRepository
 from app.repositories.picture_repository import PictureRepository
@@ -26,25 +29,34 @@ from app.repositories.order_repository import OrderRepository
 from app.repositories.order_item_repository import OrderItemRepository
 
 from app.services.auth_service import AuthService
+from app.services.catalog_service import CatalogService
 from app.services.role_service import RoleService
 from app.services.cart_service import CartService
 from app.services.checkout_service import CheckoutService
 from app.services.order_history_service import OrderHistoryService
 from app.services.favorites_service import FavoritesService
 from app.services.history_service import HistoryService
+from app.services.session_service import SessionService
+from app.services.service_container import currency_service, hash_pool, operation_metrics, rate_refresher
 
 from app.presentation.app_result import AppResult
 from app.presentation.error_mapper import map_exception
 from app.presentation.app_exceptions import AppError
 from app.presentation.dto import (
     item_list_dto,
+    item_page_dto,
+    item_search_dto,
     item_details_dto,
     cart_dto,
     order_list_dto,
     order_details_dto,
+    order_page_dto,
+    session_dto,
 )
 
-from app.db.connection import get_connection
+from app.db.connection import connection, transaction
+from app.db.instrumentation import track_queries
+from app.utils.metrics import MetricsRegistry
 
 
 @dataclass
@@ -56,6 +68,8 @@ class StoreAppService:
     Notes:
     - Prices in DB are base currency EUR.
     - Currency API calls are controlled internally by CartService/CurrencyService flags.
+    - login_session() returns a token; the ui_session_* calls take that token and use the
+      cached session (user, role, currency) instead of querying Customer every time.
     """
 
     # Repos
@@ -80,6 +94,7 @@ class StoreAppService:
     # Services
     auth: AuthService
     roles: RoleService
+    catalog: CatalogService
     cart: CartService
     checkout: CheckoutService
     order_history: OrderHistoryService
@@ -88,6 +103,17 @@ class StoreAppService:
 
     base_currency: str = "EUR"
 
+    sessions: Optional[SessionService] = None
+
+    # Per-operation timing and SQL counts of every ui_* call (shared registry by default)
+    metrics: Optional[MetricsRegistry] = None
+
+    def __post_init__(self):
+        if self.sessions is None:
+            self.sessions = SessionService(self.customer_repo, base_currency=self.base_currency)
+        if self.metrics is None:
+            self.metrics = operation_metrics
+
     # ---------- Factory ----------
 
     @classmethod
@@ -96,7 +122,7 @@ class StoreAppService:
         admin_repo = AdminRepository()
         customer_repo = CustomerRepository()
 
-        item_repo = ItemRepository()
+        item_repo = CachedItemRepository()
         category_repo = CategoryRepository()
         item_category_repo = ItemCategoryRepository()
         picture_repo = PictureRepository()
@@ -110,8 +136,9 @@ class StoreAppService:
         order_repo = OrderRepository()
         order_item_repo = OrderItemRepository()
 
-        auth = AuthService(user_repo)
-        roles = RoleService(admin_repo, customer_repo)
+        auth = AuthService(user_repo, hash_pool=hash_pool)
+        roles = RoleService(admin_repo, customer_repo, user_repo)
+        catalog = CatalogService(item_repo, base_currency="EUR")
 
         cart = CartService(
             cart_repo=cart_repo,
@@ -124,13 +151,13 @@ class StoreAppService:
         checkout = CheckoutService(
             cart_repo=cart_repo,
             item_cart_repo=item_cart_repo,
-            item_repo=item_repo,
+            item_repo=item_repo.strict_view(),  # price snapshots never come from a stale cache
             order_repo=order_repo,
             order_item_repo=order_item_repo,
             base_currency="EUR",
         )
 
-        order_history = OrderHistoryService(order_repo, order_item_repo)
+        order_history = OrderHistoryService(order_repo, order_item_repo, currency_service=currency_service)
 
         favorites = FavoritesService(favorites_repo, item_repo)
         history = HistoryService(history_repo, item_repo)
@@ -151,6 +178,7 @@ class StoreAppService:
             order_item_repo=order_item_repo,
             auth=auth,
             roles=roles,
+            catalog=catalog,
             cart=cart,
             checkout=checkout,
             order_history=order_history,
@@ -167,14 +195,32 @@ class StoreAppService:
         return self.roles.enrich_user_role(user)
 
     def login(self, email: str, password: str) -> User:
-        user = self.auth.login(email=email, password=password)
-        return self.roles.enrich_user_role(user)
+        return self.auth.login(email=email, password=password)  # role already resolved
+
+    def login_session(self, email: str, password: str) -> UserSession:
+        """
+        login() + a session token: role and currency are resolved here, once.
+        """
+        return self.sessions.open(self.login(email, password))
+
+    def register_customer_session(
+        self, username: str, email: str, name: str, password: str, currency: str = "EUR"
+    ) -> UserSession:
+        return self.sessions.open(self.register_customer(username, email, name, password, currency))
+
+    def logout(self, token: Optional[str]) -> None:
+        self.sessions.close(token)
+
+    def get_session(self, token: str) -> UserSession:
+        return self.sessions.resolve(token)
 
     def ensure_admin(self, user_id: int) -> None:
         self.roles.make_admin(user_id)
+        self.sessions.close_user(user_id)  # cached role is outdated
 
     def set_customer_currency(self, user_id: int, currency: str) -> None:
         self.customer_repo.set_currency(user_id, currency)
+        self.sessions.update_currency(user_id, currency)
 
     def get_customer_currency(self, user_id: int) -> str:
         return (self.customer_repo.get_currency(user_id) or self.base_currency).upper()
@@ -182,11 +228,28 @@ class StoreAppService:
     # ---------- Catalog ----------
 
     def list_items(self) -> List[Dict]:
-        items = self.item_repo.list_all() or []
-        return [
-            {"item_id": it.id, "name": it.name, "price_base": float(it.price), "currency": self.base_currency}
-            for it in items
-        ]
+        return self.catalog.list_all()
+
+    def list_items_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[Dict] = None,
+        sort: str = "id",
+        descending: bool = False,
+        **filters,
+    ) -> Dict:
+        """
+        One catalog page (keyset pagination). filters: category_id, min_price, max_price,
+        min_/max_height, min_/max_width, min_/max_length.
+        """
+        query = self.catalog.build_query(limit=limit, cursor=cursor, sort=sort, descending=descending, **filters)
+        return self.catalog.list_page(query)
+
+    def search_items(self, text: str, limit: int = 20) -> Dict:
+        """
+        Full-text search over item names/descriptions, ranked by relevance.
+        """
+        return self.catalog.search(text, limit=limit)
 
     def get_item_details(self, item_id: int) -> dict:
         """
@@ -203,8 +266,7 @@ class StoreAppService:
             raise AppError("Item not found")
 
         # Use direct SQL to avoid repo-method-name mismatches
-        conn = get_connection()
-        try:
+        with connection() as conn:
             # Categories (names)
             cur = conn.execute(
                 """
@@ -230,8 +292,6 @@ class StoreAppService:
             )
             pics = cur.fetchall()
 
-        finally:
-            conn.close()
 
         pictures = [p["FilePath"] for p in pics] if pics else []
         main_pic = None
@@ -244,6 +304,23 @@ class StoreAppService:
 
         return {"item": item, "categories": categories, "pictures": pictures, "main_picture": main_pic}
 
+    def currency_metrics(self) -> Dict:
+        """
+        Exchange-rate freshness + background refresher stats (latency, failures, backoff).
+        """
+        return rate_refresher.metrics()
+
+    def operation_metrics(self) -> Dict[str, Dict]:
+        """
+        Per ui_* operation: calls, errors, latency percentiles and SQL work per call.
+        """
+        return self.metrics.as_dict()
+
+    def catalog_cache_stats(self) -> Dict:
+        if isinstance(self.item_repo, CachedItemRepository):
+            return self.item_repo.cache_stats()
+        return {}
+
     # ---------- Cart ----------
 
     def add_to_cart(self, customer_user_id: int, item_id: int, quantity: int = 1) -> None:
@@ -255,10 +332,14 @@ class StoreAppService:
     def remove_from_cart(self, customer_user_id: int, item_id: int) -> None:
         self.cart.remove_item(customer_user_id, item_id)
 
+    def apply_cart_delta(self, customer_user_id: int, deltas: Dict[int, int]) -> Dict[int, int]:
+        """
+        Several cart changes at once: {item_id: +n / -n}. Returns {item_id: new quantity}.
+        """
+        return self.cart.apply_delta(customer_user_id, deltas)
+
     def get_cart(self, customer_user_id: int, display_currency: Optional[str] = None) -> Dict:
-        items = self.cart.get_detailed_items(customer_user_id, display_currency=display_currency)
-        total = self.cart.get_total(customer_user_id, display_currency=display_currency)
-        return {"items": items, "total": total}
+        return self.cart.get_cart_view(customer_user_id, display_currency=display_currency)
 
     # ---------- Checkout / Orders ----------
 
@@ -269,172 +350,336 @@ class StoreAppService:
         """
         return self.checkout.checkout(customer_user_id)
 
-    def list_orders(self, customer_user_id: int, limit: int = 50) -> List[Dict]:
-        return self.order_history.list_orders(customer_user_id, limit=limit)
+    def list_orders(self, customer_user_id: int, limit: int = 50, display_currency: Optional[str] = None) -> List[Dict]:
+        return self.order_history.list_orders(customer_user_id, limit=limit, display_currency=display_currency)
+
+    def list_orders_with_items(
+        self,
+        customer_user_id: int,
+        limit: int = 20,
+        cursor: Optional[Dict] = None,
+        display_currency: Optional[str] = None,
+    ) -> Dict:
+        return self.order_history.list_orders_with_items(
+            customer_user_id, limit=limit, cursor=cursor, display_currency=display_currency
+        )
 
-    def get_order_details(self, customer_user_id: int, order_id: int) -> Dict:
-        return self.order_history.get_order_details(customer_user_id, order_id)
+    def get_order_details(self, customer_user_id: int, order_id: int, display_currency: Optional[str] = None) -> Dict:
+        return self.order_history.get_order_details(customer_user_id, order_id, display_currency=display_currency)
 
     # ---------- UI-safe wrappers ----------
 
-    def run(self, fn, *args, **kwargs) -> AppResult:
-        try:
-            return AppResult.success(fn(*args, **kwargs))
-        except Exception as e:
-            code, msg = map_exception(e)
-            return AppResult.fail(code, msg)
+    def run(self, name: str, fn, *args, **kwargs) -> AppResult:
+        """
+        Calls fn, maps exceptions to AppResult and records the call in self.metrics
+        under `name` (wall time, SQL statements, connections, rows).
+        """
+        started = time.perf_counter()
+        with track_queries() as queries:
+            try:
+                result = AppResult.success(fn(*args, **kwargs))
+            except Exception as e:
+                code, msg = map_exception(e)
+                result = AppResult.fail(code, msg)
+
+        self.metrics.record(
+            name,
+            (time.perf_counter() - started) * 1000.0,
+            ok=result.ok,
+            statements=queries.statements,
+            connections=queries.connections,
+            rows=queries.rows,
+        )
+        return result
 
     def ui_login(self, email: str, password: str) -> AppResult:
-        return self.run(self.login, email, password)
+        return self.run("login", self.login, email, password)
+
+    def ui_login_session(self, email: str, password: str) -> AppResult:
+        return self.run("login_session", lambda: session_dto(self.login_session(email, password)))
+
+    def ui_register_customer_session(
+        self, username: str, email: str, name: str, password: str, currency: str = "EUR"
+    ) -> AppResult:
+        return self.run(
+            "register_customer_session",
+            lambda: session_dto(self.register_customer_session(username, email, name, password, currency))
+        )
+
+    def ui_logout(self, token: Optional[str]) -> AppResult:
+        return self.run("logout", self.logout, token)
 
     def ui_register_customer(self, username: str, email: str, name: str, password: str, currency: str = "EUR") -> AppResult:
-        return self.run(self.register_customer, username, email, name, password, currency)
+        return self.run("register_customer", self.register_customer, username, email, name, password, currency)
 
     def ui_list_items(self) -> AppResult:
-        return self.run(lambda: item_list_dto(self.list_items()))
+        return self.run("list_items", lambda: item_list_dto(self.list_items()))
+
+    def ui_list_items_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[Dict] = None,
+        sort: str = "id",
+        descending: bool = False,
+        **filters,
+    ) -> AppResult:
+        return self.run(
+            "list_items_page",
+            lambda: item_page_dto(self.list_items_page(limit, cursor, sort, descending, **filters))
+        )
+
+    def ui_search_items(self, text: str, limit: int = 20) -> AppResult:
+        return self.run("search_items", lambda: item_search_dto(self.search_items(text, limit)))
 
     def ui_item_details(self, item_id: int) -> AppResult:
-        return self.run(lambda: item_details_dto(self.get_item_details(item_id)))
+        return self.run("item_details", lambda: item_details_dto(self.get_item_details(item_id)))
 
     def ui_get_cart(self, customer_user_id: int, display_currency=None) -> AppResult:
-        return self.run(lambda: cart_dto(self.get_cart(customer_user_id, display_currency)))
+        return self.run("get_cart", lambda: cart_dto(self.get_cart(customer_user_id, display_currency)))
 
     def ui_add_to_cart(self, customer_user_id: int, item_id: int, quantity: int = 1) -> AppResult:
-        return self.run(self.add_to_cart, customer_user_id, item_id, quantity)
+        return self.run("add_to_cart", self.add_to_cart, customer_user_id, item_id, quantity)
+
+    def ui_apply_cart_delta(self, customer_user_id: int, deltas: Dict[int, int]) -> AppResult:
+        return self.run("apply_cart_delta", self.apply_cart_delta, customer_user_id, deltas)
 
     def ui_checkout(self, customer_user_id: int) -> AppResult:
-        return self.run(self.proceed_to_checkout, customer_user_id)
+        return self.run("checkout", self.proceed_to_checkout, customer_user_id)
 
-    def ui_list_orders(self, customer_user_id: int, limit: int = 50) -> AppResult:
-        return self.run(lambda: order_list_dto(self.list_orders(customer_user_id, limit)))
+    def ui_list_orders(self, customer_user_id: int, limit: int = 50, display_currency: Optional[str] = None) -> AppResult:
+        return self.run(
+            "list_orders",
+            lambda: order_list_dto(self.list_orders(customer_user_id, limit, display_currency))
+        )
 
-    def ui_order_details(self, customer_user_id: int, order_id: int) -> AppResult:
-        return self.run(lambda: order_details_dto(self.get_order_details(customer_user_id, order_id)))
+    def ui_list_orders_with_items(
+        self,
+        customer_user_id: int,
+        limit: int = 20,
+        cursor: Optional[Dict] = None,
+        display_currency: Optional[str] = None,
+    ) -> AppResult:
+        return self.run(
+            "list_orders_with_items",
+            lambda: order_page_dto(self.list_orders_with_items(customer_user_id, limit, cursor, display_currency))
+        )
+
+    def ui_order_details(self, customer_user_id: int, order_id: int, display_currency: Optional[str] = None) -> AppResult:
+        return self.run(
+            "order_details",
+            lambda: order_details_dto(self.get_order_details(customer_user_id, order_id, display_currency))
+        )
     
     def ui_remove_from_cart(self, customer_user_id: int, item_id: int) -> AppResult:
-        return self.run(self.remove_from_cart, customer_user_id, item_id)
+        return self.run("remove_from_cart", self.remove_from_cart, customer_user_id, item_id)
 
     # ---------------- Favorites (UI-safe via direct SQL) ----------------
 
     def _ensure_customer(self, customer_user_id: int) -> None:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             row = conn.execute('SELECT UserID FROM "Customer" WHERE UserID = ?', (customer_user_id,)).fetchone()
             if not row:
                 raise AppError("Customer not found")
-        finally:
-            conn.close()
+
+    def _add_favorite(self, customer_user_id: int, item_id: int) -> bool:
+        with transaction() as conn:
+            it = conn.execute('SELECT ID FROM "Item" WHERE ID = ?', (int(item_id),)).fetchone()
+            if not it:
+                raise AppError("Item not found")
+
+            conn.execute(
+                'INSERT OR IGNORE INTO "Favorites"(CustomerUserID, ItemID) VALUES (?, ?)',
+                (int(customer_user_id), int(item_id)),
+            )
+            return True
+
+    def _remove_favorite(self, customer_user_id: int, item_id: int) -> bool:
+        with transaction() as conn:
+            conn.execute(
+                'DELETE FROM "Favorites" WHERE CustomerUserID = ? AND ItemID = ?',
+                (int(customer_user_id), int(item_id)),
+            )
+            return True
+
+    def _list_favorites(self, customer_user_id: int) -> List[Dict]:
+        with connection() as conn:
+            cur = conn.execute(
+                """
+                SELECT i.ID as ItemID, i.Name as Name, i.Price as Price
+                FROM "Favorites" f
+                JOIN "Item" i ON i.ID = f.ItemID
+                WHERE f.CustomerUserID = ?
+                ORDER BY f.ItemID ASC
+                """,
+                (int(customer_user_id),),
+            )
+            return [
+                {"id": int(r["ItemID"]), "name": r["Name"], "price": float(r["Price"]), "currency": "EUR"}
+                for r in cur.fetchall()
+            ]
 
     def ui_add_favorite(self, customer_user_id: int, item_id: int) -> AppResult:
         def op():
             self._ensure_customer(customer_user_id)
-            conn = get_connection()
-            try:
-                it = conn.execute('SELECT ID FROM "Item" WHERE ID = ?', (int(item_id),)).fetchone()
-                if not it:
-                    raise AppError("Item not found")
-
-                conn.execute(
-                    'INSERT OR IGNORE INTO "Favorites"(CustomerUserID, ItemID) VALUES (?, ?)',
-                    (int(customer_user_id), int(item_id)),
-                )
-                conn.commit()
-                return True
-            finally:
-                conn.close()
+            return self._add_favorite(customer_user_id, item_id)
 
-        return self.run(op)
+        return self.run("add_favorite", op)
 
     def ui_remove_favorite(self, customer_user_id: int, item_id: int) -> AppResult:
         def op():
             self._ensure_customer(customer_user_id)
-            conn = get_connection()
-            try:
-                conn.execute(
-                    'DELETE FROM "Favorites" WHERE CustomerUserID = ? AND ItemID = ?',
-                    (int(customer_user_id), int(item_id)),
-                )
-                conn.commit()
-                return True
-            finally:
-                conn.close()
+            return self._remove_favorite(customer_user_id, item_id)
 
-        return self.run(op)
+        return self.run("remove_favorite", op)
 
     def ui_list_favorites(self, customer_user_id: int) -> AppResult:
         def op():
             self._ensure_customer(customer_user_id)
-            conn = get_connection()
-            try:
-                cur = conn.execute(
-                    """
-                    SELECT i.ID as ItemID, i.Name as Name, i.Price as Price
-                    FROM "Favorites" f
-                    JOIN "Item" i ON i.ID = f.ItemID
-                    WHERE f.CustomerUserID = ?
-                    ORDER BY i.ID ASC
-                    """,
-                    (int(customer_user_id),),
-                )
-                return [
-                    {"id": int(r["ItemID"]), "name": r["Name"], "price": float(r["Price"]), "currency": "EUR"}
-                    for r in cur.fetchall()
-                ]
-            finally:
-                conn.close()
-
-        return self.run(op)
+            return self._list_favorites(customer_user_id)
+
+        return self.run("list_favorites", op)
 
     # ---------------- History (UI-safe via direct SQL) ----------------
 
+    def _record_view(self, customer_user_id: int, item_id: int) -> bool:
+        with transaction() as conn:
+            it = conn.execute('SELECT ID FROM "Item" WHERE ID = ?', (int(item_id),)).fetchone()
+            if not it:
+                return True
+
+            ts = datetime.now(timezone.utc).isoformat()
+            conn.execute(
+                'INSERT INTO "History"(CustomerUserID, ItemID, ViewedAt) VALUES (?, ?, ?)',
+                (int(customer_user_id), int(item_id), ts),
+            )
+            return True
+
+    def _list_history(self, customer_user_id: int, limit: int) -> List[Dict]:
+        with connection() as conn:
+            cur = conn.execute(
+                """
+                SELECT h.ViewedAt as ViewedAt, i.ID as ItemID, i.Name as Name, i.Price as Price
+                FROM "History" h
+                JOIN "Item" i ON i.ID = h.ItemID
+                WHERE h.CustomerUserID = ?
+                ORDER BY h.ViewedAt DESC
+                LIMIT ?
+                """,
+                (int(customer_user_id), int(limit)),
+            )
+            return [
+                {
+                    "viewed_at": r["ViewedAt"],
+                    "item_id": int(r["ItemID"]),
+                    "name": r["Name"],
+                    "price": float(r["Price"]),
+                    "currency": "EUR",
+                }
+                for r in cur.fetchall()
+            ]
+
     def ui_record_view(self, customer_user_id: int, item_id: int) -> AppResult:
         def op():
             self._ensure_customer(customer_user_id)
-            conn = get_connection()
-            try:
-                it = conn.execute('SELECT ID FROM "Item" WHERE ID = ?', (int(item_id),)).fetchone()
-                if not it:
-                    return True
-
-                ts = datetime.now(timezone.utc).isoformat()
-                conn.execute(
-                    'INSERT INTO "History"(CustomerUserID, ItemID, ViewedAt) VALUES (?, ?, ?)',
-                    (int(customer_user_id), int(item_id), ts),
-                )
-                conn.commit()
-                return True
-            finally:
-                conn.close()
+            return self._record_view(customer_user_id, item_id)
 
-        return self.run(op)
+        return self.run("record_view", op)
 
     def ui_list_history(self, customer_user_id: int, limit: int = 50) -> AppResult:
         def op():
             self._ensure_customer(customer_user_id)
-            conn = get_connection()
-            try:
-                cur = conn.execute(
-                    """
-                    SELECT h.ViewedAt as ViewedAt, i.ID as ItemID, i.Name as Name, i.Price as Price
-                    FROM "History" h
-                    JOIN "Item" i ON i.ID = h.ItemID
-                    WHERE h.CustomerUserID = ?
-                    ORDER BY h.ViewedAt DESC
-                    LIMIT ?
-                    """,
-                    (int(customer_user_id), int(limit)),
-                )
-                return [
-                    {
-                        "viewed_at": r["ViewedAt"],
-                        "item_id": int(r["ItemID"]),
-                        "name": r["Name"],
-                        "price": float(r["Price"]),
-                        "currency": "EUR",
-                    }
-                    for r in cur.fetchall()
-                ]
-            finally:
-                conn.close()
-
-        return self.run(op)
+            return self._list_history(customer_user_id, limit)
+
+        return self.run("list_history", op)
+
+    # ---------------- Session-scoped (token from login_session) ----------------
+
+    def _session_customer(self, token: str) -> UserSession:
+        """
+        The logged-in customer behind a token, from memory: no Customer or currency query.
+        Unknown / expired token -> SESSION_EXPIRED; not a customer -> rejected.
+        """
+        return self.sessions.require_customer(token)
+
+    def ui_session_get_cart(self, token: str, display_currency: Optional[str] = None) -> AppResult:
+        def op():
+            session = self._session_customer(token)
+            return cart_dto(self.get_cart(session.user_id, display_currency or session.currency))
+
+        return self.run("session_get_cart", op)
+
+    def ui_session_add_to_cart(self, token: str, item_id: int, quantity: int = 1) -> AppResult:
+        return self.run(
+            "session_add_to_cart",
+            lambda: self.add_to_cart(self._session_customer(token).user_id, item_id, quantity)
+        )
+
+    def ui_session_apply_cart_delta(self, token: str, deltas: Dict[int, int]) -> AppResult:
+        return self.run(
+            "session_apply_cart_delta",
+            lambda: self.apply_cart_delta(self._session_customer(token).user_id, deltas)
+        )
+
+    def ui_session_remove_from_cart(self, token: str, item_id: int) -> AppResult:
+        return self.run(
+            "session_remove_from_cart",
+            lambda: self.remove_from_cart(self._session_customer(token).user_id, item_id)
+        )
+
+    def ui_session_checkout(self, token: str) -> AppResult:
+        return self.run("session_checkout", lambda: self.proceed_to_checkout(self._session_customer(token).user_id))
+
+    def ui_session_list_orders(self, token: str, limit: int = 50, display_currency: Optional[str] = None) -> AppResult:
+        return self.run(
+            "session_list_orders",
+            lambda: order_list_dto(self.list_orders(self._session_customer(token).user_id, limit, display_currency))
+        )
+
+    def ui_session_list_orders_with_items(
+        self,
+        token: str,
+        limit: int = 20,
+        cursor: Optional[Dict] = None,
+        display_currency: Optional[str] = None,
+    ) -> AppResult:
+        return self.run(
+            "session_list_orders_with_items",
+            lambda: order_page_dto(
+                self.list_orders_with_items(self._session_customer(token).user_id, limit, cursor, display_currency)
+            )
+        )
+
+    def ui_session_order_details(self, token: str, order_id: int, display_currency: Optional[str] = None) -> AppResult:
+        return self.run(
+            "session_order_details",
+            lambda: order_details_dto(
+                self.get_order_details(self._session_customer(token).user_id, order_id, display_currency)
+            )
+        )
+
+    def ui_session_add_favorite(self, token: str, item_id: int) -> AppResult:
+        return self.run(
+            "session_add_favorite",
+            lambda: self._add_favorite(self._session_customer(token).user_id, item_id)
+        )
+
+    def ui_session_remove_favorite(self, token: str, item_id: int) -> AppResult:
+        return self.run(
+            "session_remove_favorite",
+            lambda: self._remove_favorite(self._session_customer(token).user_id, item_id)
+        )
+
+    def ui_session_list_favorites(self, token: str) -> AppResult:
+        return self.run("session_list_favorites", lambda: self._list_favorites(self._session_customer(token).user_id))
+
+    def ui_session_record_view(self, token: str, item_id: int) -> AppResult:
+        return self.run(
+            "session_record_view",
+            lambda: self._record_view(self._session_customer(token).user_id, item_id)
+        )
+
+    def ui_session_list_history(self, token: str, limit: int = 50) -> AppResult:
+        return self.run(
+            "session_list_history",
+            lambda: self._list_history(self._session_customer(token).user_id, limit)
+        )
@@ -3,6 +3,13 @@ from tkinter import ttk
 
 from app.db.schema import init_db
 from app.db.seed import seed_demo_data_if_empty
+from app.services.service_container import (
+    currency_service,
+    dump_operation_metrics,
+    hash_pool,
+    start_rate_refresher,
+    stop_rate_refresher,
+)
 from app.ui.main_window import MainWindow
 
 
@@ -91,6 +98,15 @@ def run_app():
     init_db()
     seed_demo_data_if_empty()
 
+    # Exchange rates are renewed in the background, never inside a UI refresh
+    start_rate_refresher()
+
     root = tk.Tk()
     MainWindow(root)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        stop_rate_refresher()
+        currency_service.close()
+        hash_pool.shutdown()
+        dump_operation_metrics()
@@ -11,6 +11,7 @@ class AppUserSession:
     email: str
     role: str  # "GUEST" | "CUSTOMER" | "ADMIN"
     currency: str = "EUR"
+    token: Optional[str] = None  # StoreAppService session token (ui_session_* calls)
 
 
 @dataclass
@@ -34,13 +35,22 @@ class AppState:
         self.session = None
         self.selected_item_id = None
 
-    def set_session(self, user_id: int, username: str, email: str, role: str, currency: str = "EUR") -> None:
+    def set_session(
+        self,
+        user_id: int,
+        username: str,
+        email: str,
+        role: str,
+        currency: str = "EUR",
+        token: Optional[str] = None,
+    ) -> None:
         self.session = AppUserSession(
             user_id=user_id,
             username=username,
             email=email,
             role=role.upper(),
             currency=currency.upper() if currency else "EUR",
+            token=token,
         )
 
     def select_item(self, item_id: int) -> None:
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+UI_WORKERS = int(os.getenv("OMNISTORE_UI_WORKERS", "4"))
+POLL_MS = 15  # how often the Tk thread picks up finished work (only while tasks are pending)
+
+
+@dataclass
+class UiTask:
+    key: Hashable
+    generation: int
+    future: Future
+    on_done: Callable[[Any], None]
+    on_error: Optional[Callable[[BaseException], None]] = None
+    on_settled: Optional[Callable[[], None]] = None
+
+    cancelled: bool = field(default=False)
+
+
+class UiTaskRunner:
+    """
+    Runs blocking service calls on a small thread pool and delivers the results
+    back on the Tk main thread.
+
+    - Workers never touch widgets: finished futures are queued and the Tk thread
+      drains the queue from a root.after() loop (running only while work is pending).
+    - Every task has a key. Submitting a new task under the same key makes the
+      previous one stale; cancel(key) does the same without a replacement.
+      Stale results are dropped instead of being rendered.
+    """
+
+    def __init__(self, max_workers: int = UI_WORKERS, poll_ms: int = POLL_MS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="omnistore-ui")
+        self._poll_ms = poll_ms
+        self._done: "queue.SimpleQueue[UiTask]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._generations: Dict[Hashable, int] = {}
+        self._active: Dict[Hashable, UiTask] = {}
+        self._inflight = 0  # submitted futures not yet drained from the queue (stale ones included)
+        self._root = None
+        self._polling = False
+
+    def attach(self, root) -> None:
+        """
+        Binds the runner to the Tk root whose event loop receives the results.
+        """
+        self._root = root
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._active)
+
+    def is_pending(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._active
+
+    def submit(
+        self,
+        key: Hashable,
+        fn: Callable[..., Any],
+        *args,
+        on_done: Callable[[Any], None],
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        on_settled: Optional[Callable[[], None]] = None,
+        widget=None,
+        **kwargs,
+    ) -> UiTask:
+        """
+        Runs fn(*args, **kwargs) in the background; on_done(result) / on_error(exc)
+        run later on the Tk thread, unless the task became stale in the meantime.
+        on_settled runs on the Tk thread once the task is finished or dropped.
+        """
+        if self._root is None:
+            if widget is None:
+                raise RuntimeError("UiTaskRunner is not attached to a Tk root")
+            self._root = widget.winfo_toplevel()
+
+        with self._lock:
+            previous = self._active.pop(key, None)
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+
+            future = self._executor.submit(fn, *args, **kwargs)
+            task = UiTask(key, generation, future, on_done, on_error, on_settled)
+            self._active[key] = task
+            self._inflight += 1
+
+        if previous is not None:
+            self._drop(previous)
+
+        future.add_done_callback(lambda _f: self._done.put(task))
+        self._ensure_polling()
+        return task
+
+    def cancel(self, key: Hashable) -> None:
+        """
+        Marks the task under key as stale (and cancels it if it has not started yet).
+        """
+        with self._lock:
+            task = self._active.pop(key, None)
+            if task is None:
+                return
+            self._generations[key] = task.generation + 1
+        self._drop(task)
+
+    def cancel_matching(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            keys = [k for k in self._active if predicate(k)]
+        for key in keys:
+            self.cancel(key)
+
+    def shutdown(self) -> None:
+        self.cancel_matching(lambda _k: True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------- Tk side ----------
+
+    def _drop(self, task: UiTask) -> None:
+        task.cancelled = True
+        task.future.cancel()
+        # Started tasks still finish; their result is discarded when it comes back
+        if task.future.cancelled() and task.on_settled is not None:
+            self._call_on_tk(task.on_settled)
+
+    def _call_on_tk(self, callback: Callable[[], None]) -> None:
+        if self._root is not None:
+            self._root.after(0, callback)
+
+    def _ensure_polling(self) -> None:
+        if not self._polling and self._root is not None:
+            self._polling = True
+            self._root.after(self._poll_ms, self._poll)
+
+    def _poll(self) -> None:
+        while True:
+            try:
+                task = self._done.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._deliver(task)
+            except Exception:
+                # Keep polling; let Tk report it like any other callback error
+                self._root.report_callback_exception(*sys.exc_info())
+
+        with self._lock:
+            keep_polling = self._inflight > 0
+        if keep_polling:
+            self._root.after(self._poll_ms, self._poll)
+        else:
+            self._polling = False
+
+    def _deliver(self, task: UiTask) -> None:
+        with self._lock:
+            self._inflight -= 1
+            current = self._generations.get(task.key) == task.generation and not task.cancelled
+            if current:
+                self._active.pop(task.key, None)
+
+        if task.future.cancelled():
+            return  # on_settled already scheduled by _drop()
+
+        try:
+            if current:
+                exc = task.future.exception()
+                if exc is None:
+                    task.on_done(task.future.result())
+                elif task.on_error is not None:
+                    task.on_error(exc)
+                else:
+                    raise exc
+        finally:
+            if task.on_settled is not None:
+                task.on_settled()
+
+
+# One shared runner for the whole UI (attached to the root by MainWindow)
+ui_tasks = UiTaskRunner()
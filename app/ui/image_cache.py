@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+from PIL import Image
+
+from app.db.connection import DATA_DIR, PROJECT_ROOT
+from app.utils.lru_cache import LruTtlCache
+
+
+FrameSize = Tuple[int, int]
+Color = Tuple[int, int, int]
+
+THUMBNAIL_DIR = Path(os.getenv("OMNISTORE_THUMBNAIL_DIR") or (DATA_DIR / "cache" / "thumbnails"))
+MEMORY_FRAMES = int(os.getenv("OMNISTORE_IMAGE_CACHE_SIZE", "64"))
+
+# Bump when render_frame() output changes, so old thumbnails are not reused
+_RENDER_VERSION = 1
+
+
+def resolve_picture_path(path: str) -> Path:
+    """
+    DB stores picture paths relative to the project root (e.g. images/desk_1.png).
+    """
+    return Path(os.path.normpath(os.path.join(PROJECT_ROOT, path)))
+
+
+def blank_frame(frame_size: FrameSize, bg_color: Color = (0, 0, 0)) -> Image.Image:
+    return Image.new("RGB", frame_size, bg_color)
+
+
+def render_frame(src: Path, frame_size: FrameSize, bg_color: Color = (0, 0, 0)) -> Image.Image:
+    """
+    Loads an image and letterboxes it into a fixed-size RGB frame
+    (aspect ratio kept, bars in bg_color).
+    """
+    with Image.open(src) as img:
+        # Convert to RGB to avoid issues with palette/alpha in some PNGs
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGB")
+
+        # Fit inside frame while keeping aspect ratio
+        fw, fh = frame_size
+        iw, ih = img.size
+        scale = min(fw / iw, fh / ih)
+        new_w = max(1, int(iw * scale))
+        new_h = max(1, int(ih * scale))
+
+        resized = img.resize((new_w, new_h), Image.LANCZOS)
+
+    x = (fw - new_w) // 2
+    y = (fh - new_h) // 2
+
+    # If resized has alpha, paste using alpha as mask (RGBA over bg_color)
+    if resized.mode == "RGBA":
+        tmp = Image.new("RGBA", (fw, fh), bg_color + (255,))
+        tmp.paste(resized, (x, y), resized)
+        return tmp.convert("RGB")
+
+    frame = Image.new("RGB", (fw, fh), bg_color)
+    frame.paste(resized, (x, y))
+    return frame
+
+
+class ImagePipeline:
+    """
+    Letterboxed picture frames for the item carousel, cached at two levels:
+
+    - memory: LRU of ready RGB frames (ImageTk.PhotoImage(frame) is all that is left to do);
+    - disk: pre-rendered PNG thumbnails keyed by (path, mtime, frame_size, bg_color),
+      so an edited source image is re-rendered automatically.
+
+    get() is thread-safe; prefetch() warms both levels on a background thread.
+    Missing or broken images give a blank frame (never cached on disk).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = THUMBNAIL_DIR,
+        memory_frames: int = MEMORY_FRAMES,
+        prefetch_workers: int = 1,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.frames: LruTtlCache = LruTtlCache(max_size=memory_frames)
+        self._prefetcher = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix="omnistore-img")
+        self._prefetching = set()
+        self._lock = threading.Lock()
+
+    # ---------- Keys ----------
+
+    @staticmethod
+    def _key(src: Path, mtime_ns: int, frame_size: FrameSize, bg_color: Color) -> str:
+        raw = f"{_RENDER_VERSION}|{src}|{mtime_ns}|{frame_size[0]}x{frame_size[1]}|{bg_color}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / key[:2] / f"{key}.png"
+
+    # ---------- Reads ----------
+
+    def get(self, path: Optional[str], frame_size: FrameSize = (420, 320), bg_color: Color = (0, 0, 0)) -> Image.Image:
+        """
+        Returns the letterboxed frame for a picture path (as stored in the DB).
+        Callers must not modify the returned image (it is shared by the cache).
+        """
+        if not path:
+            return self._blank(frame_size, bg_color)
+
+        src = resolve_picture_path(path)
+        try:
+            mtime_ns = src.stat().st_mtime_ns
+        except OSError:
+            return self._blank(frame_size, bg_color)
+
+        key = self._key(src, mtime_ns, frame_size, bg_color)
+        frame = self.frames.get(key)
+        if frame is not None:
+            return frame
+
+        frame = self._load_from_disk(key)
+        if frame is None:
+            try:
+                frame = render_frame(src, frame_size, bg_color)
+            except Exception:
+                return self._blank(frame_size, bg_color)
+            self._store_on_disk(key, frame)
+
+        self.frames.put(key, frame)
+        return frame
+
+    def peek(self, path: Optional[str], frame_size: FrameSize = (420, 320), bg_color: Color = (0, 0, 0)) -> Optional[Image.Image]:
+        """
+        Memory-only lookup (no decoding): lets the Tk thread show cached frames immediately.
+        """
+        if not path:
+            return self._blank(frame_size, bg_color)
+        src = resolve_picture_path(path)
+        try:
+            mtime_ns = src.stat().st_mtime_ns
+        except OSError:
+            return self._blank(frame_size, bg_color)
+        return self.frames.get(self._key(src, mtime_ns, frame_size, bg_color))
+
+    def _blank(self, frame_size: FrameSize, bg_color: Color) -> Image.Image:
+        key = ("blank", frame_size, bg_color)
+        frame = self.frames.get(key)
+        if frame is None:
+            frame = blank_frame(frame_size, bg_color)
+            self.frames.put(key, frame)
+        return frame
+
+    def _load_from_disk(self, key: str) -> Optional[Image.Image]:
+        disk_path = self._disk_path(key)
+        if disk_path is None or not disk_path.exists():
+            return None
+        try:
+            with Image.open(disk_path) as img:
+                img.load()
+                return img.convert("RGB") if img.mode != "RGB" else img.copy()
+        except Exception:
+            # Truncated/corrupt thumbnail: render again
+            return None
+
+    def _store_on_disk(self, key: str, frame: Image.Image) -> None:
+        disk_path = self._disk_path(key)
+        if disk_path is None:
+            return
+        try:
+            disk_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write + rename, so a concurrent reader never sees half a file
+            tmp = disk_path.with_suffix(f".{threading.get_ident()}.tmp")
+            frame.save(tmp, format="PNG", compress_level=1)
+            os.replace(tmp, disk_path)
+        except OSError:
+            pass  # the cache is an optimization only
+
+    # ---------- Prefetch ----------
+
+    def prefetch(self, paths: Iterable[Optional[str]], frame_size: FrameSize = (420, 320), bg_color: Color = (0, 0, 0)) -> None:
+        """
+        Warms the caches for the given pictures in the background (e.g. carousel neighbours).
+        """
+        for path in paths:
+            if not path:
+                continue
+            job = (path, frame_size, bg_color)
+            with self._lock:
+                if job in self._prefetching:
+                    continue
+                self._prefetching.add(job)
+            self._prefetcher.submit(self._prefetch_one, job)
+
+    def _prefetch_one(self, job) -> None:
+        path, frame_size, bg_color = job
+        try:
+            self.get(path, frame_size, bg_color)
+        finally:
+            with self._lock:
+                self._prefetching.discard(job)
+
+    def clear_memory(self) -> None:
+        self.frames.clear()
+
+    def shutdown(self) -> None:
+        self._prefetcher.shutdown(wait=False, cancel_futures=True)
+
+
+# One shared pipeline for the whole UI
+image_pipeline = ImagePipeline()
@@ -4,6 +4,9 @@ import tkinter as tk
 from tkinter import ttk
 
 from app.ui.app_state import AppState
+from app.ui.async_runner import ui_tasks
+from app.ui.image_cache import image_pipeline
+from app.ui.service_provider import store_app_service
 from app.ui.theme import apply_theme
 
 from app.ui.views.login_view import LoginView
@@ -23,6 +26,10 @@ class MainWindow:
 
         apply_theme(self.root)
 
+        # Background work of the views reports back through this root's event loop
+        ui_tasks.attach(self.root)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
         self.state = AppState()  # session state (guest by default)
 
         # Layout
@@ -60,6 +67,7 @@ class MainWindow:
 
         # Views
         self.views: dict[str, ttk.Frame] = {}
+        self.current_view: str | None = None
         self._create_views()
 
         # Sidebar navigation buttons (kept so we can show/hide)
@@ -145,6 +153,8 @@ class MainWindow:
             self.ToplevelStatus.set(f"Logged in as {s.username} ({s.role}) | Currency: {s.currency}")
 
     def logout(self):
+        if self.state.session is not None:
+            store_app_service.ui_logout(self.state.session.token)
         self.state.set_guest()
         self._refresh_ui_for_state()
         self.set_status("Logged out")
@@ -160,16 +170,16 @@ class MainWindow:
         # Access control
         if view_key in ("cart", "orders") and not self.state.is_logged_in:
             self.set_status("Please login first")
-            self.views["login"].tkraise()
+            self._raise("login")
             return
 
         # Admin rule: in your project, ADMIN is mostly for management; orders are customer feature
         if view_key == "orders" and self.state.role == "ADMIN":
             self.set_status("Orders are available for customers")
-            self.views["catalog"].tkraise()
+            self._raise("catalog")
             return
 
-        view.tkraise()
+        self._raise(view_key)
 
         # Auto refresh if the view supports it
         if hasattr(view, "on_show"):
@@ -178,6 +188,20 @@ class MainWindow:
             except Exception:
                 pass
 
+    def _raise(self, view_key: str):
+        # Leaving a view drops its pending background loads
+        previous = self.views.get(self.current_view) if self.current_view else None
+        if previous is not None and self.current_view != view_key and hasattr(previous, "on_hide"):
+            previous.on_hide()
+
+        self.current_view = view_key
+        self.views[view_key].tkraise()
+
+    def _on_close(self):
+        ui_tasks.shutdown()
+        image_pipeline.shutdown()
+        self.root.destroy()
+
     def set_status(self, text: str):
         # Keep a short UI-friendly status bar message
         if text:
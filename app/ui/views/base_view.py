@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk
-from typing import Callable
+from typing import Any, Callable, Optional, Set
+
+from app.ui.async_runner import ui_tasks
 
 
 class BaseView(ttk.Frame):
@@ -26,5 +28,80 @@ class BaseView(ttk.Frame):
         if subtitle:
             ttk.Label(header, text=subtitle, style="Muted.TLabel").pack(anchor="w")
 
+        # Shown while background work of this view is running
+        self.loading_label = ttk.Label(header, text="", style="Muted.TLabel")
+        self.loading_label.pack(anchor="w")
+
         self.content = ttk.Frame(self)
         self.content.pack(fill="both", expand=True)
+
+        self._busy: Set[str] = set()
+
+    # ---------- Background loading ----------
+
+    def _task_key(self, name: str):
+        return (id(self), name)
+
+    @property
+    def is_loading(self) -> bool:
+        return bool(self._busy)
+
+    def set_loading(self, name: str, busy: bool, text: str = "Loading…") -> None:
+        if busy:
+            self._busy.add(name)
+        else:
+            self._busy.discard(name)
+
+        self.loading_label.config(text=text if self._busy else "")
+        self.configure(cursor="watch" if self._busy else "")
+
+    def run_async(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        *args,
+        on_done: Callable[[Any], None],
+        loading_text: str = "Loading…",
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Runs a blocking call (store_app_service.ui_*) off the Tk thread and calls
+        on_done(result) back on it. A new call with the same name replaces the
+        pending one; its result is then ignored.
+        """
+        self.set_loading(name, True, loading_text)
+        ui_tasks.submit(
+            self._task_key(name),
+            fn,
+            *args,
+            on_done=on_done,
+            on_error=on_error or self._on_async_error,
+            on_settled=lambda: self._settle(name),
+            widget=self,
+            **kwargs,
+        )
+
+    def _settle(self, name: str) -> None:
+        # Only clear the indicator if no newer task took over the same name
+        if not ui_tasks.is_pending(self._task_key(name)):
+            self.set_loading(name, False)
+
+    def cancel_async(self, name: Optional[str] = None) -> None:
+        """
+        Drops pending work of this view (one task, or all of them when name is None).
+        """
+        if name is not None:
+            ui_tasks.cancel(self._task_key(name))
+            return
+        view_id = id(self)
+        ui_tasks.cancel_matching(lambda key: isinstance(key, tuple) and key[0] == view_id)
+
+    def _on_async_error(self, exc: BaseException) -> None:
+        self.set_status(f"Unexpected error: {exc}")
+
+    def on_hide(self) -> None:
+        """
+        Called when the user navigates away: results nobody will see are dropped.
+        """
+        self.cancel_async()
@@ -64,12 +64,23 @@ class CartView(BaseView):
             self.total_var.config(text="Total: 0.00 EUR")
             return
 
-        user_id = self.state.session.user_id
-        result = store_app_service.ui_get_cart(user_id, display_currency="EUR")
+        token = self.state.session.token
+        self.run_async(
+            "cart",
+            store_app_service.ui_session_get_cart,
+            token,
+            display_currency="EUR",
+            on_done=self._render_cart,
+        )
+
+    def _render_cart(self, result):
         if not result.ok:
             self.set_status(result.error.message)
             return
 
+        for i in self.tree.get_children():
+            self.tree.delete(i)
+
         cart = result.data or {}
         items = cart.get("items", [])
         total = cart.get("total", {"amount": 0, "currency": "EUR"})
@@ -96,8 +107,8 @@ class CartView(BaseView):
             self.set_status("Please login first")
             return
 
-        user_id = self.state.session.user_id
-        result = store_app_service.ui_checkout(user_id)
+        token = self.state.session.token
+        result = store_app_service.ui_session_checkout(token)
         if not result.ok:
             self.set_status(result.error.message)
             return
@@ -127,8 +138,8 @@ class CartView(BaseView):
             self.set_status("Could not read selected item")
             return
 
-        user_id = self.state.session.user_id
-        result = store_app_service.ui_remove_from_cart(user_id, item_id)
+        token = self.state.session.token
+        result = store_app_service.ui_session_remove_from_cart(token, item_id)
         if not result.ok:
             self.set_status(result.error.message)
             return
@@ -1,11 +1,27 @@
 from __future__ import annotations
 
+import tkinter as tk
 from tkinter import ttk, messagebox
 
 from app.ui.views.base_view import BaseView
 from app.ui.service_provider import store_app_service
 
 
+PAGE_SIZE = 100
+LOAD_MORE_AT = 0.9  # scroll position (0..1) that triggers loading the next page
+SEARCH_LIMIT = 100
+SEARCH_DELAY_MS = 300  # debounce while typing in the search box
+
+# (label, sort, descending)
+SORT_OPTIONS = [
+    ("ID", "id", False),
+    ("Name (A-Z)", "name", False),
+    ("Name (Z-A)", "name", True),
+    ("Price (low-high)", "price", False),
+    ("Price (high-low)", "price", True),
+]
+
+
 class CatalogView(BaseView):
     def __init__(self, parent, *, on_navigate, set_status, state):
         super().__init__(
@@ -26,44 +42,184 @@ class CatalogView(BaseView):
         ttk.Button(top, text="Go to Cart", command=lambda: self.on_navigate("cart")).pack(side="left", padx=8)
         ttk.Button(top, text="Add to Favorites", command=self.add_selected_to_favorites).pack(side="left", padx=8)
 
-        self.tree = ttk.Treeview(self.content, columns=("name", "price"), show="headings", height=14)
+        ttk.Label(top, text="Sort:").pack(side="left", padx=(16, 4))
+        self.sort_var = tk.StringVar(value=SORT_OPTIONS[0][0])
+        sort_box = ttk.Combobox(
+            top,
+            textvariable=self.sort_var,
+            values=[label for label, _sort, _desc in SORT_OPTIONS],
+            state="readonly",
+            width=18,
+        )
+        sort_box.pack(side="left")
+        sort_box.bind("<<ComboboxSelected>>", lambda _e: self.refresh())
+
+        # Search row: typing switches the list to ranked full-text results
+        search_row = ttk.Frame(self.content)
+        search_row.pack(anchor="nw", fill="x", pady=(8, 0))
+
+        ttk.Label(search_row, text="Search:").pack(side="left")
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_row, textvariable=self.search_var, width=40)
+        search_entry.pack(side="left", padx=(4, 8))
+        search_entry.bind("<KeyRelease>", self._on_search_typed)
+        search_entry.bind("<Return>", lambda _e: self.run_search())
+        ttk.Button(search_row, text="Clear", command=self.clear_search).pack(side="left")
+
+        table = ttk.Frame(self.content)
+        table.pack(fill="both", expand=True, pady=10)
+
+        self.tree = ttk.Treeview(table, columns=("name", "price", "match"), show="headings", height=14)
         self.tree.heading("name", text="Item")
         self.tree.heading("price", text="Price (EUR)")
-        self.tree.column("name", width=520, stretch=True)
+        self.tree.heading("match", text="Match")
+        self.tree.column("name", width=320, stretch=True)
         self.tree.column("price", width=120, stretch=False, anchor="e")
-        self.tree.pack(fill="both", expand=True, pady=10)
+        self.tree.column("match", width=360, stretch=True)
+
+        scrollbar = ttk.Scrollbar(table, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=lambda first, last: self._on_scroll(scrollbar, first, last))
+        scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
 
         self.tree.bind("<Double-1>", lambda _e: self.open_details())
 
+        # paging state
+        self._next_cursor = None
+
+        # search state
+        self._search_job = None
+
         self.refresh()
 
     def on_show(self):
         # optional: keep it fresh
         self.refresh()
 
-    def refresh(self):
+    def _current_sort(self):
+        label = self.sort_var.get()
+        for option_label, sort, descending in SORT_OPTIONS:
+            if option_label == label:
+                return sort, descending
+        return "id", False
+
+    def _on_scroll(self, scrollbar, first, last):
+        scrollbar.set(first, last)
+        # Lazy paging: fetch the next page when the user gets close to the end
+        if float(last) >= LOAD_MORE_AT and self._next_cursor and not self.is_loading:
+            self.after_idle(self._load_next_page)
+
+    def _clear_rows(self):
         for i in self.tree.get_children():
             self.tree.delete(i)
         self.items_index.clear()
+        self._next_cursor = None
+
+    def refresh(self):
+        if self.search_var.get().strip():
+            self.run_search()
+            return
 
-        result = store_app_service.ui_list_items()
+        self._clear_rows()
+        self._load_page(cursor=None)
+
+    # ---------- Search ----------
+
+    def _on_search_typed(self, event):
+        if event.keysym == "Return":
+            return
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY_MS, self.run_search)
+
+    def clear_search(self):
+        self.search_var.set("")
+        self.refresh()
+
+    def run_search(self):
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+            self._search_job = None
+
+        text = self.search_var.get().strip()
+        if not text:
+            self.refresh()
+            return
+
+        self.run_async(
+            "rows",
+            store_app_service.ui_search_items,
+            text,
+            limit=SEARCH_LIMIT,
+            loading_text="Searching…",
+            on_done=lambda result: self._render_search(text, result),
+        )
+
+    def _render_search(self, text, result):
         if not result.ok:
             self.set_status(result.error.message)
             return
 
-        items = result.data or []
-        if not items:
+        # Search results are one ranked list: no paging
+        self._clear_rows()
+        items = (result.data or {}).get("items", [])
+        for it in items:
+            item_id = int(it["id"])
+            self.items_index[item_id] = it
+            self.tree.insert(
+                "", "end", iid=str(item_id),
+                values=(it["name"], f'{it["price"]:.2f}', it.get("snippet", "")),
+            )
+
+        self.set_status(f'{len(items)} result(s) for "{text}"' if items else f'No items match "{text}"')
+
+    # ---------- Paging ----------
+
+    def _load_next_page(self):
+        if self._next_cursor and not self.is_loading:
+            self._load_page(cursor=self._next_cursor)
+
+    def _load_page(self, cursor):
+        sort, descending = self._current_sort()
+
+        # Same slot as search: whichever request is newest wins
+        self.run_async(
+            "rows",
+            store_app_service.ui_list_items_page,
+            limit=PAGE_SIZE,
+            cursor=cursor,
+            sort=sort,
+            descending=descending,
+            loading_text="Loading items…",
+            on_done=lambda result: self._render_page(cursor, result),
+        )
+
+    def _render_page(self, cursor, result):
+        if not result.ok:
+            self.set_status(result.error.message)
+            return
+
+        page = result.data or {}
+        items = page.get("items", [])
+        self._next_cursor = page.get("next_cursor")
+
+        if not items and cursor is None:
             self.set_status("Catalog is empty")
             return
 
         # DTO: {id, name, price, currency}
         for it in items:
             item_id = int(it["id"])
+            # With name/price sorting a row edited between page loads can show up
+            # again on a later keyset page: keep the first one (iids must be unique)
+            if item_id in self.items_index:
+                continue
             self.items_index[item_id] = it
             # use iid = item_id for easy selection
-            self.tree.insert("", "end", iid=str(item_id), values=(it["name"], f'{it["price"]:.2f}'))
+            self.tree.insert("", "end", iid=str(item_id), values=(it["name"], f'{it["price"]:.2f}', ""))
 
-        self.set_status(f"Loaded {len(items)} items")
+        more = " (scroll for more)" if self._next_cursor else ""
+        self.set_status(f"Loaded {len(self.items_index)} items{more}")
 
     def _selected_item_id(self):
         sel = self.tree.selection()
@@ -94,8 +250,8 @@ class CatalogView(BaseView):
             messagebox.showinfo("Login required", "Please login to add items to cart.")
             return
 
-        user_id = self.state.session.user_id
-        result = store_app_service.ui_add_to_cart(user_id, item_id=item_id, quantity=1)
+        token = self.state.session.token
+        result = store_app_service.ui_session_add_to_cart(token, item_id=item_id, quantity=1)
         if not result.ok:
             self.set_status(result.error.message)
             return
@@ -114,8 +270,8 @@ class CatalogView(BaseView):
             messagebox.showinfo("Login required", "Please login as customer to use favorites.")
             return
 
-        user_id = self.state.session.user_id
-        result = store_app_service.ui_add_favorite(user_id, item_id)
+        token = self.state.session.token
+        result = store_app_service.ui_session_add_favorite(token, item_id)
         if not result.ok:
             self.set_status(result.error.message)
             return
@@ -55,8 +55,8 @@ class FavoritesView(BaseView):
             self.set_status("Favorites are available for customers")
             return
 
-        user_id = self.state.session.user_id
-        result = store_app_service.ui_list_favorites(user_id)
+        token = self.state.session.token
+        result = store_app_service.ui_session_list_favorites(token)
         if not result.ok:
             self.set_status(result.error.message)
             return
@@ -85,8 +85,8 @@ class FavoritesView(BaseView):
             self.set_status("Select an item first")
             return
 
-        user_id = self.state.session.user_id
-        result = store_app_service.ui_remove_favorite(user_id, item_id)
+        token = self.state.session.token
+        result = store_app_service.ui_session_remove_favorite(token, item_id)
         if not result.ok:
             self.set_status(result.error.message)
             return
@@ -57,8 +57,8 @@ class HistoryView(BaseView):
             self.set_status("History is available for customers")
             return
 
-        user_id = self.state.session.user_id
-        result = store_app_service.ui_list_history(user_id, limit=50)
+        token = self.state.session.token
+        result = store_app_service.ui_session_list_history(token, limit=50)
         if not result.ok:
             self.set_status(result.error.message)
             return
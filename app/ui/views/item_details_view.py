@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-import os
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
+from PIL import ImageTk
 
+from app.ui.image_cache import image_pipeline
 from app.ui.views.base_view import BaseView
 from app.ui.service_provider import store_app_service
 
 
+FRAME_SIZE = (420, 320)  # carousel frame (letterboxed, black bars)
+
+
 class ItemDetailsView(BaseView):
     def __init__(self, parent, *, on_navigate, set_status, state):
         super().__init__(
@@ -111,17 +114,28 @@ class ItemDetailsView(BaseView):
             self.set_status("No item selected")
             return
 
+        # Record view (History) - only for logged-in customers
+        viewer_token = None
+        if self.state.is_logged_in and self.state.role == "CUSTOMER":
+            viewer_token = self.state.session.token
+
+        self.run_async("item", self._fetch_item, item_id, viewer_token, on_done=self._render_item)
+
+    @staticmethod
+    def _fetch_item(item_id: int, viewer_token):
+        # Runs on a worker thread: service calls only, no widgets
         result = store_app_service.ui_item_details(item_id)
+        if result.ok and viewer_token is not None:
+            store_app_service.ui_session_record_view(viewer_token, int(result.data["id"]))
+        return result
+
+    def _render_item(self, result):
         if not result.ok:
             self.set_status(result.error.message)
             return
 
         self.item = result.data
 
-        # Record view (History) - only for logged-in customers
-        if self.state.is_logged_in and self.state.role == "CUSTOMER":
-            store_app_service.ui_record_view(self.state.session.user_id, int(self.item["id"]))
-
         # Header + description
         self.header.config(text=f'{self.item["name"]}  (ID: {self.item["id"]})')
         self.desc.config(text=self.item.get("description") or "")
@@ -186,77 +200,35 @@ class ItemDetailsView(BaseView):
         self._load_image(path)
         self._update_carousel_controls()
 
-    def _load_image(self, path: str, frame_size=(420, 320), bg_color=(0, 0, 0)):
+        # Warm the neighbours so the next arrow click is a cache hit
+        n = len(self._pictures)
+        if n > 1:
+            neighbours = {self._pictures[(self._pic_index + 1) % n], self._pictures[(self._pic_index - 1) % n]}
+            image_pipeline.prefetch(neighbours, FRAME_SIZE)
+
+    def _load_image(self, path: str):
         """
-        Loads image into a fixed-size frame (letterbox).
-        - Keeps arrows perfectly aligned.
-        - Adds black bars where needed.
+        Shows a picture letterboxed into the fixed FRAME_SIZE (arrows never move).
+        Cached frames are shown at once; others are rendered off the Tk thread.
         """
-        # Clear previous image
-        self._tk_image = None
-        self.image_label.config(image="", text="")
-
-        if not path:
-            # Render an empty black frame (optional) or just "No image"
-            frame = Image.new("RGB", frame_size, bg_color)
-            self._tk_image = ImageTk.PhotoImage(frame)
-            self.image_label.config(image=self._tk_image, text="")
+        frame = image_pipeline.peek(path, FRAME_SIZE)
+        if frame is not None:
+            self.cancel_async("picture")
+            self._set_frame(frame)
             return
 
-        # Resolve DB relative path -> absolute path based on project root (OmniStore/)
-        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
-        abs_path = os.path.normpath(os.path.join(project_root, path))
-
-        # If missing, still show fixed black frame (no layout shifts)
-        if not os.path.exists(abs_path):
-            frame = Image.new("RGB", frame_size, bg_color)
-            self._tk_image = ImageTk.PhotoImage(frame)
-            self.image_label.config(image=self._tk_image, text="")
-            return
+        self.run_async(
+            "picture",
+            image_pipeline.get,
+            path,
+            FRAME_SIZE,
+            loading_text="Loading picture…",
+            on_done=self._set_frame,
+        )
 
-        try:
-            img = Image.open(abs_path)
-
-            # Convert to RGB to avoid issues with palette/alpha in some PNGs
-            # (If you want to preserve transparency, we can do RGBA; but black bars are fine with RGB.)
-            if img.mode not in ("RGB", "RGBA"):
-                img = img.convert("RGB")
-
-            # Fit inside frame while keeping aspect ratio
-            fw, fh = frame_size
-            iw, ih = img.size
-
-            # Compute scale
-            scale = min(fw / iw, fh / ih)
-            new_w = max(1, int(iw * scale))
-            new_h = max(1, int(ih * scale))
-
-            resized = img.resize((new_w, new_h), Image.LANCZOS)
-
-            # Create background frame and paste centered
-            frame = Image.new("RGB", (fw, fh), bg_color)
-
-            # If resized has alpha, paste using alpha as mask
-            if resized.mode == "RGBA":
-                # Put RGBA over black -> still looks correct
-                tmp = Image.new("RGBA", (fw, fh), bg_color + (255,))
-                x = (fw - new_w) // 2
-                y = (fh - new_h) // 2
-                tmp.paste(resized, (x, y), resized)
-                frame = tmp.convert("RGB")
-            else:
-                x = (fw - new_w) // 2
-                y = (fh - new_h) // 2
-                frame.paste(resized, (x, y))
-
-            self._tk_image = ImageTk.PhotoImage(frame)
-            self.image_label.config(image=self._tk_image, text="")
-
-        except Exception as e:
-            # On error, show fixed black frame (no layout shifts)
-            frame = Image.new("RGB", frame_size, bg_color)
-            self._tk_image = ImageTk.PhotoImage(frame)
-            self.image_label.config(image=self._tk_image, text="")
+    def _set_frame(self, frame):
+        self._tk_image = ImageTk.PhotoImage(frame)  # keep reference
+        self.image_label.config(image=self._tk_image, text="")
 
     # ---------------- Actions ----------------
 
@@ -280,8 +252,8 @@ class ItemDetailsView(BaseView):
             self.set_status("Quantity must be positive")
             return
 
-        user_id = self.state.session.user_id
-        result = store_app_service.ui_add_to_cart(user_id, item_id=int(self.item["id"]), quantity=q)
+        token = self.state.session.token
+        result = store_app_service.ui_session_add_to_cart(token, item_id=int(self.item["id"]), quantity=q)
         if not result.ok:
             self.set_status(result.error.message)
             return
@@ -297,9 +269,9 @@ class ItemDetailsView(BaseView):
             self.set_status("No item loaded")
             return
 
-        user_id = self.state.session.user_id
+        token = self.state.session.token
         item_id = int(self.item["id"])
-        result = store_app_service.ui_add_favorite(user_id, item_id)
+        result = store_app_service.ui_session_add_favorite(token, item_id)
         if not result.ok:
             self.set_status(result.error.message)
             return
@@ -315,9 +287,9 @@ class ItemDetailsView(BaseView):
             self.set_status("No item loaded")
             return
 
-        user_id = self.state.session.user_id
+        token = self.state.session.token
         item_id = int(self.item["id"])
-        result = store_app_service.ui_remove_favorite(user_id, item_id)
+        result = store_app_service.ui_session_remove_favorite(token, item_id)
         if not result.ok:
             self.set_status(result.error.message)
             return
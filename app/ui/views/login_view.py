@@ -31,7 +31,8 @@ class LoginView(BaseView):
         btns = ttk.Frame(self.content)
         btns.pack(anchor="nw", pady=10)
 
-        ttk.Button(btns, text="Login", command=self._login).pack(side="left")
+        self.login_btn = ttk.Button(btns, text="Login", command=self._login)
+        self.login_btn.pack(side="left")
         ttk.Button(btns, text="Go to Register", command=lambda: self.on_navigate("register")).pack(side="left", padx=8)
 
     def _login(self):
@@ -42,13 +43,36 @@ class LoginView(BaseView):
             self.set_status("Please enter email and password")
             return
 
-        result = store_app_service.ui_login(email, password)
+        # Password hashing is slow on purpose: keep it off the Tk thread
+        self.login_btn.state(["disabled"])
+        self.run_async(
+            "login",
+            store_app_service.ui_login_session,
+            email,
+            password,
+            loading_text="Signing in…",
+            on_done=self._on_login_result,
+        )
+
+    def set_loading(self, name, busy, text="Loading…"):
+        super().set_loading(name, busy, text)
+        if not self.is_loading:
+            self.login_btn.state(["!disabled"])
+
+    def _on_login_result(self, result):
         if not result.ok:
             self.set_status(result.error.message)
             return
 
-        user = result.data
-        self.state.set_session(user_id=user.id, username=user.username, email=user.email, role=user.role, currency="EUR")
+        s = result.data
+        self.state.set_session(
+            user_id=s["user_id"],
+            username=s["username"],
+            email=s["email"],
+            role=s["role"],
+            currency=s["currency"],
+            token=s["token"],
+        )
         self.on_state_changed()
         self.set_status("Logged in successfully")
         self.on_navigate("catalog")
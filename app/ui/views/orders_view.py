@@ -6,6 +6,9 @@ from app.ui.views.base_view import BaseView
 from app.ui.service_provider import store_app_service
 
 
+PAGE_SIZE = 20
+
+
 class OrdersView(BaseView):
     def __init__(self, parent, *, on_navigate, set_status, state):
         super().__init__(
@@ -15,28 +18,44 @@ class OrdersView(BaseView):
             title="Orders",
         )
         self.state = state
+        self._next_cursor = None  # keyset cursor of the next page (None = no more pages)
 
         top = ttk.Frame(self.content)
         top.pack(anchor="nw", fill="x")
 
         ttk.Button(top, text="Refresh", command=self.refresh).pack(side="left")
         ttk.Button(top, text="Back to Catalog", command=lambda: self.on_navigate("catalog")).pack(side="left", padx=8)
+        self.more_btn = ttk.Button(top, text="Load more", command=self.load_more)
+        self.more_btn.pack(side="left", padx=8)
 
-        self.tree = ttk.Treeview(self.content, columns=("id", "status", "total"), show="headings", height=12)
-        self.tree.heading("id", text="Order ID")
-        self.tree.heading("status", text="Status")
+        # Orders are parent rows; their items are child rows (expand an order to see them)
+        self.tree = ttk.Treeview(self.content, columns=("id", "status", "total"), show="tree headings", height=12)
+        self.tree.heading("#0", text="")
+        self.tree.heading("id", text="Order ID / Item")
+        self.tree.heading("status", text="Status / Qty")
         self.tree.heading("total", text="Total (EUR)")
-        self.tree.column("id", width=90, stretch=False, anchor="center")
+        self.tree.column("#0", width=30, stretch=False)
+        self.tree.column("id", width=260, stretch=True)
         self.tree.column("status", width=140, stretch=False)
         self.tree.column("total", width=140, stretch=False, anchor="e")
         self.tree.pack(fill="both", expand=True, pady=10)
 
+        self._update_more_button()
+
     def on_show(self):
         self.refresh()
 
+    def _update_more_button(self):
+        if self._next_cursor:
+            self.more_btn.state(["!disabled"])
+        else:
+            self.more_btn.state(["disabled"])
+
     def refresh(self):
         for i in self.tree.get_children():
             self.tree.delete(i)
+        self._next_cursor = None
+        self._update_more_button()
 
         if not self.state.is_logged_in:
             self.set_status("Please login first")
@@ -46,19 +65,33 @@ class OrdersView(BaseView):
             self.set_status("Orders are available for customers")
             return
 
-        user_id = self.state.session.user_id
-        result = store_app_service.ui_list_orders(user_id, limit=50)
+        self._load_page(cursor=None)
+
+    def load_more(self):
+        if not self._next_cursor or not self.state.is_logged_in:
+            return
+        self._load_page(cursor=self._next_cursor)
+
+    def _load_page(self, cursor):
+        token = self.state.session.token
+        result = store_app_service.ui_session_list_orders_with_items(token, limit=PAGE_SIZE, cursor=cursor)
         if not result.ok:
             self.set_status(result.error.message)
             return
 
-        orders = result.data or []
-        if not orders:
+        page = result.data or {}
+        orders = page.get("orders", [])
+        self._next_cursor = page.get("next_cursor")
+        self._update_more_button()
+
+        if not orders and cursor is None:
             self.set_status("No orders yet")
             return
 
-        # DTO from ui_list_orders: order_id, created_at, status, total, currency
+        # DTO from ui_list_orders_with_items: order_id, created_at, status, total, currency, items[]
         for o in orders:
-            self.tree.insert("", "end", values=(o["order_id"], o["status"], f'{o["total"]:.2f}'))
+            parent = self.tree.insert("", "end", values=(o["order_id"], o["status"], f'{o["total"]:.2f}'))
+            for it in o["items"]:
+                self.tree.insert(parent, "end", values=(it["name"], f'× {it["quantity"]}', f'{it["subtotal"]:.2f}'))
 
-        self.set_status("Orders loaded")
+        self.set_status(f"Orders loaded ({len(self.tree.get_children())})")
@@ -37,7 +37,8 @@ class RegisterView(BaseView):
         btns = ttk.Frame(self.content)
         btns.pack(anchor="nw", pady=10)
 
-        ttk.Button(btns, text="Register", command=self._register).pack(side="left")
+        self.register_btn = ttk.Button(btns, text="Register", command=self._register)
+        self.register_btn.pack(side="left")
         ttk.Button(btns, text="Go to Login", command=lambda: self.on_navigate("login")).pack(side="left", padx=8)
 
     def _register(self):
@@ -50,19 +51,40 @@ class RegisterView(BaseView):
             self.set_status("Please fill all fields")
             return
 
-        result = store_app_service.ui_register_customer(
-            username=username,
-            email=email,
-            name=name,
-            password=password,
-            currency="EUR",
+        # Password hashing is slow on purpose: keep it off the Tk thread
+        self.register_btn.state(["disabled"])
+        self.run_async(
+            "register",
+            store_app_service.ui_register_customer_session,
+            # positional: run_async's own first parameter is called "name"
+            username,
+            email,
+            name,
+            password,
+            "EUR",
+            loading_text="Creating account…",
+            on_done=self._on_register_result,
         )
+
+    def set_loading(self, name, busy, text="Loading…"):
+        super().set_loading(name, busy, text)
+        if not self.is_loading:
+            self.register_btn.state(["!disabled"])
+
+    def _on_register_result(self, result):
         if not result.ok:
             self.set_status(result.error.message)
             return
 
-        user = result.data
-        self.state.set_session(user_id=user.id, username=user.username, email=user.email, role=user.role, currency="EUR")
+        s = result.data
+        self.state.set_session(
+            user_id=s["user_id"],
+            username=s["username"],
+            email=s["email"],
+            role=s["role"],
+            currency=s["currency"],
+            token=s["token"],
+        )
         self.on_state_changed()
         self.set_status("Registered and logged in")
         self.on_navigate("catalog")
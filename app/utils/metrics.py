@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import json
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+
+# Upper bounds (ms) of the latency buckets; one extra overflow bucket catches the rest
+DEFAULT_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class LatencyHistogram:
+    """
+    Thread-safe fixed-bucket latency histogram (constant memory, however many samples).
+
+    - observe(ms) records one sample.
+    - percentile(p) is estimated by linear interpolation inside the bucket holding it
+      (clamped to the exact min/max seen), good enough for p50/p95/p99 dashboards.
+    """
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        bounds = sorted(float(b) for b in buckets_ms)
+        if not bounds:
+            raise ValueError("At least one bucket bound is required")
+        self.bounds: List[float] = bounds
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts: List[int] = [0] * (len(self.bounds) + 1)
+            self.count = 0
+            self.sum_ms = 0.0
+            self.min_ms: Optional[float] = None
+            self.max_ms: Optional[float] = None
+            self.last_ms: Optional[float] = None
+
+    def observe(self, ms: float) -> None:
+        ms = max(0.0, float(ms))
+        with self._lock:
+            self.counts[bisect_left(self.bounds, ms)] += 1
+            self.count += 1
+            self.sum_ms += ms
+            self.last_ms = ms
+            self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+            self.max_ms = ms if self.max_ms is None else max(self.max_ms, ms)
+
+    @property
+    def mean_ms(self) -> Optional[float]:
+        return (self.sum_ms / self.count) if self.count else None
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1.0, pct / 100.0 * self.count)
+            seen = 0
+            for i, n in enumerate(self.counts):
+                if n and seen + n >= rank:
+                    lower = self.bounds[i - 1] if i > 0 else 0.0
+                    upper = self.bounds[i] if i < len(self.bounds) else self.max_ms
+                    value = lower + (upper - lower) * ((rank - seen) / n)
+                    return min(max(value, self.min_ms), self.max_ms)
+                seen += n
+            return self.max_ms
+
+    def buckets(self) -> Dict[str, int]:
+        """
+        Cumulative counts per upper bound ("le" as in Prometheus), "+Inf" last.
+        """
+        with self._lock:
+            out: Dict[str, int] = {}
+            running = 0
+            for bound, n in zip(self.bounds, self.counts):
+                running += n
+                out[f"{bound:g}"] = running
+            out["+Inf"] = running + self.counts[-1]
+            return out
+
+    def as_dict(self) -> Dict:
+        def r(v: Optional[float]) -> Optional[float]:
+            return round(v, 3) if v is not None else None
+
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "mean_ms": r(self.mean_ms),
+            "min_ms": r(self.min_ms),
+            "max_ms": r(self.max_ms),
+            "last_ms": r(self.last_ms),
+            "p50_ms": r(self.percentile(50)),
+            "p95_ms": r(self.percentile(95)),
+            "p99_ms": r(self.percentile(99)),
+            "buckets": self.buckets(),
+        }
+
+
+class OperationStats:
+    """
+    Totals for one named operation: latency histogram, calls/errors and the database
+    work per call (statements, connections, rows). max_statements exposes N+1 paths.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latency = LatencyHistogram()
+        self.calls = 0
+        self.errors = 0
+        self.statements = 0
+        self.connections = 0
+        self.rows = 0
+        self.max_statements = 0
+        self.last_statements = 0
+
+    def as_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "statements": self.statements,
+            "connections": self.connections,
+            "rows": self.rows,
+            "statements_per_call": round(self.statements / self.calls, 2) if self.calls else None,
+            "max_statements": self.max_statements,
+            "last_statements": self.last_statements,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class MetricsRegistry:
+    """
+    In-process registry of OperationStats, dumped as JSON (as_dict / dump("x.json"))
+    or Prometheus text exposition format (prometheus_text / dump("x.prom")).
+    """
+
+    def __init__(self, namespace: str = "omnistore"):
+        self.namespace = namespace
+        self._ops: Dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def operation(self, name: str) -> OperationStats:
+        stats = self._ops.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._ops.setdefault(name, OperationStats(name))
+        return stats
+
+    def record(
+        self,
+        name: str,
+        elapsed_ms: float,
+        ok: bool = True,
+        statements: int = 0,
+        connections: int = 0,
+        rows: int = 0,
+    ) -> None:
+        stats = self.operation(name)
+        stats.latency.observe(elapsed_ms)
+        with self._lock:
+            stats.calls += 1
+            if not ok:
+                stats.errors += 1
+            stats.statements += statements
+            stats.connections += connections
+            stats.rows += rows
+            stats.max_statements = max(stats.max_statements, statements)
+            stats.last_statements = statements
+
+    def reset(self) -> None:
+        with self._lock:
+            self._ops.clear()
+
+    def as_dict(self) -> Dict[str, Dict]:
+        with self._lock:
+            ops = sorted(self._ops.items())
+        return {name: stats.as_dict() for name, stats in ops}
+
+    def prometheus_text(self) -> str:
+        ns = self.namespace
+        with self._lock:
+            ops = sorted(self._ops.items())
+
+        lines: List[str] = [
+            f"# HELP {ns}_operation_duration_ms Wall time of facade operations.",
+            f"# TYPE {ns}_operation_duration_ms histogram",
+        ]
+        for name, stats in ops:
+            for le, count in stats.latency.buckets().items():
+                lines.append(f'{ns}_operation_duration_ms_bucket{{operation="{name}",le="{le}"}} {count}')
+            lines.append(f'{ns}_operation_duration_ms_sum{{operation="{name}"}} {stats.latency.sum_ms:.3f}')
+            lines.append(f'{ns}_operation_duration_ms_count{{operation="{name}"}} {stats.latency.count}')
+
+        counters = (
+            ("calls", "Facade operation calls.", "calls"),
+            ("errors", "Facade operation calls that returned an error.", "errors"),
+            ("sql_statements", "SQL statements executed by facade operations.", "statements"),
+            ("db_connections", "Database connections checked out by facade operations.", "connections"),
+            ("rows_fetched", "Rows fetched by facade operations.", "rows"),
+        )
+        for metric, help_text, attr in counters:
+            lines.append(f"# HELP {ns}_operation_{metric}_total {help_text}")
+            lines.append(f"# TYPE {ns}_operation_{metric}_total counter")
+            for name, stats in ops:
+                lines.append(f'{ns}_operation_{metric}_total{{operation="{name}"}} {getattr(stats, attr)}')
+
+        lines.append(f"# HELP {ns}_operation_sql_statements_max Most SQL statements seen in one call.")
+        lines.append(f"# TYPE {ns}_operation_sql_statements_max gauge")
+        for name, stats in ops:
+            lines.append(f'{ns}_operation_sql_statements_max{{operation="{name}"}} {stats.max_statements}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path) -> Path:
+        """
+        Writes Prometheus text for *.prom / *.txt, JSON otherwise.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix in (".prom", ".txt"):
+            path.write_text(self.prometheus_text(), encoding="utf-8")
+        else:
+            path.write_text(json.dumps(self.as_dict(), indent=2), encoding="utf-8")
+        return path
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+
+class CrossRateMatrix:
+    """
+    Dense n x n table of cross rates built once from one set of quotes.
+
+    rate(from, to) = 1 unit of `from` in `to` = (SOURCE->to) / (SOURCE->from),
+    stored row-major in an array('d') (row = from, column = to), so a lookup is
+    two dict hits + one index instead of string building and a division.
+    Immutable after construction: safe to share between threads.
+    """
+
+    __slots__ = ("source", "currencies", "index", "_rates", "_n")
+
+    def __init__(self, source: str, quotes: Dict[str, float]):
+        source = source.upper()
+
+        # 1 SOURCE = X CCY (SOURCE itself is implicitly 1.0)
+        per_source: Dict[str, float] = {source: 1.0}
+        for key, value in quotes.items():
+            key = str(key).upper()
+            if len(key) == 6 and key.startswith(source) and float(value) > 0:
+                per_source[key[3:]] = float(value)
+
+        self.source = source
+        self.currencies: List[str] = sorted(per_source)
+        self.index: Dict[str, int] = {ccy: i for i, ccy in enumerate(self.currencies)}
+        self._n = n = len(self.currencies)
+
+        values = [per_source[ccy] for ccy in self.currencies]
+        rates = array("d", bytes(8 * n * n))
+        for i, from_value in enumerate(values):
+            row = i * n
+            for j, to_value in enumerate(values):
+                rates[row + j] = to_value / from_value
+        self._rates = rates
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __contains__(self, currency: str) -> bool:
+        return currency.upper() in self.index
+
+    def rate(self, from_currency: str, to_currency: str) -> Optional[float]:
+        """
+        Returns None if either currency is unknown.
+        """
+        i = self.index.get(from_currency.upper())
+        j = self.index.get(to_currency.upper())
+        if i is None or j is None:
+            return None
+        return self._rates[i * self._n + j]
+
+    def row(self, from_currency: str) -> Optional[Sequence[float]]:
+        """
+        All rates from one currency (ordered like self.currencies).
+        """
+        i = self.index.get(from_currency.upper())
+        if i is None:
+            return None
+        return self._rates[i * self._n:(i + 1) * self._n]
+
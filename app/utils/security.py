@@ -2,7 +2,12 @@ from __future__ import annotations
 
 import hashlib
 import hmac
+import os
 import secrets
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
 
 
 _ALGO = "sha256"
@@ -10,28 +15,165 @@ _ITERATIONS = 210_000  # добра стойност за PBKDF2 (можеш д
 _SALT_BYTES = 16
 _KEY_LEN = 32
 
+ALGORITHMS = ("pbkdf2_sha256", "scrypt")
 
-def hash_password(password: str) -> str:
-    if not password:
-        raise ValueError("Password cannot be empty")
+# hashlib.scrypt refuses to use more memory than maxmem (default 32 MiB)
+_SCRYPT_MAXMEM_MARGIN = 1024 * 1024
 
-    salt = secrets.token_bytes(_SALT_BYTES)
-    dk = hashlib.pbkdf2_hmac(_ALGO, password.encode("utf-8"), salt, _ITERATIONS, dklen=_KEY_LEN)
-    return f"pbkdf2_{_ALGO}${_ITERATIONS}${salt.hex()}${dk.hex()}"
+
+@dataclass(frozen=True)
+class HashPolicy:
+    """
+    How NEW password hashes are made. Stored hashes carry their own parameters,
+    so they keep verifying after the policy changes; needs_rehash() tells which ones to upgrade.
+
+    - pbkdf2_sha256: `iterations` rounds   -> pbkdf2_sha256$<iterations>$<salt>$<hash>
+    - scrypt: cost n (power of 2), r, p     -> scrypt$<n>:<r>:<p>$<salt>$<hash>
+    """
+
+    algorithm: str = "pbkdf2_sha256"
+    iterations: int = _ITERATIONS
+    scrypt_n: int = 2 ** 14
+    scrypt_r: int = 8
+    scrypt_p: int = 1
+    salt_bytes: int = _SALT_BYTES
+    key_len: int = _KEY_LEN
+
+    def __post_init__(self):
+        if self.algorithm not in ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm: {self.algorithm}")
+        if self.iterations <= 0:
+            raise ValueError("iterations must be positive")
+        if self.scrypt_n < 2 or self.scrypt_n & (self.scrypt_n - 1):
+            raise ValueError("scrypt_n must be a power of 2")
+
+    @property
+    def params(self) -> str:
+        if self.algorithm == "scrypt":
+            return f"{self.scrypt_n}:{self.scrypt_r}:{self.scrypt_p}"
+        return str(self.iterations)
+
+    def hash(self, password: str, salt: Optional[bytes] = None) -> str:
+        """
+        salt is random unless given (only for reproducible fixtures, never for real users).
+        """
+        if not password:
+            raise ValueError("Password cannot be empty")
+
+        salt = salt if salt is not None else secrets.token_bytes(self.salt_bytes)
+        dk = _derive(self.algorithm, self.params, password, salt, self.key_len)
+        return f"{self.algorithm}${self.params}${salt.hex()}${dk.hex()}"
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        """
+        True if stored_hash was made with another algorithm or other cost parameters.
+        """
+        try:
+            scheme, params, _salt_hex, hash_hex = stored_hash.split("$", 3)
+        except (AttributeError, ValueError):
+            return True
+        return scheme != self.algorithm or params != self.params or len(hash_hex) != 2 * self.key_len
+
+
+def _derive(scheme: str, params: str, password: str, salt: bytes, key_len: int) -> bytes:
+    if scheme == "scrypt":
+        n, r, p = (int(v) for v in params.split(":"))
+        maxmem = 128 * r * (n + p + 2) + _SCRYPT_MAXMEM_MARGIN
+        return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=key_len)
+    if scheme.startswith("pbkdf2_"):
+        algo = scheme.replace("pbkdf2_", "")
+        return hashlib.pbkdf2_hmac(algo, password.encode("utf-8"), salt, int(params), dklen=key_len)
+    raise ValueError(f"Unsupported hash scheme: {scheme}")
+
+
+def policy_from_env() -> HashPolicy:
+    """
+    OMNISTORE_HASH_ALGO = pbkdf2_sha256 | scrypt,
+    OMNISTORE_PBKDF2_ITERATIONS, OMNISTORE_SCRYPT_N / _R / _P.
+    """
+    return HashPolicy(
+        algorithm=os.getenv("OMNISTORE_HASH_ALGO", "pbkdf2_sha256"),
+        iterations=int(os.getenv("OMNISTORE_PBKDF2_ITERATIONS", str(_ITERATIONS))),
+        scrypt_n=int(os.getenv("OMNISTORE_SCRYPT_N", str(2 ** 14))),
+        scrypt_r=int(os.getenv("OMNISTORE_SCRYPT_R", "8")),
+        scrypt_p=int(os.getenv("OMNISTORE_SCRYPT_P", "1")),
+    )
+
+
+DEFAULT_POLICY = policy_from_env()
+
+
+def hash_password(password: str, policy: Optional[HashPolicy] = None) -> str:
+    return (policy or DEFAULT_POLICY).hash(password)
 
 
 def verify_password(password: str, stored_hash: str) -> bool:
     try:
-        scheme, iter_str, salt_hex, hash_hex = stored_hash.split("$", 3)
-        if not scheme.startswith("pbkdf2_"):
+        scheme, params, salt_hex, hash_hex = stored_hash.split("$", 3)
+        if scheme not in ALGORITHMS and not scheme.startswith("pbkdf2_"):
             return False
 
-        algo = scheme.replace("pbkdf2_", "")
-        iterations = int(iter_str)
         salt = bytes.fromhex(salt_hex)
         expected = bytes.fromhex(hash_hex)
 
-        dk = hashlib.pbkdf2_hmac(algo, password.encode("utf-8"), salt, iterations, dklen=len(expected))
+        dk = _derive(scheme, params, password, salt, len(expected))
         return hmac.compare_digest(dk, expected)
     except Exception:
         return False
+
+
+def needs_rehash(stored_hash: str, policy: Optional[HashPolicy] = None) -> bool:
+    return (policy or DEFAULT_POLICY).needs_rehash(stored_hash)
+
+
+# ---------- Off-thread hashing ----------
+
+HASH_WORKERS = int(os.getenv("OMNISTORE_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+HASH_POOL_KIND = os.getenv("OMNISTORE_HASH_POOL", "thread")  # thread | process
+
+
+class HashWorkerPool:
+    """
+    Bounded pool for password hashing/verification.
+
+    - Callers (UI worker threads, login bursts) queue up instead of all hashing at once:
+      at most `workers` hashes run concurrently, so a burst cannot take every core.
+    - kind="thread": hashlib releases the GIL while hashing, so threads run in parallel.
+      kind="process": same API, work runs in child processes (isolated from the app's GIL).
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS, kind: str = HASH_POOL_KIND):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unsupported hash pool kind: {kind}")
+        self.workers = max(1, workers)
+        self.kind = kind
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="omnistore-hash")
+            return self._executor
+
+    def submit_verify(self, password: str, stored_hash: str) -> "Future[bool]":
+        return self.executor.submit(verify_password, password, stored_hash)
+
+    def submit_hash(self, password: str, policy: Optional[HashPolicy] = None) -> "Future[str]":
+        return self.executor.submit(hash_password, password, policy or DEFAULT_POLICY)
+
+    def verify(self, password: str, stored_hash: str) -> bool:
+        return self.submit_verify(password, stored_hash).result()
+
+    def hash(self, password: str, policy: Optional[HashPolicy] = None) -> str:
+        return self.submit_hash(password, policy).result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
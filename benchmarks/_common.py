@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+from app.db import connection as db_connection
+from app.db.schema import init_db
+from app.db.synthetic_seed import SyntheticDataset, SyntheticSpec, seed_synthetic
+
+
+@contextmanager
+def temp_database() -> Iterator[Path]:
+    """
+    Points app.db.connection at a throw-away database file and initializes the schema.
+    The real data/omnistore.db is never touched by benchmarks.
+    """
+    old_path = db_connection.DB_PATH
+    with tempfile.TemporaryDirectory(prefix="omnistore-bench-") as tmp:
+        path = Path(tmp) / "bench.db"
+        db_connection.DB_PATH = path
+        try:
+            init_db()
+            yield path
+        finally:
+            db_connection.get_pool(path).close_idle()
+            db_connection.DB_PATH = old_path
+
+
+def seed_catalog(n_items: int, n_customers: int = 1, seed: int = 42) -> Dict[str, List[int]]:
+    """
+    Catalog-only synthetic seed (app.db.synthetic_seed): n_items items and n_customers
+    customers with an EMPTY cart each, no favorites/history/orders, same rows every run.
+    Returns {"items": [...], "customers": [...], "carts": [...]}.
+    """
+    spec = SyntheticSpec(
+        items=n_items,
+        categories=0,
+        customers=n_customers,
+        seed=seed,
+        prefix="bench",
+        cart_share=0.0,
+        favorites_mean=0.0,
+        history_mean=0.0,
+        orders_mean=0.0,
+    )
+    data = seed_synthetic(spec)
+    return {"items": data.items, "customers": data.customers, "carts": data.carts}
+
+
+def seed_dataset(spec: SyntheticSpec) -> SyntheticDataset:
+    """
+    Full synthetic dataset (carts, favorites, history, orders) in the current temp database.
+    """
+    return seed_synthetic(spec)
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 3) -> Dict[str, float]:
+    """
+    Runs fn `repeat` times and returns latency percentiles (ms) and throughput.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples: List[float] = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    elapsed = time.perf_counter() - started
+    return summarize(samples, elapsed)
+
+
+def summarize(samples: List[float], elapsed: float) -> Dict[str, float]:
+    """
+    Latency percentiles (ms) and throughput of one series of timed calls.
+    """
+    samples = sorted(samples)
+    return {
+        "runs": len(samples),
+        "p50_ms": round(percentile(samples, 50), 4),
+        "p95_ms": round(percentile(samples, 95), 4),
+        "p99_ms": round(percentile(samples, 99), 4),
+        "mean_ms": round(statistics.fmean(samples), 4) if samples else 0.0,
+        "ops_per_sec": round(len(samples) / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    k = max(0, min(len(sorted_samples) - 1, int(round(pct / 100.0 * (len(sorted_samples) - 1)))))
+    return sorted_samples[k]
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n=== {title} ===")
+    print(f"{'case':<32} {'p50 ms':>10} {'p95 ms':>10} {'ops/s':>12}")
+    for name, r in rows.items():
+        print(f"{name:<32} {r['p50_ms']:>10.4f} {r['p95_ms']:>10.4f} {r['ops_per_sec']:>12.1f}")
@@ -0,0 +1,235 @@
+"""
+Local stand-in for exchangerate.host /live (no quota, no network).
+
+    with StubRateServer(latency_s=0.3) as stub:
+        service = CurrencyService(live_url=stub.live_url)
+        stub.mode = "429"       # see STUB_MODES
+
+Standalone, for running the app against it:
+
+    python -m benchmarks._rate_stub --port 8765 --latency 0.3 --mode ok
+    OMNISTORE_ENABLE_CURRENCY_API=1 EXCHANGERATE_HOST_KEY=stub \
+        OMNISTORE_RATE_URL=http://127.0.0.1:8765/live python main.py
+
+The mode/latency can be switched while it runs:
+    curl "http://127.0.0.1:8765/_control?mode=outage&latency=0.5"
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from app.services.rate_providers import DEFAULT_FAKE_QUOTES
+
+
+DEFAULT_QUOTES = DEFAULT_FAKE_QUOTES
+
+# ok      normal /live answer
+# 429     HTTP 429 (+ Retry-After if retry_after is set)
+# quota   HTTP 200 with the provider's usage_limit_reached error
+# error   HTTP 500
+# outage  connection closed without any answer
+# hang    no answer for hang_s (longer than the client timeout)
+STUB_MODES = ("ok", "429", "quota", "error", "outage", "hang")
+
+
+class StubRateServer:
+    def __init__(
+        self,
+        quotes: Optional[Dict[str, float]] = None,
+        latency_s: float = 0.0,
+        mode: str = "ok",
+        retry_after: Optional[float] = None,
+        etag: bool = True,
+        hang_s: float = 30.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        tls: bool = False,
+    ):
+        if mode not in STUB_MODES:
+            raise ValueError(f"Unknown stub mode: {mode}")
+        self.quotes = dict(quotes or DEFAULT_QUOTES)
+        self.latency_s = latency_s
+        self.mode = mode
+        self.retry_after = retry_after
+        self.etag = etag  # answer If-None-Match with 304 when the quotes did not change
+        self.not_modified = 0
+        self.hang_s = hang_s
+        self.host = host
+        self.port = port
+        self.tls = tls  # HTTPS with a throw-away self-signed certificate (needs the openssl CLI)
+        self.cert_path: Optional[str] = None  # trust this file on the client (e.g. REQUESTS_CA_BUNDLE)
+        self._tmpdir: Optional[tempfile.TemporaryDirectory] = None
+        self.requests = 0
+        self.connections = 0  # TCP connections accepted (keep-alive reuse shows up here)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def live_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        scheme = "https" if self.tls else "http"
+        return f"{scheme}://{host}:{port}/live"
+
+    def _make_certificate(self) -> ssl.SSLContext:
+        if shutil.which("openssl") is None:
+            raise RuntimeError("tls=True needs the openssl command line tool")
+        self._tmpdir = tempfile.TemporaryDirectory(prefix="omnistore-stub-tls-")
+        cert = os.path.join(self._tmpdir.name, "cert.pem")
+        key = os.path.join(self._tmpdir.name, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+             "-keyout", key, "-out", cert, "-subj", f"/CN={self.host}",
+             "-addext", f"subjectAltName=IP:{self.host}"],
+            check=True, capture_output=True,
+        )
+        self.cert_path = cert
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ctx.load_cert_chain(cert, key)
+        return ctx
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def setup(self):
+                super().setup()
+                # Headers and body go out in separate writes: without this, Nagle + delayed ACK
+                # add ~40 ms to every keep-alive request (real servers set it too)
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, *_args):
+                pass
+
+            def _send(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _control(self):
+                params = {k: v[-1] for k, v in parse_qs(urlsplit(self.path).query).items()}
+                mode = params.get("mode", stub.mode)
+                if mode not in STUB_MODES:
+                    self._send(400, {"success": False, "error": f"mode must be one of {STUB_MODES}"})
+                    return
+                stub.mode = mode
+                if "latency" in params:
+                    stub.latency_s = float(params["latency"])
+                if "retry_after" in params:
+                    stub.retry_after = float(params["retry_after"])
+                self._send(200, {"mode": stub.mode, "latency_s": stub.latency_s, "retry_after": stub.retry_after,
+                                 "requests": stub.requests})
+
+            def do_GET(self):
+                if self.path.startswith("/_control"):
+                    self._control()
+                    return
+
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency_s:
+                    time.sleep(stub.latency_s)
+
+                if not self.path.startswith("/live"):
+                    self._send(404, {"success": False})
+                elif stub.mode == "outage":
+                    self.close_connection = True  # drop the socket: client sees a connection error
+                elif stub.mode == "hang":
+                    time.sleep(stub.hang_s)
+                    self.close_connection = True
+                elif stub.mode == "429":
+                    headers = {"Retry-After": str(stub.retry_after)} if stub.retry_after is not None else {}
+                    self._send(429, {"success": False, "error": {"type": "rate_limit"}}, headers)
+                elif stub.mode == "quota":
+                    self._send(200, {"success": False, "error": {"code": 104, "type": "usage_limit_reached"}})
+                elif stub.mode == "error":
+                    self._send(500, {"success": False})
+                else:
+                    tag = '"' + hashlib.sha1(json.dumps(stub.quotes, sort_keys=True).encode()).hexdigest() + '"'
+                    if stub.etag and self.headers.get("If-None-Match") == tag:
+                        with stub._lock:
+                            stub.not_modified += 1
+                        self.send_response(304)
+                        self.send_header("ETag", tag)
+                        self.end_headers()
+                        return
+                    self._send(200, {
+                        "success": True,
+                        "source": "USD",
+                        "timestamp": int(time.time()),
+                        "quotes": stub.quotes,
+                    }, {"ETag": tag} if stub.etag else None)
+
+        return Handler
+
+    def start(self) -> "StubRateServer":
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True  # hanging requests must not block shutdown
+        if self.tls:
+            ctx = self._make_certificate()
+            self._server.socket = ctx.wrap_socket(self._server.socket, server_side=True)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="rate-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
+    def __enter__(self) -> "StubRateServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local exchangerate.host /live stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--mode", choices=STUB_MODES, default="ok")
+    parser.add_argument("--retry-after", type=float, default=None)
+    args = parser.parse_args()
+
+    stub = StubRateServer(latency_s=args.latency, mode=args.mode, retry_after=args.retry_after,
+                          host=args.host, port=args.port).start()
+    print(f"Serving {stub.live_url} (mode={stub.mode}, latency={stub.latency_s}s); Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
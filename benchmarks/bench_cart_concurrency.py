@@ -0,0 +1,126 @@
+"""
+Concurrent add-to-cart stress check + throughput.
+
+THREADS sessions hammer the same cart lines at once:
+  - every thread increments a shared line OPS_PER_THREAD times;
+  - every thread applies a multi-line delta (+2 on A, -1 on B) OPS_PER_THREAD times.
+The final quantities must equal the sum of all successful changes. The old
+SELECT-then-UPDATE/INSERT implementation is run as well for comparison.
+
+Exits with status 1 if the UPSERT path loses (or fails) a single update.
+
+Run:
+    python -m benchmarks.bench_cart_concurrency
+"""
+from __future__ import annotations
+
+import sqlite3
+import sys
+import threading
+import time
+
+from app.db.connection import transaction
+from app.repositories.item_cart_repository import ItemCartRepository
+from benchmarks._common import seed_catalog, temp_database
+
+
+THREADS = 8
+OPS_PER_THREAD = 200
+
+
+def legacy_increment(cart_id: int, item_id: int, delta: int = 1) -> None:
+    """
+    The pre-UPSERT implementation: read, then write in a second statement.
+    """
+    with transaction() as conn:
+        row = conn.execute(
+            "SELECT Quantity FROM Item_Cart WHERE CartID = ? AND ItemID = ?",
+            (cart_id, item_id),
+        ).fetchone()
+        if row:
+            conn.execute(
+                "UPDATE Item_Cart SET Quantity = ? WHERE CartID = ? AND ItemID = ?",
+                (int(row["Quantity"]) + delta, cart_id, item_id),
+            )
+        else:
+            conn.execute(
+                "INSERT INTO Item_Cart (CartID, ItemID, Quantity) VALUES (?, ?, ?)",
+                (cart_id, item_id, delta),
+            )
+
+
+def _hammer(worker) -> dict:
+    counts = {"ok": 0, "errors": 0}
+    lock = threading.Lock()
+    start = threading.Barrier(THREADS)
+
+    def run():
+        ok = errors = 0
+        start.wait()
+        for _ in range(OPS_PER_THREAD):
+            try:
+                worker()
+                ok += 1
+            except sqlite3.OperationalError:
+                errors += 1
+        with lock:
+            counts["ok"] += ok
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=run) for _ in range(THREADS)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    counts["seconds"] = time.perf_counter() - t0
+    return counts
+
+
+def _quantity(repo: ItemCartRepository, cart_id: int, item_id: int) -> int:
+    line = repo.get_item(cart_id, item_id)
+    return line.quantity if line else 0
+
+
+def main() -> int:
+    failed = False
+    total = THREADS * OPS_PER_THREAD
+
+    with temp_database():
+        seeded = seed_catalog(3)
+        cart_id = seeded["carts"][0]
+        item_a, item_b, item_c = seeded["items"]
+        repo = ItemCartRepository()
+
+        print(f"\n=== Cart concurrency: {THREADS} threads x {OPS_PER_THREAD} ops ===")
+        print(f"{'case':<28} {'expected':>9} {'final':>7} {'lost':>6} {'errors':>7} {'ops/s':>9}")
+
+        def report(name, counts, expected, final):
+            lost = expected - final
+            ops = counts["ok"] + counts["errors"]
+            print(f"{name:<28} {expected:>9} {final:>7} {lost:>6} {counts['errors']:>7} {ops / counts['seconds']:>9.0f}")
+            return lost
+
+        # Legacy read-then-write (for comparison only)
+        counts = _hammer(lambda: legacy_increment(cart_id, item_c, 1))
+        report("legacy select+update", counts, counts["ok"], _quantity(repo, cart_id, item_c))
+
+        # UPSERT increment
+        counts = _hammer(lambda: repo.increment(cart_id, item_a, 1))
+        lost = report("upsert increment", counts, total, _quantity(repo, cart_id, item_a))
+        failed |= lost != 0 or counts["errors"] != 0
+
+        # Multi-line delta: B starts high enough to never hit 0
+        repo.upsert_quantity(cart_id, item_b, total + 1)
+        before_a = _quantity(repo, cart_id, item_a)
+        counts = _hammer(lambda: repo.apply_delta(cart_id, {item_a: 2, item_b: -1}))
+        lost_a = report("apply_delta (+2 line A)", counts, before_a + 2 * total, _quantity(repo, cart_id, item_a))
+        lost_b = report("apply_delta (-1 line B)", counts, 1, _quantity(repo, cart_id, item_b))
+        failed |= lost_a != 0 or lost_b != 0 or counts["errors"] != 0
+
+    print("\nFAILED: updates were lost" if failed else "\nOK: no updates lost")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
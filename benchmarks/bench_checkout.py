@@ -0,0 +1,71 @@
+"""
+Checkout throughput for carts of 1, 10 and 100 lines.
+Each checkout is a single unit of work (one BEGIN IMMEDIATE ... COMMIT).
+
+Run:
+    python -m benchmarks.bench_checkout
+"""
+from __future__ import annotations
+
+import time
+
+from app.db.connection import get_connection
+from app.repositories.cart_repository import CartRepository
+from app.repositories.item_cart_repository import ItemCartRepository
+from app.repositories.item_repository import ItemRepository
+from app.repositories.order_item_repository import OrderItemRepository
+from app.repositories.order_repository import OrderRepository
+from app.services.checkout_service import CheckoutService
+from benchmarks._common import percentile, seed_catalog, temp_database
+
+
+CART_SIZES = (1, 10, 100)
+ORDERS_PER_SIZE = 100
+
+
+def _fill_cart(cart_id: int, item_ids, lines: int) -> None:
+    conn = get_connection()
+    try:
+        conn.executemany(
+            "INSERT INTO Item_Cart (CartID, ItemID, Quantity) VALUES (?, ?, ?)",
+            [(cart_id, item_id, 1 + i % 3) for i, item_id in enumerate(item_ids[:lines])],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def main() -> None:
+    with temp_database():
+        seeded = seed_catalog(max(CART_SIZES))
+        item_ids = seeded["items"]
+        customer_id = seeded["customers"][0]
+        cart_id = seeded["carts"][0]
+
+        service = CheckoutService(
+            cart_repo=CartRepository(),
+            item_cart_repo=ItemCartRepository(),
+            item_repo=ItemRepository(),
+            order_repo=OrderRepository(),
+            order_item_repo=OrderItemRepository(),
+        )
+
+        print("\n=== Checkout throughput ===")
+        print(f"{'lines':>6} {'p50 ms':>10} {'p95 ms':>10} {'orders/s':>10}")
+        for lines in CART_SIZES:
+            samples = []
+            for _ in range(ORDERS_PER_SIZE):
+                _fill_cart(cart_id, item_ids, lines)
+                t0 = time.perf_counter()
+                service.checkout(customer_id)
+                samples.append((time.perf_counter() - t0) * 1000.0)
+            samples.sort()
+            total_s = sum(samples) / 1000.0
+            print(
+                f"{lines:>6} {percentile(samples, 50):>10.3f} {percentile(samples, 95):>10.3f} "
+                f"{ORDERS_PER_SIZE / total_s:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Pooled vs. per-call SQLite connections on catalog and cart workloads.
+
+Run:
+    python -m benchmarks.bench_connection_pool
+"""
+from __future__ import annotations
+
+import random
+
+from app.db import connection as db_connection
+from app.repositories.item_cart_repository import ItemCartRepository
+from app.repositories.item_repository import ItemRepository
+from benchmarks._common import measure, print_table, seed_catalog, temp_database
+
+
+N_ITEMS = 2_000
+REPEAT = 300
+
+
+def main() -> None:
+    with temp_database():
+        seeded = seed_catalog(N_ITEMS)
+        item_ids = seeded["items"]
+        cart_id = seeded["carts"][0]
+
+        item_repo = ItemRepository()
+        item_cart_repo = ItemCartRepository()
+        rnd = random.Random(42)
+
+        def catalog_workload():
+            # item details page: one lookup per click
+            for _ in range(10):
+                item_repo.get_by_id(rnd.choice(item_ids))
+
+        def cart_workload():
+            # add to cart + render cart (one item lookup per line)
+            item_cart_repo.increment(cart_id, rnd.choice(item_ids[:20]), delta=1)
+            for ci in item_cart_repo.list_items(cart_id):
+                item_repo.get_by_id(ci.item_id)
+
+        rows = {}
+        for enabled in (False, True):
+            db_connection.configure_pool(enabled)
+            mode = "pooled" if enabled else "unpooled"
+            db_connection.get_pool().reset_stats()
+            rows[f"catalog ({mode})"] = measure(catalog_workload, REPEAT)
+            rows[f"cart ({mode})"] = measure(cart_workload, REPEAT)
+
+        print_table("Connection pool: catalog / cart workloads", rows)
+        print("pool stats:", db_connection.pool_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Scalar convert() vs bulk convert_many() on a full quote set (~170 currencies).
+
+- legacy scalar: convert() per amount with the old get_rate (string keys + dict lookups + division)
+- matrix scalar: convert() per amount, rates precomputed in CrossRateMatrix
+- convert_many: one rate lookup for the whole batch
+
+No network: quotes are synthetic and the cache is marked fresh.
+
+Run:
+    python -m benchmarks.bench_currency_convert
+"""
+from __future__ import annotations
+
+import random
+import string
+import time
+
+from app.services.currency_service import CurrencyService
+from app.utils.rate_matrix import CrossRateMatrix
+from benchmarks._common import measure, print_table
+
+
+N_CURRENCIES = 170
+BATCHES = (10, 100, 1_000)
+
+
+def _quotes(rnd: random.Random) -> dict:
+    codes = {"EUR", "GBP", "BGN", "JPY"}
+    while len(codes) < N_CURRENCIES - 1:
+        codes.add("".join(rnd.choice(string.ascii_uppercase) for _ in range(3)))
+    codes.discard("USD")
+    return {f"USD{c}": rnd.uniform(0.01, 150.0) for c in sorted(codes)}
+
+
+def _service(quotes: dict, cls=CurrencyService) -> CurrencyService:
+    service = cls(_quotes_cache=dict(quotes), _cache_timestamp=time.time())
+    service.access_key = "benchmark"  # pretend the API is on; the cache is fresh, so no request is made
+    return service
+
+
+class LegacyCurrencyService(CurrencyService):
+    """
+    convert() with the previous get_rate(): per call string keys + dict lookups + division.
+    """
+
+    def get_rate(self, to_currency: str, from_currency: str = "EUR") -> float:
+        from_currency = from_currency.upper()
+        to_currency = to_currency.upper()
+        if from_currency == to_currency:
+            return 1.0
+        self._ensure_loaded()
+        if not self._quotes_cache:
+            return 1.0
+
+        def source_to(ccy: str) -> float:
+            if ccy == self._source_currency:
+                return 1.0
+            return float(self._quotes_cache[f"{self._source_currency}{ccy}"])
+
+        return float(source_to(to_currency) / source_to(from_currency))
+
+
+def main() -> None:
+    rnd = random.Random(13)
+    quotes = _quotes(rnd)
+    service = _service(quotes)
+    legacy_service = _service(quotes, LegacyCurrencyService)
+
+    t0 = time.perf_counter()
+    CrossRateMatrix("USD", quotes)
+    build_ms = (time.perf_counter() - t0) * 1000.0
+
+    for size in BATCHES:
+        amounts = [round(rnd.uniform(1, 5_000), 2) for _ in range(size)]
+
+        legacy = [legacy_service.convert(a, "GBP") for a in amounts]
+        assert legacy == service.convert_many(amounts, "GBP"), "bulk path must match the scalar path"
+
+        repeat = max(20, 20_000 // size)
+        rows = {
+            "legacy scalar": measure(lambda: [legacy_service.convert(a, "GBP") for a in amounts], repeat=repeat),
+            "matrix scalar": measure(lambda: [service.convert(a, "GBP") for a in amounts], repeat=repeat),
+            "convert_many": measure(lambda: service.convert_many(amounts, "GBP"), repeat=repeat),
+        }
+        print_table(f"Convert {size} amounts EUR->GBP", rows)
+
+    print(f"\nCrossRateMatrix build ({N_CURRENCIES}x{N_CURRENCIES}): {build_ms:.1f} ms (once per quote load)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+End-to-end workload benchmark: StoreAppService ui_* calls (what the views run) on
+synthetic datasets of several sizes (app.db.synthetic_seed).
+
+Operations: login, list_items, item_details, add_to_cart, get_cart, checkout,
+list_orders, add_favorite, list_favorites, record_view, list_history.
+Customer calls use session tokens; customers and items rotate deterministically.
+Currency conversion uses the built-in fake quotes (no network).
+
+Each run is saved as JSON (p50/p95/p99, mean, ops/s per size and operation; ops/s counts
+only the time inside the calls, not the untimed setup) and can be
+compared with an earlier run; a p95 slower than --threshold (default 20%) is reported
+as a regression and the exit status is 1.
+
+Run:
+    python -m benchmarks.bench_e2e                      # small + medium
+    python -m benchmarks.bench_e2e --sizes small,medium,large --out benchmarks/results/base.json
+    python -m benchmarks.bench_e2e --compare benchmarks/results/base.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from itertools import cycle
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.db.synthetic_seed import SYNTHETIC_PASSWORD, SyntheticSpec
+from app.presentation.app_result import AppResult
+from app.services.rate_providers import FakeRateProvider
+from app.services.service_container import currency_service
+from app.services.store_app_service import StoreAppService
+from app.utils.metrics import MetricsRegistry
+from benchmarks._common import seed_dataset, summarize, temp_database
+
+
+SIZES: Dict[str, SyntheticSpec] = {
+    "small": SyntheticSpec(items=1_000, categories=20, customers=100, seed=1),
+    "medium": SyntheticSpec(items=10_000, categories=50, customers=1_000, seed=2),
+    "large": SyntheticSpec(items=50_000, categories=100, customers=5_000, seed=3),
+}
+DEFAULT_SIZES = ("small", "medium")
+
+SESSIONS = 50  # customers logged in for the customer-scoped operations
+WARMUP = 3
+DEFAULT_OUT = Path("benchmarks") / "results"
+
+# operation -> base repeat count (scaled by --scale); hashing makes login slow on purpose
+REPEATS: Dict[str, int] = {
+    "login": 10,
+    "list_items": 20,
+    "item_details": 300,
+    "add_to_cart": 300,
+    "get_cart": 300,
+    "checkout": 100,
+    "list_orders": 300,
+    "add_favorite": 300,
+    "list_favorites": 300,
+    "record_view": 300,
+    "list_history": 300,
+}
+
+Op = Callable[[], AppResult]
+
+
+def _ok(name: str, result: AppResult) -> AppResult:
+    if not result.ok:
+        raise RuntimeError(f"{name} failed: {result.error.code} {result.error.message}")
+    return result
+
+
+def _time_op(name: str, op: Op, repeat: int, setup: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    """
+    Times `repeat` calls of op (setup, if any, runs before each call and is not timed).
+    """
+    for _ in range(WARMUP):
+        if setup:
+            setup()
+        _ok(name, op())
+
+    samples: List[float] = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        result = op()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+        _ok(name, result)
+    return summarize(samples, sum(samples) / 1000.0)
+
+
+class Workload:
+    """
+    One StoreAppService over a seeded dataset; every operation is a zero-arg callable.
+    """
+
+    def __init__(self, app: StoreAppService, items: Sequence[int], customers: Sequence[int], seed: int):
+        self.app = app
+        self.rnd = random.Random(seed)
+        self.items = list(items)
+
+        users = [app.user_repo.get_by_id(user_id) for user_id in customers[:SESSIONS]]
+        self.emails = cycle([u.email for u in users])
+        self.tokens = cycle([_ok("login", app.ui_login_session(u.email, SYNTHETIC_PASSWORD)).data["token"] for u in users])
+
+    def item(self) -> int:
+        return self.rnd.choice(self.items)
+
+    def operations(self) -> Dict[str, Tuple[Op, Optional[Callable[[], None]]]]:
+        app = self.app
+        pending: Dict[str, str] = {}
+
+        def fill_cart() -> None:
+            token = next(self.tokens)
+            for _ in range(3):
+                _ok("checkout setup", app.ui_session_add_to_cart(token, self.item(), 1))
+            pending["checkout"] = token
+
+        return {
+            "login": (lambda: app.ui_login_session(next(self.emails), SYNTHETIC_PASSWORD), None),
+            "list_items": (app.ui_list_items, None),
+            "item_details": (lambda: app.ui_item_details(self.item()), None),
+            "add_to_cart": (lambda: app.ui_session_add_to_cart(next(self.tokens), self.item(), 1), None),
+            "get_cart": (lambda: app.ui_session_get_cart(next(self.tokens)), None),
+            "checkout": (lambda: app.ui_session_checkout(pending["checkout"]), fill_cart),
+            "list_orders": (lambda: app.ui_session_list_orders(next(self.tokens)), None),
+            "add_favorite": (lambda: app.ui_session_add_favorite(next(self.tokens), self.item()), None),
+            "list_favorites": (lambda: app.ui_session_list_favorites(next(self.tokens)), None),
+            "record_view": (lambda: app.ui_session_record_view(next(self.tokens), self.item()), None),
+            "list_history": (lambda: app.ui_session_list_history(next(self.tokens)), None),
+        }
+
+
+def run_size(name: str, spec: SyntheticSpec, scale: float) -> Dict:
+    with temp_database():
+        data = seed_dataset(spec)
+        print(f"\n=== {name}: {spec.items} items, {spec.customers} customers"
+              f" ({sum(data.counts.values())} rows seeded in {data.seconds:.1f}s) ===")
+        print(f"{'operation':<16} {'runs':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>10}")
+
+        app = StoreAppService.create_default()
+        app.metrics = MetricsRegistry()  # this size only
+        workload = Workload(app, data.items, data.customers, spec.seed)
+        ops: Dict[str, Dict[str, float]] = {}
+        for op_name, (op, setup) in workload.operations().items():
+            repeat = max(1, int(REPEATS[op_name] * scale))
+            r = ops[op_name] = _time_op(op_name, op, repeat, setup)
+            print(f"{op_name:<16} {r['runs']:>6} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['ops_per_sec']:>10.1f}")
+
+        return {
+            "spec": {"items": spec.items, "categories": spec.categories, "customers": spec.customers, "seed": spec.seed},
+            "rows": data.counts,
+            "seed_seconds": round(data.seconds, 3),
+            "ops": ops,
+            # SQL work per facade call (StoreAppService.run instrumentation): N+1 shows up here
+            "facade": {
+                name: {k: m[k] for k in ("calls", "errors", "statements_per_call", "max_statements", "connections", "rows")}
+                for name, m in app.operation_metrics().items()
+            },
+        }
+
+
+def _environment() -> Dict:
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Prints p95 / ops/s changes per (size, operation) present in both runs.
+    Returns the regressions: p95 more than `threshold` slower than the baseline.
+    """
+    regressions: List[str] = []
+    print(f"\n=== compared with baseline from {baseline.get('environment', {}).get('started_at', '?')} ===")
+    print(f"{'size':<8} {'operation':<16} {'p95 base':>10} {'p95 now':>10} {'change':>8} {'ops/s change':>13}")
+    for size, result in current["results"].items():
+        base_ops = baseline.get("results", {}).get(size, {}).get("ops", {})
+        for op_name, r in result["ops"].items():
+            b = base_ops.get(op_name)
+            if not b or not b["p95_ms"] or not b["ops_per_sec"]:
+                continue
+            change = r["p95_ms"] / b["p95_ms"] - 1.0
+            ops_change = r["ops_per_sec"] / b["ops_per_sec"] - 1.0
+            flag = "  REGRESSION" if change > threshold else ""
+            print(f"{size:<8} {op_name:<16} {b['p95_ms']:>10.3f} {r['p95_ms']:>10.3f} {change:>+8.0%} {ops_change:>+13.0%}{flag}")
+            if flag:
+                regressions.append(f"{size}/{op_name}")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end StoreAppService benchmark.")
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES), help=f"comma separated: {', '.join(SIZES)}")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies every repeat count")
+    parser.add_argument("--out", type=Path, help=f"JSON result file (default: {DEFAULT_OUT}/e2e-<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier JSON result to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p95 slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    # Non-EUR customers exercise conversion without touching the network
+    currency_service.provider = FakeRateProvider()
+
+    report = {"environment": _environment(), "scale": args.scale, "results": {}}
+    for size in sizes:
+        report["results"][size] = run_size(size, SIZES[size], args.scale)
+
+    out = args.out or DEFAULT_OUT / f"e2e-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults saved to {out}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Carousel frame latency: full decode + LANCZOS resize + letterbox (what
+ItemDetailsView did on every arrow click) vs the on-disk thumbnail cache vs
+the in-memory frame cache.
+
+Uses synthetic 2400x1800 photos plus the pictures shipped in images/.
+
+Run:
+    python -m benchmarks.bench_image_cache
+"""
+from __future__ import annotations
+
+import random
+import tempfile
+from pathlib import Path
+
+from PIL import Image
+
+from app.db.connection import PROJECT_ROOT
+from app.ui.image_cache import ImagePipeline, render_frame, resolve_picture_path
+from benchmarks._common import measure, print_table
+
+
+FRAME_SIZE = (420, 320)
+SYNTHETIC = 6
+REPEAT = 30
+
+
+def _make_photos(folder: Path) -> list:
+    rnd = random.Random(7)
+    paths = []
+    for i in range(SYNTHETIC):
+        img = Image.effect_noise((2400, 1800), 64).convert("RGB")
+        img.paste((rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)), (200, 200, 1200, 1000))
+        path = folder / f"photo_{i}.png"
+        img.save(path)
+        paths.append(str(path))
+    return paths
+
+
+def main() -> None:
+    shipped = sorted(str(p.relative_to(PROJECT_ROOT)) for p in (PROJECT_ROOT / "images").glob("*.png"))
+
+    with tempfile.TemporaryDirectory(prefix="omnistore-img-") as tmp:
+        tmp = Path(tmp)
+        paths = shipped + _make_photos(tmp)
+
+        counter = {"i": 0}
+
+        def next_path():
+            counter["i"] += 1
+            return paths[counter["i"] % len(paths)]
+
+        rows = {
+            "uncached render": measure(lambda: render_frame(resolve_picture_path(next_path()), FRAME_SIZE), repeat=REPEAT),
+        }
+
+        # Disk tier only: a fresh pipeline per call has an empty memory LRU
+        disk_dir = tmp / "thumbs"
+        warm = ImagePipeline(cache_dir=disk_dir)
+        for p in paths:
+            warm.get(p, FRAME_SIZE)
+        warm.shutdown()
+
+        def disk_hit():
+            pipeline = ImagePipeline(cache_dir=disk_dir)
+            pipeline.get(next_path(), FRAME_SIZE)
+            pipeline.shutdown()
+
+        rows["disk thumbnail hit"] = measure(disk_hit, repeat=REPEAT)
+
+        memory = ImagePipeline(cache_dir=disk_dir)
+        rows["memory frame hit"] = measure(lambda: memory.get(next_path(), FRAME_SIZE), repeat=REPEAT * 10)
+        memory.shutdown()
+
+        print_table(f"Carousel frame {FRAME_SIZE[0]}x{FRAME_SIZE[1]} ({len(paths)} pictures)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Login throughput and latency for each hashing policy / verification path.
+
+A burst of LOGINS logins from CLIENTS concurrent threads, with:
+- inline:  hashing on the caller's thread (the previous behaviour)
+- thread:  HashWorkerPool(kind="thread")
+- process: HashWorkerPool(kind="process")
+
+"max tick gap" is the worst delay seen by a 5 ms ticker thread during the burst,
+standing in for the Tk event loop (inline hashing ON the Tk thread would stall it
+for a whole hash; see the single-hash column).
+
+Throughput only scales with the pool on a multi-core machine (hashlib releases the GIL).
+
+The last table shows rehash-on-login: users stored with a cheaper policy are upgraded
+on their first login, later logins pay only the new policy.
+
+Run:
+    python -m benchmarks.bench_login
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app.repositories.user_repository import UserRepository
+from app.services.auth_service import AuthService
+from app.utils.security import HASH_WORKERS, HashPolicy, HashWorkerPool, hash_password, verify_password
+from benchmarks._common import percentile, temp_database
+
+
+USERS = 4
+LOGINS = 24
+CLIENTS = 4
+PASSWORD = "correct horse battery"
+
+POLICIES: Dict[str, HashPolicy] = {
+    "pbkdf2 210k": HashPolicy("pbkdf2_sha256", iterations=210_000),
+    "pbkdf2 100k": HashPolicy("pbkdf2_sha256", iterations=100_000),
+    "scrypt 2^14": HashPolicy("scrypt", scrypt_n=2 ** 14, scrypt_r=8, scrypt_p=1),
+}
+
+
+class Ticker:
+    """
+    Sleeps 5 ms in a loop and records the worst oversleep (event-loop responsiveness).
+    """
+
+    def __init__(self, period_s: float = 0.005):
+        self.period_s = period_s
+        self.max_gap_ms = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            t0 = time.perf_counter()
+            time.sleep(self.period_s)
+            self.max_gap_ms = max(self.max_gap_ms, (time.perf_counter() - t0 - self.period_s) * 1000.0)
+
+    def __enter__(self) -> "Ticker":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _register_users(policy: HashPolicy, prefix: str) -> List[str]:
+    auth = AuthService(UserRepository(), hash_policy=policy)
+    emails = []
+    for i in range(USERS):
+        email = f"{prefix}_{i}@omnistore.local"
+        auth.register(username=email.split("@")[0], email=email, name=f"Bench {i}", password=PASSWORD)
+        emails.append(email)
+    return emails
+
+
+def _burst(auth: AuthService, emails: List[str]) -> Tuple[List[float], float, float]:
+    def one(i: int) -> float:
+        t0 = time.perf_counter()
+        auth.login(emails[i % len(emails)], PASSWORD)
+        return (time.perf_counter() - t0) * 1000.0
+
+    with Ticker() as ticker, ThreadPoolExecutor(max_workers=CLIENTS) as clients:
+        started = time.perf_counter()
+        samples = sorted(clients.map(one, range(LOGINS)))
+        elapsed = time.perf_counter() - started
+    return samples, LOGINS / elapsed, ticker.max_gap_ms
+
+
+def _single_hash_ms(policy: HashPolicy) -> float:
+    stored = hash_password(PASSWORD, policy)
+    t0 = time.perf_counter()
+    verify_password(PASSWORD, stored)
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def _pool(kind: Optional[str]) -> Optional[HashWorkerPool]:
+    return HashWorkerPool(workers=HASH_WORKERS, kind=kind) if kind else None
+
+
+def main() -> None:
+    print(f"\n=== login burst: {LOGINS} logins, {CLIENTS} client threads, pool workers = {HASH_WORKERS} ===")
+    print(f"{'policy':<13} {'path':<8} {'1 hash ms':>10} {'p50 ms':>9} {'p95 ms':>9} {'logins/s':>9} {'max tick gap ms':>16}")
+
+    with temp_database():
+        for name, policy in POLICIES.items():
+            emails = _register_users(policy, f"burst_{policy.algorithm}_{policy.params.replace(':', '_')}")
+            single = _single_hash_ms(policy)
+            for kind in (None, "thread", "process"):
+                pool = _pool(kind)
+                try:
+                    if pool is not None:
+                        pool.verify(PASSWORD, hash_password(PASSWORD, policy))  # start the workers
+                    auth = AuthService(UserRepository(), hash_policy=policy, hash_pool=pool)
+                    samples, rate, gap = _burst(auth, emails)
+                finally:
+                    if pool is not None:
+                        pool.shutdown()
+                print(
+                    f"{name:<13} {kind or 'inline':<8} {single:>10.1f} {percentile(samples, 50):>9.1f}"
+                    f" {percentile(samples, 95):>9.1f} {rate:>9.1f} {gap:>16.1f}"
+                )
+
+        print("\n=== rehash on login: stored as pbkdf2 100k, policy now scrypt 2^14 ===")
+        emails = _register_users(POLICIES["pbkdf2 100k"], "rehash")
+        repo = UserRepository()
+        auth = AuthService(repo, hash_policy=POLICIES["scrypt 2^14"])
+        for round_no in (1, 2):
+            samples = []
+            for email in emails:
+                t0 = time.perf_counter()
+                auth.login(email, PASSWORD)
+                samples.append((time.perf_counter() - t0) * 1000.0)
+            upgraded = sum(1 for e in emails if repo.get_by_email(e).password_hash.startswith("scrypt$"))
+            samples.sort()
+            print(f"round {round_no}: p50 {percentile(samples, 50):7.1f} ms   upgraded {upgraded}/{len(emails)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Cart-render latency (CartService.get_cart_view in USD) for every rate provider and
+every failure mode of the HTTP API, fully offline.
+
+HTTP cases go through HttpRateProvider to the local stub server (benchmarks/_rate_stub.py);
+offline cases use the file / SQLite snapshot / in-process fake providers.
+
+Each case is run twice:
+- cold:  empty rate store, the first render has to fetch (worst case for a fresh install)
+- stale: the store holds a snapshot older than the TTL (stale-while-revalidate path)
+
+Columns: first render, p50/p95/max over the following renders, upstream fetches,
+and whether real rates were shown (otherwise amounts are shown unconverted, 1:1 fallback).
+
+Run:
+    python -m benchmarks.bench_rate_providers
+"""
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import app.services.cart_service as cart_module
+from app.repositories.cart_repository import CartRepository
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.exchange_rate_repository import ExchangeRateRepository
+from app.repositories.item_cart_repository import ItemCartRepository
+from app.repositories.item_repository import ItemRepository
+from app.services.cart_service import CartService
+from app.services.currency_service import CurrencyService
+from app.services.rate_providers import (
+    DEFAULT_FAKE_QUOTES,
+    FakeRateProvider,
+    FileRateProvider,
+    HttpRateProvider,
+    RateProvider,
+    SnapshotRateProvider,
+)
+from benchmarks._common import percentile, seed_catalog, temp_database
+from benchmarks._rate_stub import StubRateServer
+
+
+CART_LINES = 25
+RENDERS = 200
+TTL_S = 3600
+STUB_LATENCY_S = 0.05
+SLOW_LATENCY_S = 0.8
+CLIENT_TIMEOUT_S = 1.0
+
+# name -> (stub mode, stub latency)
+HTTP_CASES: Dict[str, Tuple[str, float]] = {
+    "http ok": ("ok", STUB_LATENCY_S),
+    "http slow": ("ok", SLOW_LATENCY_S),
+    "http 429": ("429", STUB_LATENCY_S),
+    "http quota": ("quota", STUB_LATENCY_S),
+    "http 500": ("error", STUB_LATENCY_S),
+    "http outage": ("outage", STUB_LATENCY_S),
+    "http hang": ("hang", 0.0),
+}
+
+
+def _cart_service() -> Tuple[CartService, int]:
+    ids = seed_catalog(CART_LINES, n_customers=1)
+    cart_id, customer_id = ids["carts"][0], ids["customers"][0]
+    item_carts = ItemCartRepository()
+    item_carts.apply_delta(cart_id, {item_id: 2 for item_id in ids["items"]})
+    service = CartService(CartRepository(), item_carts, ItemRepository(), CustomerRepository())
+    return service, customer_id
+
+
+def _store_stale_snapshot() -> None:
+    fetched_at = (datetime.now(timezone.utc) - timedelta(seconds=2 * TTL_S)).isoformat()
+    ExchangeRateRepository().save_snapshot("USD", dict(DEFAULT_FAKE_QUOTES), "seed", fetched_at)
+
+
+def _run_case(provider: RateProvider, stale: bool, upstream: Callable[[], int]) -> Dict:
+    with temp_database():
+        cart, customer_id = _cart_service()
+        if stale:
+            _store_stale_snapshot()
+
+        currency = CurrencyService(provider=provider, cache_ttl_seconds=TTL_S, store_poll_seconds=0.0)
+        previous = cart_module.currency_service
+        cart_module.currency_service = currency
+        before = upstream()
+        try:
+            t0 = time.perf_counter()
+            cart.get_cart_view(customer_id, display_currency="USD")
+            first_ms = (time.perf_counter() - t0) * 1000.0
+
+            samples = []
+            for _ in range(RENDERS):
+                t0 = time.perf_counter()
+                cart.get_cart_view(customer_id, display_currency="USD")
+                samples.append((time.perf_counter() - t0) * 1000.0)
+        finally:
+            cart_module.currency_service = previous
+            # Let a background revalidation finish before its database goes away
+            deadline = time.time() + CLIENT_TIMEOUT_S + 1.0
+            while currency._revalidating and time.time() < deadline:
+                time.sleep(0.01)
+
+    samples.sort()
+    return {
+        "first_ms": first_ms,
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "max_ms": samples[-1],
+        "fetches": upstream() - before,
+        "rates": currency.staleness_seconds is not None,
+    }
+
+
+def _print(name: str, r: Dict) -> None:
+    print(
+        f"{name:<22} {r['first_ms']:>10.1f} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['max_ms']:>9.1f}"
+        f" {r['fetches']:>8} {'yes' if r['rates'] else 'no':>6}"
+    )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory(prefix="omnistore-rates-") as tmp:
+        rate_file = Path(tmp) / "rates.json"
+        rate_file.write_text(json.dumps({"success": True, "source": "USD", "quotes": DEFAULT_FAKE_QUOTES}))
+
+        # Another OmniStore database holding one snapshot (e.g. a copy of production);
+        # each case below switches to its own temp database
+        with temp_database() as snapshot_db, StubRateServer(hang_s=CLIENT_TIMEOUT_S * 3) as stub:
+            ExchangeRateRepository(snapshot_db).save_snapshot("USD", dict(DEFAULT_FAKE_QUOTES), "exchangerate.host")
+
+            for phase, stale in (("cold", False), ("stale", True)):
+                print(f"\n=== cart render ({CART_LINES} lines, USD), {phase} rate store, {RENDERS} renders ===")
+                print(f"{'case':<22} {'first ms':>10} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'fetches':>8} {'rates':>6}")
+
+                for name, (mode, latency) in HTTP_CASES.items():
+                    stub.mode, stub.latency_s = mode, latency
+                    provider = HttpRateProvider(stub.live_url, access_key="stub", timeout=CLIENT_TIMEOUT_S)
+                    _print(name, _run_case(provider, stale, lambda: stub.requests))
+
+                fake = FakeRateProvider()
+                _print("fake (in-process)", _run_case(fake, stale, lambda: fake.calls))
+                for name, provider in (("file", FileRateProvider(rate_file)),
+                                       ("sqlite snapshot", SnapshotRateProvider(snapshot_db))):
+                    _print(name, _run_case(provider, stale, lambda: 0))
+
+
+if __name__ == "__main__":
+    main()
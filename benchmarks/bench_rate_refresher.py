@@ -0,0 +1,89 @@
+"""
+get_rate() latency with and without the background RateRefresher, against a
+local stub /live endpoint that takes STUB_LATENCY_S per request.
+
+Phase 1 (cold start): without the refresher the first read pays the HTTP call.
+Phase 2 (steady state): TTL is short, so quotes expire several times during the run.
+Phase 3 (rate limited): the stub answers 429 + Retry-After; reads keep being served
+from the last good snapshot while the refresher backs off.
+
+Run:
+    python -m benchmarks.bench_rate_refresher
+"""
+from __future__ import annotations
+
+import time
+
+from app.services.currency_service import CurrencyService
+from app.services.rate_refresher import RateRefresher
+from benchmarks._common import percentile, temp_database
+from benchmarks._rate_stub import StubRateServer
+
+
+STUB_LATENCY_S = 0.3
+TTL_S = 1.0
+RUN_S = 4.0
+
+
+def _service(url: str) -> CurrencyService:
+    service = CurrencyService(live_url=url, cache_ttl_seconds=TTL_S, store_poll_seconds=0.2)
+    service.access_key = "stub"  # enable the API path without the env switch
+    return service
+
+
+def _read_for(service: CurrencyService, seconds: float) -> dict:
+    samples, staleness = [], []
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        t0 = time.perf_counter()
+        service.convert(100.0, "GBP")
+        samples.append((time.perf_counter() - t0) * 1000.0)
+        staleness.append(service.staleness_seconds or 0.0)
+        time.sleep(0.005)
+    samples.sort()
+    return {
+        "reads": len(samples),
+        "p50_ms": percentile(samples, 50),
+        "p99_ms": percentile(samples, 99),
+        "max_ms": samples[-1],
+        "max_staleness_s": max(staleness),
+    }
+
+
+def _print(name: str, r: dict) -> None:
+    print(f"{name:<34} {r['reads']:>6} {r['p50_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['max_ms']:>9.1f} {r['max_staleness_s']:>10.2f}")
+
+
+def main() -> None:
+    print(f"\n=== get_rate latency, stub /live = {STUB_LATENCY_S * 1000:.0f} ms, TTL = {TTL_S:.0f}s, {RUN_S:.0f}s per case ===")
+    print(f"{'case':<34} {'reads':>6} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'stale s':>10}")
+
+    with StubRateServer(latency_s=STUB_LATENCY_S) as stub:
+        with temp_database():
+            service = _service(stub.live_url)
+            _print("inline refresh (no refresher)", _read_for(service, RUN_S))
+            inline_requests = stub.requests
+
+        with temp_database():
+            service = _service(stub.live_url)
+            refresher = RateRefresher(service, min_backoff_seconds=0.2, max_backoff_seconds=2.0)
+            refresher.start()
+            try:
+                _print("background refresher", _read_for(service, RUN_S))
+                refresher_requests = stub.requests - inline_requests
+
+                stub.mode, stub.retry_after = "429", 1
+                _print("refresher, API answering 429", _read_for(service, RUN_S))
+                metrics = refresher.metrics()
+            finally:
+                refresher.stop()
+
+    print(f"\nHTTP requests: inline={inline_requests}, refresher={refresher_requests}")
+    print("Refresher metrics after the 429 phase:")
+    for key in ("refreshes", "failures", "rate_limited", "consecutive_failures", "latency_p50_ms",
+                "backoff_seconds", "staleness_seconds", "last_error"):
+        print(f"  {key:<22} {metrics[key]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Cost of one /live fetch against the local stub server (~170 quotes per answer):
+
+- requests.get:  the previous behaviour, a new TCP (+TLS) connection per fetch
+- session:       HttpRateProvider, keep-alive Session (one connection for the whole run)
+- session+etag:  same, the stub sends an ETag and answers If-None-Match with 304 (no body)
+- http 500:      every answer fails; shows the adapter retries and the bounded fetch time
+
+Run over plain HTTP and, if the openssl CLI is available, over HTTPS with a
+self-signed certificate (the real API is HTTPS: that is where keep-alive pays off).
+Columns come from the provider's own latency histogram where available.
+
+Run:
+    python -m benchmarks.bench_rate_session
+"""
+from __future__ import annotations
+
+import os
+import random
+import shutil
+import string
+import time
+
+import requests
+
+from app.services.currency_service import CurrencyServiceError
+from app.services.rate_providers import HttpRateProvider, parse_live_payload
+from app.utils.metrics import LatencyHistogram
+from benchmarks._rate_stub import StubRateServer
+
+
+FETCHES = 300
+FAILING_FETCHES = 10
+N_QUOTES = 170
+
+
+def _quotes() -> dict:
+    rnd = random.Random(17)
+    codes = set()
+    while len(codes) < N_QUOTES:
+        codes.add("".join(rnd.choice(string.ascii_uppercase) for _ in range(3)))
+    return {f"USD{c}": round(rnd.uniform(0.01, 150.0), 6) for c in sorted(codes)}
+
+
+def _legacy_fetches(url: str, n: int) -> LatencyHistogram:
+    hist = LatencyHistogram()
+    for _ in range(n):
+        t0 = time.perf_counter()
+        resp = requests.get(url, params={"access_key": "bench"}, timeout=8)
+        resp.raise_for_status()
+        parse_live_payload(resp.json())
+        hist.observe((time.perf_counter() - t0) * 1000.0)
+    return hist
+
+
+def _provider_fetches(provider: HttpRateProvider, n: int) -> LatencyHistogram:
+    for _ in range(n):
+        try:
+            provider.fetch()
+        except CurrencyServiceError:
+            pass
+    return provider.latency
+
+
+def _print(name: str, hist: LatencyHistogram, stub: StubRateServer, before: tuple, extra: str = "") -> None:
+    r = hist.as_dict()
+    print(
+        f"{name:<14} {r['count']:>7} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['max_ms']:>9.1f}"
+        f" {stub.requests - before[0]:>9} {stub.connections - before[1]:>6} {stub.not_modified - before[2]:>6}  {extra}"
+    )
+
+
+def _run(tls: bool) -> None:
+    label = "HTTPS (self-signed)" if tls else "plain HTTP"
+    print(f"\n=== /live fetch cost, local stub over {label}, {N_QUOTES} quotes per answer ===")
+    print(f"{'case':<14} {'fetches':>7} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'requests':>9} {'conns':>6} {'304s':>6}")
+
+    with StubRateServer(quotes=_quotes(), tls=tls) as stub:
+        def snap():
+            return stub.requests, stub.connections, stub.not_modified
+
+        previous_bundle = os.environ.get("REQUESTS_CA_BUNDLE")
+        if stub.cert_path:
+            os.environ["REQUESTS_CA_BUNDLE"] = stub.cert_path  # honoured by requests.get and Session
+        try:
+            stub.etag = False
+            before = snap()
+            _print("requests.get", _legacy_fetches(stub.live_url, FETCHES), stub, before)
+
+            before = snap()
+            provider = HttpRateProvider(stub.live_url, access_key="bench")
+            _print("session", _provider_fetches(provider, FETCHES), stub, before)
+            provider.close()
+
+            stub.etag = True
+            before = snap()
+            provider = HttpRateProvider(stub.live_url, access_key="bench")
+            _print("session+etag", _provider_fetches(provider, FETCHES), stub, before)
+            provider.close()
+
+            stub.mode = "error"
+            before = snap()
+            provider = HttpRateProvider(stub.live_url, access_key="bench", retries=2, backoff_factor=0.05)
+            hist = _provider_fetches(provider, FAILING_FETCHES)
+            m = provider.metrics()
+            _print("http 500", hist, stub, before,
+                   f"retries={m['retries']} failures={m['failures']} bound={m['max_fetch_seconds']}s")
+            provider.close()
+        finally:
+            if previous_bundle is None:
+                os.environ.pop("REQUESTS_CA_BUNDLE", None)
+            else:
+                os.environ["REQUESTS_CA_BUNDLE"] = previous_bundle
+
+
+def main() -> None:
+    _run(tls=False)
+    if shutil.which("openssl"):
+        _run(tls=True)
+    else:
+        print("\n(HTTPS run skipped: openssl not found)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Catalog search latency on a 100k-item synthetic catalog: FTS5 (ranked, prefix)
+vs the LIKE '%term%' scan that would be needed without the index.
+
+Run:
+    python -m benchmarks.bench_search
+"""
+from __future__ import annotations
+
+import random
+
+from app.db import connection as db_connection
+from app.repositories.item_repository import ItemRepository
+from benchmarks._common import measure, print_table, temp_database
+
+
+N_ITEMS = 100_000
+REPEAT = 50
+
+ADJECTIVES = ["oak", "steel", "compact", "wireless", "vintage", "ergonomic", "foldable", "smart", "classic", "outdoor"]
+NOUNS = ["desk", "lamp", "chair", "shelf", "speaker", "kettle", "backpack", "monitor", "sofa", "blender"]
+FEATURES = ["adjustable height", "soft touch finish", "energy saving", "quick assembly", "water resistant",
+            "two year warranty", "scratch proof surface", "low noise motor", "extra storage", "recycled materials"]
+
+QUERIES = {
+    "single term": "lamp",
+    "two terms": "wireless speaker",
+    "prefix": "ergo",
+    "description phrase": "water resist",
+    "rare term": "54321",
+}
+
+
+def _seed(n_items: int) -> None:
+    rnd = random.Random(42)
+    conn = db_connection.get_connection()
+    try:
+        cur = conn.execute(
+            'INSERT INTO "User"(Username, Password, Name, Email) VALUES (?, ?, ?, ?)',
+            ("bench_admin", "x", "Bench Admin", "bench_admin@omnistore.local"),
+        )
+        admin_id = int(cur.lastrowid)
+        conn.execute('INSERT INTO "Admin"(UserID, Role) VALUES (?, ?)', (admin_id, "ADMIN"))
+
+        rows = []
+        for i in range(n_items):
+            name = f"{rnd.choice(ADJECTIVES).title()} {rnd.choice(NOUNS)} {i}"
+            description = f"{name} with {', '.join(rnd.sample(FEATURES, 3))}."
+            rows.append((admin_id, name, description, 10.0, 10.0, 10.0, 1.0, float(1 + i % 500)))
+
+        # Triggers fill Item_FTS as the rows go in
+        conn.executemany(
+            """
+            INSERT INTO "Item"(AdminUserID, Name, Description, Height, Width, Depth, Weight, Price)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _like_scan(text: str, limit: int = 20):
+    """
+    Baseline without the index: full scan, name matches ranked before description matches.
+    """
+    patterns = [f"%{w}%" for w in text.split()]
+    where = " AND ".join("(Name LIKE ? OR Description LIKE ?)" for _ in patterns)
+    params = [p for pat in patterns for p in (pat, pat)]
+    with db_connection.connection() as conn:
+        return conn.execute(
+            f'SELECT ID, Name, Price FROM "Item" WHERE {where} ORDER BY (Name LIKE ?) DESC, ID LIMIT ?',
+            (*params, patterns[0], limit),
+        ).fetchall()
+
+
+def main() -> None:
+    with temp_database():
+        _seed(N_ITEMS)
+        repo = ItemRepository()
+
+        rows = {}
+        for label, text in QUERIES.items():
+            rows[f"fts5 {label}"] = measure(lambda t=text: repo.search(t, limit=20), repeat=REPEAT)
+            rows[f"like {label}"] = measure(lambda t=text: _like_scan(t, limit=20), repeat=REPEAT)
+
+        print_table(f"Catalog search, top 20 of {N_ITEMS} items", rows)
+
+        sample = repo.search("wireless spea", limit=3)
+        print("\nSample hits for 'wireless spea':")
+        for hit in sample:
+            print(f"  #{hit.item_id} {hit.name!r} rank={hit.rank:.3f} snippet={hit.snippet!r}")
+
+
+if __name__ == "__main__":
+    main()
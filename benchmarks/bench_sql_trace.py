@@ -0,0 +1,98 @@
+"""
+Which statements the e2e workload runs, how long they take and how SQLite plans them.
+
+Seeds a synthetic dataset, runs every bench_e2e operation with SQL tracing on, then prints
+- the top statements by total time (calls, mean/max ms, calling repository methods)
+- the EXPLAIN QUERY PLAN of every traced statement that scans a table or sorts
+  through a temp B-tree: the usual signs of a missing index
+
+Slow statements (--slow-ms) are also appended to --log as the app's slow-query log would.
+
+Run:
+    python -m benchmarks.bench_sql_trace
+    python -m benchmarks.bench_sql_trace --size large --slow-ms 5 --log /tmp/omnistore-slow.log
+"""
+from __future__ import annotations
+
+import argparse
+from typing import Dict, List, Optional, Sequence
+
+from app.db import connection as db_connection
+from app.db.tracing import configure_tracing, explain, sql_tracer
+from app.services.rate_providers import FakeRateProvider
+from app.services.service_container import currency_service
+from app.services.store_app_service import StoreAppService
+from benchmarks._common import seed_dataset, temp_database
+from benchmarks.bench_e2e import REPEATS, SIZES, Workload
+
+
+TOP = 15
+
+
+def _suspicious(line: str) -> bool:
+    # "SCAN t USING INDEX ..." is an ordered index walk (fine with a LIMIT); a bare SCAN is not
+    line = line.strip()
+    return "USE TEMP B-TREE" in line or (line.startswith("SCAN ") and " USING " not in line)
+
+
+def _plan_of(sql: str) -> List[str]:
+    # The normalized text only has "?" placeholders: explain with NULLs
+    conn = db_connection.get_connection()
+    try:
+        return explain(conn, sql, [None] * sql.count("?"))
+    finally:
+        conn.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Trace the SQL of the e2e workload.")
+    parser.add_argument("--size", default="medium", choices=list(SIZES))
+    parser.add_argument("--scale", type=float, default=0.3)
+    parser.add_argument("--slow-ms", type=float, default=5.0)
+    parser.add_argument("--log", help="also write the slow-query log to this file")
+    args = parser.parse_args(argv)
+
+    currency_service.provider = FakeRateProvider()
+    spec = SIZES[args.size]
+
+    with temp_database():
+        data = seed_dataset(spec)
+        app = StoreAppService.create_default()
+        workload = Workload(app, data.items, data.customers, spec.seed)
+
+        configure_tracing(trace=True, slow_ms=args.slow_ms, slow_log_path=args.log)
+        sql_tracer.reset()
+        try:
+            for op_name, (op, setup) in workload.operations().items():
+                for _ in range(max(1, int(REPEATS[op_name] * args.scale))):
+                    if setup:
+                        setup()
+                    op()
+
+            stats = sql_tracer.summary()
+            print(f"\n=== top {TOP} statements by total time ({args.size}: {spec.items} items, {spec.customers} customers) ===")
+            print(f"{'calls':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9}  statement / callers")
+            for s in stats[:TOP]:
+                callers = ", ".join(f"{c} x{n}" for c, n in list(s["callers"].items())[:3])
+                print(f"{s['calls']:>7} {s['total_ms']:>10.2f} {s['mean_ms']:>9.3f} {s['max_ms']:>9.3f}  {s['sql'][:110]}")
+                print(f"{'':>39}  <- {callers}")
+
+            print("\n=== plans with a table scan or temp B-tree sort ===")
+            flagged: Dict[str, List[str]] = {}
+            for s in stats:
+                plan = _plan_of(s["sql"])
+                if any(_suspicious(line) for line in plan):
+                    flagged[s["sql"]] = plan
+                    print(f"\n{s['sql'][:140]}\n  <- {next(iter(s['callers']))}  ({s['calls']} calls, max {s['max_ms']:.2f} ms)")
+                    for line in plan:
+                        print(f"    {line}")
+            if not flagged:
+                print("(none)")
+
+            print(f"\n{len(sql_tracer.slow_queries)} statement(s) over {args.slow_ms} ms" + (f", logged to {args.log}" if args.log else ""))
+        finally:
+            configure_tracing(trace=False, disable_slow_log=True)
+
+
+if __name__ == "__main__":
+    main()
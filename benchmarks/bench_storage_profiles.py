@@ -0,0 +1,106 @@
+"""
+Read/write concurrency under each storage profile (plus the old rollback-journal setup).
+
+4 reader threads do item lookups (UI refreshes) while 1 writer thread inserts
+History rows (record_view) for a fixed duration.
+
+Run:
+    python -m benchmarks.bench_storage_profiles
+"""
+from __future__ import annotations
+
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from app.db import connection as db_connection
+from app.db.storage_profile import STORAGE_PROFILES, StorageProfile
+from app.repositories.history_repository import HistoryRepository
+from app.repositories.item_repository import ItemRepository
+from benchmarks._common import seed_catalog, temp_database
+
+
+DURATION_S = 3.0
+READERS = 4
+WRITERS = 1
+N_ITEMS = 5_000
+
+LEGACY = StorageProfile(
+    name="legacy (rollback journal)",
+    journal_mode="DELETE",
+    synchronous="FULL",
+    cache_size=-2_000,
+    mmap_size=0,
+    temp_store="DEFAULT",
+    busy_timeout_ms=5_000,
+)
+
+
+def _run(profile: StorageProfile) -> dict:
+    db_connection.configure_storage_profile(profile)
+    with temp_database():
+        seeded = seed_catalog(N_ITEMS)
+        item_ids = seeded["items"]
+        customer_id = seeded["customers"][0]
+
+        stop = threading.Event()
+        counts = {"reads": 0, "writes": 0, "busy": 0}
+        lock = threading.Lock()
+
+        def reader(seed: int):
+            repo = ItemRepository()
+            rnd = random.Random(seed)
+            n = 0
+            while not stop.is_set():
+                repo.get_by_id(rnd.choice(item_ids))
+                n += 1
+            with lock:
+                counts["reads"] += n
+
+        def writer(seed: int):
+            repo = HistoryRepository()
+            rnd = random.Random(seed)
+            n = busy = 0
+            while not stop.is_set():
+                try:
+                    viewed_at = f"{datetime.now(timezone.utc).isoformat()}#{seed}-{n}"
+                    repo.add_view(customer_id, rnd.choice(item_ids), viewed_at)
+                    n += 1
+                except sqlite3.OperationalError:
+                    busy += 1
+            with lock:
+                counts["writes"] += n
+                counts["busy"] += busy
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(READERS)]
+        threads += [threading.Thread(target=writer, args=(100 + i,)) for i in range(WRITERS)]
+        for t in threads:
+            t.start()
+        time.sleep(DURATION_S)
+        stop.set()
+        for t in threads:
+            t.join()
+
+    return {
+        "reads_per_s": counts["reads"] / DURATION_S,
+        "writes_per_s": counts["writes"] / DURATION_S,
+        "busy_errors": counts["busy"],
+    }
+
+
+def main() -> None:
+    original = db_connection.STORAGE_PROFILE
+    try:
+        print(f"\n=== Storage profiles: {READERS} readers + {WRITERS} writer, {DURATION_S:.0f}s each ===")
+        print(f"{'profile':<28} {'reads/s':>10} {'writes/s':>10} {'busy':>6}")
+        for profile in [LEGACY, *STORAGE_PROFILES.values()]:
+            r = _run(profile)
+            print(f"{profile.name:<28} {r['reads_per_s']:>10.0f} {r['writes_per_s']:>10.0f} {r['busy_errors']:>6}")
+    finally:
+        db_connection.configure_storage_profile(original)
+
+
+if __name__ == "__main__":
+    main()
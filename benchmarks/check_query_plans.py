@@ -0,0 +1,134 @@
+"""
+Query-plan assertions for the hot read paths (run after schema/index/query changes).
+
+Seeds a small synthetic dataset, calls the real repository / facade methods with SQL
+tracing on, and checks the EXPLAIN QUERY PLAN of the statements each one ran:
+- the expected index is used
+- no full table scan and no "USE TEMP B-TREE" sort
+
+Exit status 1 if any check fails.
+
+Run:
+    python -m benchmarks.check_query_plans
+"""
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from app.db import connection as db_connection
+from app.db.migrations import LATEST_VERSION, schema_version
+from app.db.synthetic_seed import SYNTHETIC_PASSWORD, SyntheticSpec
+from app.db.tracing import configure_tracing, explain, sql_tracer
+from app.repositories.history_repository import HistoryRepository
+from app.repositories.item_cart_repository import ItemCartRepository
+from app.repositories.order_item_repository import OrderItemRepository
+from app.repositories.order_repository import OrderRepository
+from app.repositories.picture_repository import PictureRepository
+from app.repositories.user_repository import UserRepository
+from app.services.store_app_service import StoreAppService
+from benchmarks._common import seed_dataset, temp_database
+
+
+SPEC = SyntheticSpec(items=2_000, categories=20, customers=200, seed=5)
+
+
+@dataclass
+class PlanCheck:
+    name: str
+    call: Callable[[], object]
+    caller: str       # tracer caller the statement is attributed to
+    index: str        # index (or autoindex) the plan must use
+    contains: Optional[str] = None  # pick one statement of a caller that runs several
+
+
+def _plans_for(check: PlanCheck) -> List[List[str]]:
+    sql_tracer.reset()
+    check.call()
+    statements = [
+        s["sql"] for s in sql_tracer.summary()
+        if check.caller in s["callers"] and (check.contains is None or check.contains in s["sql"])
+    ]
+    conn = db_connection.get_connection()
+    try:
+        return [explain(conn, sql, [None] * sql.count("?")) for sql in statements]
+    finally:
+        conn.close()
+
+
+def _problems(check: PlanCheck, plans: List[List[str]]) -> List[str]:
+    if not plans:
+        return [f"no statement traced for {check.caller}"]
+    problems = []
+    for plan in plans:
+        text = " | ".join(line.strip() for line in plan)
+        if check.index not in text:
+            problems.append(f"does not use {check.index}: {text}")
+        if "USE TEMP B-TREE" in text:
+            problems.append(f"sorts in a temp B-tree: {text}")
+        if any(line.strip().startswith("SCAN ") and " USING " not in line for line in plan):
+            problems.append(f"scans a table: {text}")
+    return problems
+
+
+def main() -> int:
+    with temp_database() as path:
+        data = seed_dataset(SPEC)
+        app = StoreAppService.create_default()
+        users = UserRepository()
+
+        customer_id = data.customers[0]
+        email = users.get_by_id(customer_id).email
+        token = app.login_session(email, SYNTHETIC_PASSWORD).token
+        cart_id = data.carts[0]
+        item_id = data.items[0]
+        order_id = data.orders[0]
+
+        checks = [
+            PlanCheck("login lookup", lambda: users.get_with_role_by_email(email),
+                      "UserRepository.get_with_role_by_email", "sqlite_autoindex_User_2"),
+            PlanCheck("history (repository)", lambda: HistoryRepository().list_views(customer_id),
+                      "HistoryRepository.list_views", "idx_hist_customer_viewed"),
+            PlanCheck("history (facade)", lambda: app.ui_session_list_history(token),
+                      "StoreAppService._list_history", "idx_hist_customer_viewed"),
+            PlanCheck("orders page", lambda: OrderRepository().list_for_customer(customer_id),
+                      "OrderRepository.list_for_customer", "idx_order_customer_created"),
+            PlanCheck("order lines", lambda: OrderItemRepository().list_for_order(order_id),
+                      "OrderItemRepository.list_for_order", "idx_orderitem_order_name"),
+            PlanCheck("item pictures (repository)", lambda: PictureRepository().list_for_item(item_id),
+                      "PictureRepository.list_for_item", "idx_picture_item_main"),
+            PlanCheck("item pictures (details)", lambda: app.get_item_details(item_id),
+                      "StoreAppService.get_item_details", "idx_picture_item_main", contains='FROM "Picture"'),
+            PlanCheck("favorites", lambda: app.ui_session_list_favorites(token),
+                      "StoreAppService._list_favorites", "sqlite_autoindex_Favorites_1"),
+            PlanCheck("cart lines", lambda: ItemCartRepository().list_lines(cart_id),
+                      "ItemCartRepository.list_lines", "sqlite_autoindex_Item_Cart_1"),
+        ]
+
+        conn = db_connection.get_connection()
+        try:
+            version = schema_version(conn)
+        finally:
+            conn.close()
+        print(f"schema version {version} (latest {LATEST_VERSION}), {path.name}")
+
+        failures = 0
+        configure_tracing(trace=True)
+        try:
+            for check in checks:
+                problems = _problems(check, _plans_for(check))
+                failures += bool(problems)
+                print(f"{'FAIL' if problems else 'ok  '}  {check.name:<28} {check.index}")
+                for problem in problems:
+                    print(f"        {problem}")
+        finally:
+            configure_tracing(trace=False)
+            sql_tracer.reset()
+
+    print(f"\n{len(checks) - failures}/{len(checks)} plans OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())